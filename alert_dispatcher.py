@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Background alert pipeline for trading signals.
+Alerts are queued from any thread, rate-limited per symbol, coalesced into digests
+during bursts and delivered to pluggable channels off the GUI thread.
+"""
+
+import json
+import logging
+import queue
+import smtplib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from typing import Dict, List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+CONFIDENCE_RANK = {'low': 0, 'medium': 1, 'high': 2, 'critical': 3}
+LATENCY_SAMPLES = 500  # Recent deliveries kept per channel for latency percentiles
+
+
+@dataclass
+class Alert:
+    """One notification: a single signal or a digest of several"""
+    title: str
+    message: str
+    confidence: str
+    symbols: List[str]
+    created_at: float                      # Unix time the (oldest) signal was created
+    count: int = 1
+    payload: List[Dict] = field(default_factory=list)
+
+
+class AlertChannel(ABC):
+    """Delivery target; subclasses implement send()"""
+    name = 'channel'
+
+    @abstractmethod
+    def send(self, alert: Alert):
+        """Deliver one alert; raise on failure"""
+
+
+class DesktopChannel(AlertChannel):
+    name = 'desktop'
+
+    def __init__(self, timeout: int = 10):
+        from plyer import notification
+        self.notification = notification
+        self.timeout = timeout
+
+    def send(self, alert: Alert):
+        self.notification.notify(title=alert.title, message=alert.message, timeout=self.timeout)
+
+
+class SoundChannel(AlertChannel):
+    """Beep by confidence; silently does nothing where winsound is unavailable"""
+    name = 'sound'
+
+    # confidence -> (frequency Hz, duration ms)
+    BEEPS = {'critical': (2000, 500), 'high': (1500, 300)}
+    DEFAULT_BEEP = (1000, 200)
+
+    def __init__(self):
+        try:
+            import winsound
+            self.winsound = winsound
+        except ImportError:
+            self.winsound = None
+
+    def send(self, alert: Alert):
+        if self.winsound:
+            frequency, duration = self.BEEPS.get(alert.confidence, self.DEFAULT_BEEP)
+            self.winsound.Beep(frequency, duration)
+
+
+class WebhookChannel(AlertChannel):
+    """POST the alert as JSON (Slack/Discord-style 'text' plus structured fields)"""
+    name = 'webhook'
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def send(self, alert: Alert):
+        body = {
+            'text': f"{alert.title}\n{alert.message}",
+            'title': alert.title,
+            'message': alert.message,
+            'confidence': alert.confidence,
+            'symbols': alert.symbols,
+            'count': alert.count,
+            'signals': alert.payload,
+        }
+        response = self.session.post(self.url, data=json.dumps(body),
+                                     headers={'Content-Type': 'application/json'}, timeout=self.timeout)
+        response.raise_for_status()
+
+
+class SmtpChannel(AlertChannel):
+    name = 'smtp'
+
+    def __init__(self, host: str, port: int, sender: str, recipients: List[str],
+                 username: Optional[str] = None, password: Optional[str] = None,
+                 use_tls: bool = False, timeout: float = 10.0):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = recipients
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+
+    def send(self, alert: Alert):
+        email = EmailMessage()
+        email['Subject'] = alert.title
+        email['From'] = self.sender
+        email['To'] = ', '.join(self.recipients)
+        email.set_content(alert.message)
+
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as server:
+            if self.use_tls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password or '')
+            server.send_message(email)
+
+
+class AlertDispatcher:
+    """Bounded alert queue drained by a worker thread"""
+
+    def __init__(self, channels: Optional[List[AlertChannel]] = None, max_queue: int = 100,
+                 cooldown: float = 300.0, coalesce_window: float = 2.0):
+        self.channels = list(channels or [])
+        self.cooldown = cooldown                # seconds between alerts for the same symbol
+        self.coalesce_window = coalesce_window  # alerts arriving within this window form one digest
+        self.queue = queue.Queue(maxsize=max_queue)
+
+        self.last_alert = {}  # symbol -> monotonic time of the last accepted alert
+        self.stats = {'submitted': 0, 'delivered': 0, 'digests': 0, 'dropped': 0,
+                      'suppressed': 0, 'failed': 0}
+        self.latencies = {}   # channel name -> deque of seconds from signal creation to delivery
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker = threading.Thread(target=self._run, name='alert-dispatcher', daemon=True)
+        self._worker.start()
+
+    def set_channels(self, channels: List[AlertChannel]):
+        """Swap the delivery channels (e.g. after settings change)"""
+        with self._lock:
+            self.channels = list(channels)
+
+    def submit(self, alert: Alert, key: Optional[str] = None) -> bool:
+        """Queue an alert without blocking; False if it was rate-limited or the queue is full"""
+        key = key or (alert.symbols[0] if alert.symbols else alert.title)
+        now = time.monotonic()
+        with self._lock:
+            self.stats['submitted'] += 1
+            last = self.last_alert.get(key)
+            if last is not None and now - last < self.cooldown:
+                self.stats['suppressed'] += 1
+                return False
+            # Start the cooldown only once the alert is queued, so a dropped alert doesn't mute the symbol
+            try:
+                self.queue.put_nowait(alert)
+            except queue.Full:
+                self.stats['dropped'] += 1
+                return False
+            self.last_alert[key] = now
+            return True
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        self._worker.join(timeout)
+
+    def metrics(self) -> Dict:
+        """Counters plus per-channel latency percentiles (seconds)"""
+        with self._lock:
+            result = dict(self.stats)
+            result['queued'] = self.queue.qsize()
+            latency = {}
+            for name, samples in self.latencies.items():
+                if not samples:
+                    continue
+                ordered = sorted(samples)
+                latency[name] = {
+                    'count': len(ordered),
+                    'p50': ordered[len(ordered) // 2],
+                    'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                    'max': ordered[-1],
+                }
+            result['latency'] = latency
+        return result
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                first = self.queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            # Gather the rest of a burst so it goes out as one digest
+            batch = [first]
+            deadline = time.monotonic() + self.coalesce_window
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._deliver(batch[0] if len(batch) == 1 else self._digest(batch))
+
+    @staticmethod
+    def _digest(batch: List[Alert]) -> Alert:
+        top = max(batch, key=lambda a: CONFIDENCE_RANK.get(a.confidence, 0))
+        symbols = [symbol for alert in batch for symbol in alert.symbols]
+        lines = [f"{alert.title}: {alert.message.splitlines()[0]}" for alert in batch]
+        return Alert(
+            title=f"🚨 {len(batch)} signals ({top.confidence.upper()} max)",
+            message='\n'.join(lines),
+            confidence=top.confidence,
+            symbols=symbols,
+            created_at=min(alert.created_at for alert in batch),
+            count=len(batch),
+            payload=[item for alert in batch for item in alert.payload],
+        )
+
+    def _deliver(self, alert: Alert):
+        with self._lock:
+            channels = list(self.channels)
+            if alert.count > 1:
+                self.stats['digests'] += 1
+
+        for channel in channels:
+            try:
+                channel.send(alert)
+            except Exception as e:
+                logger.error(f"Alert channel {channel.name} failed: {e}")
+                with self._lock:
+                    self.stats['failed'] += 1
+                continue
+
+            latency = time.time() - alert.created_at
+            with self._lock:
+                self.stats['delivered'] += 1
+                self.latencies.setdefault(channel.name, deque(maxlen=LATENCY_SAMPLES)).append(latency)
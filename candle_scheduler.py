@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Candle-boundary scan scheduler.
+Wakes a fixed offset after each timeframe's candle close (boundaries are multiples of
+the timeframe in Unix time, like exchange candles), waiting on monotonic deadlines so
+wall-clock jumps don't stretch or shorten a wait. Scans that overrun the next boundary
+are either caught up immediately or skipped, depending on the policy.
+"""
+
+import logging
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+
+from session_replay import SystemClock
+
+logger = logging.getLogger(__name__)
+
+CATCH_UP = 'catch_up'  # Run once, right away, for the boundaries missed while a scan overran
+SKIP = 'skip'          # Drop missed boundaries and wait for the next one
+
+TIMEFRAME_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def timeframe_seconds(timeframe: str) -> int:
+    """'5m' -> 300"""
+    return int(timeframe[:-1]) * TIMEFRAME_UNITS[timeframe[-1]]
+
+
+@dataclass
+class ScheduledTick:
+    """One wake-up: the boundary it belongs to and the timeframes whose candles just closed"""
+    boundary: float                                  # Unix time of the (latest) boundary
+    timeframes: List[str] = field(default_factory=list)
+    missed: int = 0                                  # Boundaries folded into this tick after an overrun
+    lag: float = 0.0                                 # Seconds between the boundary and the wake-up
+
+
+class CandleScheduler:
+    """Yields ticks aligned to candle boundaries plus an optional plain scan interval"""
+
+    def __init__(self, timeframes: Iterable[str] = ('1m', '5m'), offset: float = 2.0,
+                 interval: Optional[float] = None, policy: str = CATCH_UP, clock=None):
+        if policy not in (CATCH_UP, SKIP):
+            raise ValueError(f"Unknown overrun policy '{policy}'")
+        self.periods = {tf: timeframe_seconds(tf) for tf in timeframes}  # timeframe -> seconds
+        self.interval = interval  # Extra aligned wake-ups between candle closes (forming-bar updates)
+        self.offset = offset      # Seconds after the boundary, giving the venue time to publish the bar
+        self.policy = policy
+        self.clock = clock or SystemClock()  # A replay's VirtualClock runs the schedule faster
+        self.stats = {'ticks': 0, 'missed': 0, 'skipped': 0, 'last_lag': 0.0, 'max_lag': 0.0}
+        self._last = None         # Boundary (Unix time) of the last tick
+
+    def _periods(self) -> List[float]:
+        periods = list(self.periods.values())
+        if self.interval:
+            periods.append(self.interval)
+        return periods
+
+    def next_boundary(self, after: float) -> float:
+        """First boundary of any period strictly after `after` (Unix time)"""
+        return min(math.floor(after / period) * period + period for period in self._periods())
+
+    def previous_boundary(self, at: float) -> float:
+        """Latest boundary of any period at or before `at`"""
+        return max(math.floor(at / period) * period for period in self._periods())
+
+    def closed_timeframes(self, start: float, end: float) -> List[str]:
+        """Timeframes with a boundary in (start, end]"""
+        return [tf for tf, period in self.periods.items()
+                if math.floor(end / period) > math.floor(start / period)]
+
+    def _count_boundaries(self, start: float, end: float, limit: int = 10000) -> int:
+        count = 0
+        boundary = self.next_boundary(start)
+        while boundary <= end and count < limit:
+            count += 1
+            boundary = self.next_boundary(boundary)
+        return count
+
+    def wait(self, stop: threading.Event) -> Optional[ScheduledTick]:
+        """Block until the next tick is due; None if stop was set while waiting"""
+        now = self.clock.time()
+        if self._last is None:
+            self._last = self.previous_boundary(now - self.offset)
+        start = self._last
+        target = self.next_boundary(start)
+        missed = 0
+
+        if target + self.offset <= now:
+            # The previous scan ran past one or more wake-ups
+            latest = self.previous_boundary(now - self.offset)
+            missed = self._count_boundaries(start, latest) - 1
+            if self.policy == CATCH_UP:
+                target = latest  # Fire now; the tick covers every timeframe that closed meanwhile
+            else:
+                self.stats['skipped'] += missed + 1
+                start = latest
+                target = self.next_boundary(latest)
+                missed = 0
+
+        # Wall clock only locates the boundary; the wait itself runs on the monotonic clock
+        deadline = self.clock.monotonic() + max(0.0, target + self.offset - now)
+        while True:
+            remaining = deadline - self.clock.monotonic()
+            if remaining <= 0:
+                break
+            if self.clock.wait(stop, remaining):
+                return None
+
+        self._last = target
+        lag = self.clock.time() - target
+        self.stats['ticks'] += 1
+        self.stats['missed'] += missed
+        self.stats['last_lag'] = lag
+        self.stats['max_lag'] = max(self.stats['max_lag'], lag)
+        if missed:
+            logger.warning(f"Scan overran {missed} boundar{'y' if missed == 1 else 'ies'}; catching up")
+        return ScheduledTick(boundary=target, timeframes=self.closed_timeframes(start, target),
+                             missed=missed, lag=lag)
@@ -0,0 +1,63 @@
+# Mobile Trading App - Deadline Queue
+#
+# Time-limit exits and suggestion expiry are kept in a min-heap of deadlines,
+# so each check only looks at the earliest entry instead of every position.
+
+import heapq
+from itertools import count
+from typing import List, Optional, Tuple
+
+class ExpiryQueue:
+    """Min-heap of (deadline, owner, kind) with lazy cancellation; each deadline fires once"""
+
+    def __init__(self):
+        self.heap = []      # [deadline, seq, owner_id, kind, live]
+        self.entries = {}   # owner_id -> {kind: heap entry}
+        self._seq = count()
+
+    def __len__(self):
+        return sum(len(kinds) for kinds in self.entries.values())
+
+    def schedule(self, owner_id: str, kind: str, deadline: float):
+        """Set (or move) the owner's deadline of this kind, as a Unix timestamp"""
+        self.cancel(owner_id, kind)
+        entry = [deadline, next(self._seq), owner_id, kind, True]
+        self.entries.setdefault(owner_id, {})[kind] = entry
+        heapq.heappush(self.heap, entry)
+
+    def cancel(self, owner_id: str, kind: Optional[str] = None):
+        """Cancel one deadline, or every deadline of an owner when kind is None"""
+        kinds = self.entries.get(owner_id)
+        if not kinds:
+            return
+        for name in ([kind] if kind else list(kinds)):
+            entry = kinds.pop(name, None)
+            if entry:
+                entry[4] = False  # Left in the heap and skipped when it surfaces
+        if not kinds:
+            del self.entries[owner_id]
+
+    def next_deadline(self) -> Optional[float]:
+        """Earliest live deadline, or None"""
+        heap = self.heap
+        while heap and not heap[0][4]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now: float) -> List[Tuple[str, str]]:
+        """Remove and return every (owner_id, kind) whose deadline has passed, earliest first"""
+        due = []
+        heap = self.heap
+        while heap and (not heap[0][4] or heap[0][0] <= now):
+            deadline, _, owner_id, kind, live = heapq.heappop(heap)
+            if live:
+                kinds = self.entries[owner_id]
+                del kinds[kind]
+                if not kinds:
+                    del self.entries[owner_id]
+                due.append((owner_id, kind))
+        return due
+
+    def deadline_for(self, owner_id: str, kind: str) -> Optional[float]:
+        entry = self.entries.get(owner_id, {}).get(kind)
+        return entry[0] if entry else None
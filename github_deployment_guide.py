@@ -107,7 +107,7 @@ python main.py
 ## 🛠️ Technical Stack
 
 - **Framework**: Kivy (Mobile UI)
-- **Backend**: Python 3.8+
+- **Backend**: Python 3.10+
 - **Trading**: Binance API Integration
 - **Android**: Buildozer packaging
 - **AI**: Custom signal analysis algorithms
@@ -224,7 +224,7 @@ jobs:
     - name: Set up Python
       uses: actions/setup-python@v4
       with:
-        python-version: '3.9'
+        python-version: '3.10'
     
     - name: Install system dependencies
       run: |
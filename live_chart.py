@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Live candlestick chart for the detailed analysis window.
+One figure per window, artists updated in place and blitted between candle closes.
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.ticker import FuncFormatter, MaxNLocator
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+logger = logging.getLogger(__name__)
+
+# Overlay name -> (color, linewidth, label)
+OVERLAY_STYLES = {
+    'ema_9': ('#ff9800', 1.0, 'EMA 9'),
+    'ema_21': ('#2196f3', 1.0, 'EMA 21'),
+    'ema_50': ('#9c27b0', 1.0, 'EMA 50'),
+    'bb_upper': ('#9e9e9e', 0.8, 'BB Upper'),
+    'bb_middle': ('#bdbdbd', 0.6, 'BB Middle'),
+    'bb_lower': ('#9e9e9e', 0.8, 'BB Lower'),
+}
+
+UP_COLOR = '#26a69a'
+DOWN_COLOR = '#ef5350'
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of the points that best preserve the line shape"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    # Bucket edges for the interior points (first and last are always kept)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    edges = np.maximum(edges, np.arange(len(edges)) + 1)
+    starts = edges
+    ends = np.append(edges[1:], n)
+
+    # Third triangle vertex for bucket i is the average of bucket i + 1
+    counts = np.diff(np.append(starts, n))
+    avg_x = np.add.reduceat(x, starts) / counts
+    avg_y = np.add.reduceat(y, starts) / counts
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = starts[i], ends[i]
+        bx = x[start:end]
+        by = y[start:end]
+        areas = np.abs((x[a] - avg_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (avg_y[i + 1] - y[a]))
+        a = start + int(np.argmax(areas))
+        indices[i + 1] = a
+
+    return indices
+
+
+def bucket_ohlcv(o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray,
+                 v: np.ndarray, n_out: int) -> Tuple[np.ndarray, ...]:
+    """Aggregate consecutive bars into n_out candles (first open, max high, min low, last close, summed volume)"""
+    n = len(c)
+    if n <= n_out:
+        return np.arange(n, dtype=float), o, h, l, c, v, 1.0
+
+    starts = np.linspace(0, n, n_out + 1).astype(np.int64)[:-1]
+    ends = np.append(starts[1:], n)
+    return (
+        starts.astype(float),
+        o[starts],
+        np.maximum.reduceat(h, starts),
+        np.minimum.reduceat(l, starts),
+        c[ends - 1],
+        np.add.reduceat(v, starts),
+        n / n_out,
+    )
+
+
+class LiveChart:
+    """Candlestick + volume chart that owns a single Figure and mutates its artists in place"""
+
+    def __init__(self, parent, symbol: str, timeframe: str = '5m', max_points: int = 600):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.max_points = max_points
+
+        # Figure, not pyplot: nothing is registered in pyplot's global figure manager
+        self.figure = Figure(figsize=(10, 6))
+        grid = self.figure.add_gridspec(2, 1, height_ratios=[3, 1], hspace=0.05)
+        self.ax_price = self.figure.add_subplot(grid[0])
+        self.ax_volume = self.figure.add_subplot(grid[1], sharex=self.ax_price)
+
+        self.ax_price.set_title(f"{symbol} - {timeframe} Chart")
+        self.ax_price.set_ylabel("Price")
+        self.ax_price.grid(True, alpha=0.3)
+        self.ax_volume.set_ylabel("Volume")
+        self.ax_volume.grid(True, alpha=0.3)
+        self.ax_price.tick_params(labelbottom=False)
+        self.ax_volume.xaxis.set_major_locator(MaxNLocator(8, integer=True))
+        self.ax_volume.xaxis.set_major_formatter(FuncFormatter(self._format_time_tick))
+
+        # Artists are created once; updates only swap their data
+        self.wicks = LineCollection([], linewidths=0.8, animated=True)
+        self.bodies = PolyCollection([], animated=True)
+        self.volume_bars = PolyCollection([], alpha=0.7, animated=True)
+        self.ax_price.add_collection(self.wicks)
+        self.ax_price.add_collection(self.bodies)
+        self.ax_volume.add_collection(self.volume_bars)
+
+        self.overlay_lines = {}
+        for name, (color, width, label) in OVERLAY_STYLES.items():
+            line, = self.ax_price.plot([], [], color=color, linewidth=width, label=label, animated=True)
+            self.overlay_lines[name] = line
+        self.ax_price.legend(loc='upper left', fontsize=7)
+
+        self.canvas = FigureCanvasTkAgg(self.figure, parent)
+        self.canvas.get_tk_widget().pack(fill='both', expand=True)
+
+        self._background = None
+        self._times = np.array([], dtype='datetime64[ns]')
+        self._last_bar_time = None
+        self._bar_count = 0
+        self._draw_cid = self.canvas.mpl_connect('draw_event', self._on_draw)
+        self.closed = False
+
+    def update(self, df: pd.DataFrame, overlays: Optional[Dict[str, np.ndarray]] = None):
+        """Push the latest candles (and cached indicator arrays) into the chart"""
+        if self.closed or df is None or df.empty:
+            return
+
+        try:
+            overlays = overlays or {}
+            o = df['open'].values.astype(float)
+            h = df['high'].values.astype(float)
+            l = df['low'].values.astype(float)
+            c = df['close'].values.astype(float)
+            v = df['volume'].values.astype(float)
+
+            x, o_b, h_b, l_b, c_b, v_b, bucket_width = bucket_ohlcv(o, h, l, c, v, self.max_points)
+            self._set_candles(x, o_b, h_b, l_b, c_b, v_b, bucket_width)
+
+            full_x = np.arange(len(c), dtype=float)
+            for name, line in self.overlay_lines.items():
+                series = overlays.get(name)
+                if series is None or len(series) != len(c):
+                    line.set_data([], [])
+                    continue
+                series = np.asarray(series, dtype=float)
+                valid = ~np.isnan(series)
+                lx, ly = full_x[valid], series[valid]
+                keep = lttb_indices(lx, ly, self.max_points)
+                line.set_data(lx[keep], ly[keep])
+
+            # Full redraw when a new bar closes or the data leaves the current view;
+            # intra-bar updates only restore the background and blit the artists
+            times = df['timestamp'].values if 'timestamp' in df else np.arange(len(c))
+            last_bar_time = times[-1]
+            price_low, price_high = np.nanmin(l), np.nanmax(h)
+            y_low, y_high = self.ax_price.get_ylim()
+            needs_full_draw = (
+                self._background is None or
+                last_bar_time != self._last_bar_time or
+                len(c) != self._bar_count or
+                price_low < y_low or price_high > y_high or
+                np.nanmax(v_b) > self.ax_volume.get_ylim()[1]
+            )
+
+            self._times = times
+            self._last_bar_time = last_bar_time
+            self._bar_count = len(c)
+
+            if needs_full_draw:
+                self._rescale(len(c), price_low, price_high, np.nanmax(v_b))
+                self.canvas.draw_idle()
+            else:
+                self._blit()
+
+        except Exception as e:
+            logger.error(f"Error updating chart for {self.symbol}: {e}")
+
+    def close(self):
+        """Release the figure and its canvas"""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.canvas.mpl_disconnect(self._draw_cid)
+            self.figure.clear()
+            self.canvas.get_tk_widget().destroy()
+        except Exception:
+            pass
+        self._background = None
+
+    def _set_candles(self, x, o, h, l, c, v, bucket_width: float):
+        """Rebuild the wick/body/volume geometry in place"""
+        half = bucket_width * 0.3
+        center = x + (bucket_width - 1) / 2
+        up = c >= o
+        colors = np.where(up, UP_COLOR, DOWN_COLOR)
+
+        wick_segments = np.stack([
+            np.column_stack([center, l]),
+            np.column_stack([center, h])
+        ], axis=1)
+        self.wicks.set_segments(wick_segments)
+        self.wicks.set_color(colors)
+
+        body_low = np.minimum(o, c)
+        body_high = np.maximum(o, c)
+        self.bodies.set_verts(self._rectangles(center - half, center + half, body_low, body_high))
+        self.bodies.set_facecolor(colors)
+        self.bodies.set_edgecolor(colors)
+
+        self.volume_bars.set_verts(self._rectangles(center - half, center + half, np.zeros_like(v), v))
+        self.volume_bars.set_facecolor(colors)
+
+    @staticmethod
+    def _rectangles(left, right, bottom, top) -> np.ndarray:
+        """(n, 4, 2) vertex array for n axis-aligned rectangles"""
+        return np.stack([
+            np.column_stack([left, bottom]),
+            np.column_stack([left, top]),
+            np.column_stack([right, top]),
+            np.column_stack([right, bottom]),
+        ], axis=1)
+
+    def _rescale(self, bar_count: int, price_low: float, price_high: float, volume_high: float):
+        """Set limits with a little headroom so small moves can still be blitted"""
+        pad = (price_high - price_low) * 0.05 or price_high * 0.001 or 1
+        self.ax_price.set_xlim(-1, bar_count)
+        self.ax_price.set_ylim(price_low - pad, price_high + pad)
+        self.ax_volume.set_ylim(0, (volume_high or 1) * 1.15)
+
+    def _on_draw(self, event):
+        """Capture the static background and paint the animated artists on top"""
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_artists()
+
+    def _blit(self):
+        self.canvas.restore_region(self._background)
+        self._draw_artists()
+        self.canvas.blit(self.figure.bbox)
+
+    def _draw_artists(self):
+        self.ax_price.draw_artist(self.wicks)
+        self.ax_price.draw_artist(self.bodies)
+        for line in self.overlay_lines.values():
+            self.ax_price.draw_artist(line)
+        self.ax_volume.draw_artist(self.volume_bars)
+
+    def _format_time_tick(self, value, position) -> str:
+        """Map a bar index back to its candle time"""
+        index = int(round(value))
+        if 0 <= index < len(self._times):
+            try:
+                return pd.Timestamp(self._times[index]).strftime('%H:%M')
+            except Exception:
+                return str(index)
+        return ''
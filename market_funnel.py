@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Two-stage market funnel.
+Stage one ranks every listed pair from a single all-market ticker request (24h quote
+volume, growth of that volume between refreshes, and 24h range expansion). Stage two,
+the deep OHLCV/on-chain analysis, then only runs for the top-K candidates plus the
+pairs that are always watched.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import requests
+
+from mobile_trading_pairs import TIER_1_PAIRS
+
+logger = logging.getLogger(__name__)
+
+BINANCE_US_TICKERS_URL = "https://api.binance.us/api/v3/ticker/24hr"
+KNOWN_QUOTES = ('USDT', 'USDC', 'USD', 'BTC', 'ETH')
+
+# Weights of the percentile ranks that make up the trend score
+DEFAULT_WEIGHTS = {'volume_change': 0.4, 'range': 0.3, 'quote_volume': 0.3}
+
+
+@dataclass
+class TrendingPair:
+    symbol: str
+    score: float          # 0-1, weighted percentile rank across the eligible pairs
+    last: float
+    change_pct: float     # 24h price change
+    quote_volume: float   # 24h volume in the quote currency
+    volume_change: float  # Relative change of the 24h quote volume since the previous refresh
+    range_pct: float      # 24h high-low range as a percentage of the price
+
+
+def fetch_binance_us_tickers(session: Optional[requests.Session] = None, timeout: float = 10) -> Dict[str, Dict]:
+    """All Binance.US 24h tickers in one request, shaped like ccxt's fetch_tickers() (no ccxt needed)"""
+    response = (session or requests).get(BINANCE_US_TICKERS_URL, timeout=timeout)
+    response.raise_for_status()
+    tickers = {}
+    for item in response.json():
+        market_id = item.get('symbol', '')
+        quote = next((q for q in KNOWN_QUOTES if market_id.endswith(q) and len(market_id) > len(q)), None)
+        if quote is None:
+            continue
+        symbol = f"{market_id[:-len(quote)]}/{quote}"
+        tickers[symbol] = {
+            'symbol': symbol,
+            'last': float(item.get('lastPrice') or 0),
+            'high': float(item.get('highPrice') or 0),
+            'low': float(item.get('lowPrice') or 0),
+            'percentage': float(item.get('priceChangePercent') or 0),
+            'baseVolume': float(item.get('volume') or 0),
+            'quoteVolume': float(item.get('quoteVolume') or 0),
+        }
+    return tickers
+
+
+def _percentile_rank(values: np.ndarray) -> np.ndarray:
+    """0-1 rank of each value (ties share the lower rank)"""
+    if len(values) < 2:
+        return np.ones(len(values))
+    order = np.argsort(values, kind='stable')
+    sorted_values = values[order]
+    ranks = np.empty(len(values))
+    ranks[order] = np.searchsorted(sorted_values, sorted_values, side='left')
+    return ranks / (len(values) - 1)
+
+
+class TickerFunnel:
+    """Ranks a whole market from one fetch_tickers() call and picks the pairs worth a deep look"""
+
+    def __init__(self, fetch_tickers: Callable[[], Dict[str, Dict]], quote: str = 'USDT', top_k: int = 20,
+                 always_include: Iterable[str] = TIER_1_PAIRS, min_quote_volume: float = 100_000,
+                 min_interval: float = 30.0, weights: Optional[Dict[str, float]] = None):
+        self.fetch_tickers = fetch_tickers
+        self.quote = quote
+        self.top_k = top_k
+        self.always_include = list(always_include)
+        self.min_quote_volume = min_quote_volume
+        self.min_interval = min_interval  # Seconds between all-market requests
+        self.weights = weights or DEFAULT_WEIGHTS
+
+        self.tickers = {}            # symbol -> latest ticker (every listed pair)
+        self.ranked = []             # TrendingPair, best first
+        self.previous_volume = {}    # symbol -> quote volume at the previous refresh
+        self.refreshed_at = None     # monotonic time of the last successful refresh
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> bool:
+        """Fetch all tickers and re-rank; skipped if the last refresh is recent. False on failure"""
+        with self._lock:
+            if (not force and self.refreshed_at is not None and
+                    time.monotonic() - self.refreshed_at < self.min_interval):
+                return True
+            try:
+                tickers = self.fetch_tickers()
+            except Exception as e:
+                logger.error(f"Error fetching tickers: {e}")
+                return False
+            self.tickers = tickers
+            self.ranked = self.rank(tickers)
+            self.refreshed_at = time.monotonic()
+            return True
+
+    def rank(self, tickers: Dict[str, Dict]) -> List[TrendingPair]:
+        suffix = f"/{self.quote}"
+        symbols = [s for s, t in tickers.items() if s.endswith(suffix) and t.get('last')]
+        if not symbols:
+            return []
+
+        def column(key):
+            return np.array([float(tickers[s].get(key) or 0) for s in symbols])
+
+        last, high, low, change_pct = column('last'), column('high'), column('low'), column('percentage')
+        quote_volume = column('quoteVolume')
+        missing = quote_volume <= 0
+        quote_volume[missing] = (column('baseVolume') * last)[missing]
+
+        previous = np.array([self.previous_volume.get(s, np.nan) for s in symbols])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_change = np.where(previous > 0, quote_volume / previous - 1, 0.0)
+            range_pct = np.where(last > 0, (high - low) / last * 100, 0.0)
+        self.previous_volume = dict(zip(symbols, quote_volume.tolist()))
+
+        eligible = np.flatnonzero(quote_volume >= self.min_quote_volume)
+        if not len(eligible):
+            return []
+        score = (self.weights['volume_change'] * _percentile_rank(volume_change[eligible]) +
+                 self.weights['range'] * _percentile_rank(range_pct[eligible]) +
+                 self.weights['quote_volume'] * _percentile_rank(np.log1p(quote_volume[eligible])))
+
+        order = eligible[np.argsort(-score, kind='stable')]
+        score_by_index = dict(zip(eligible.tolist(), score.tolist()))
+        return [TrendingPair(symbol=symbols[i], score=score_by_index[i], last=float(last[i]),
+                             change_pct=float(change_pct[i]), quote_volume=float(quote_volume[i]),
+                             volume_change=float(volume_change[i]), range_pct=float(range_pct[i]))
+                for i in order]
+
+    def trending(self, n: Optional[int] = None) -> List[str]:
+        """Best-ranked symbols"""
+        return [pair.symbol for pair in self.ranked[:n or self.top_k]]
+
+    def deep_candidates(self, top_k: Optional[int] = None) -> List[str]:
+        """Symbols for the second stage: always-watched pairs, then the top-K not already included"""
+        symbols = list(dict.fromkeys(self.always_include))
+        seen = set(symbols)
+        for symbol in self.trending(top_k or self.top_k):
+            if symbol not in seen:
+                symbols.append(symbol)
+                seen.add(symbol)
+        return symbols
+
+    def ticker(self, symbol: str) -> Optional[Dict]:
+        return self.tickers.get(symbol)
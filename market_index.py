@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Market availability index.
+Which venues list which pairs (ccxt load_markets) and which CoinGecko id each base
+asset maps to (/coins/list), persisted to disk and refreshed daily, plus an expiring
+negative cache so unsupported symbol/source combinations are skipped instead of retried.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+COINS_LIST_URL = "https://api.coingecko.com/api/v3/coins/list"
+REFRESH_INTERVAL = 24 * 3600   # Rebuild the index daily
+NEGATIVE_TTL = 3600            # Retry a failed symbol/source after an hour
+
+# Base symbols shared by several CoinGecko coins resolve to these ids
+PREFERRED_COINGECKO_IDS = {
+    'BTC': 'bitcoin',
+    'ETH': 'ethereum',
+    'BNB': 'binancecoin',
+    'ADA': 'cardano',
+    'SOL': 'solana',
+    'XRP': 'ripple',
+    'DOT': 'polkadot',
+    'AVAX': 'avalanche-2',
+    'MATIC': 'matic-network',
+    'LINK': 'chainlink',
+    'UNI': 'uniswap',
+    'LTC': 'litecoin',
+    'BCH': 'bitcoin-cash',
+    'ALGO': 'algorand',
+    'VET': 'vechain',
+    'FIL': 'filecoin',
+    'TRX': 'tron',
+    'ETC': 'ethereum-classic',
+    'XLM': 'stellar',
+    'ATOM': 'cosmos',
+    'HBAR': 'hedera-hashgraph',
+    'NEAR': 'near',
+    'MANA': 'decentraland',
+    'SAND': 'the-sandbox',
+    'CRO': 'crypto-com-chain',
+    'APE': 'apecoin',
+    'LDO': 'lido-dao',
+    'SHIB': 'shiba-inu',
+    'ICP': 'internet-computer',
+    'DOGE': 'dogecoin',
+    'FTM': 'fantom',
+    'THETA': 'theta-token',
+    'AAVE': 'aave',
+    'COMP': 'compound-governance-token',
+    'MKR': 'maker',
+    'SUSHI': 'sushi',
+    'YFI': 'yearn-finance',
+    'ZEC': 'zcash',
+    'DASH': 'dash',
+    'EOS': 'eos',
+    'AXS': 'axie-infinity',
+    'ENJ': 'enjincoin',
+    'GALA': 'gala',
+    'CHZ': 'chiliz',
+    'BAT': 'basic-attention-token',
+    'ZIL': 'zilliqa',
+    'ONE': 'harmony',
+    'CELO': 'celo',
+    'ANKR': 'ankr',
+    'SKL': 'skale',
+}
+
+# Bridged/pegged copies share the base symbol; never pick them automatically
+_DERIVATIVE_MARKERS = ('bridged', 'wormhole', 'binance-peg', 'peg-', '-peg', 'wrapped', 'heco', 'celer')
+
+
+def _base(symbol: str) -> str:
+    return symbol.split('/')[0].upper()
+
+
+class MarketAvailabilityIndex:
+    """Venue listings and CoinGecko ids, cached on disk, with an expiring negative cache"""
+
+    def __init__(self, path: str = 'market_index.json', refresh_interval: float = REFRESH_INTERVAL,
+                 negative_ttl: float = NEGATIVE_TTL):
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.negative_ttl = negative_ttl
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': 'TradingBot/1.0'})
+
+        self.built_at = 0.0
+        self.venues = {}          # venue -> set of listed symbols
+        self.coingecko_ids = {}   # base symbol -> CoinGecko id
+        self.unavailable = {}     # (source, symbol) -> expiry (Unix time)
+        self._lock = threading.RLock()
+        self._refreshing = False
+        self._load()
+
+    # Persistence ---------------------------------------------------------
+
+    def _load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                self.built_at = data.get('built_at', 0.0)
+                self.venues = {venue: set(symbols) for venue, symbols in data.get('venues', {}).items()}
+                self.coingecko_ids = data.get('coingecko_ids', {})
+        except Exception as e:
+            logger.warning(f"Could not read market index {self.path}: {e}")
+
+    def _save(self):
+        data = {
+            'built_at': self.built_at,
+            'venues': {venue: sorted(symbols) for venue, symbols in self.venues.items()},
+            'coingecko_ids': self.coingecko_ids,
+        }
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not write market index {self.path}: {e}")
+
+    # Building ------------------------------------------------------------
+
+    def is_stale(self) -> bool:
+        return time.time() - self.built_at > self.refresh_interval
+
+    def ensure_fresh(self, exchanges: Dict, background: bool = True):
+        """Rebuild when older than a day; blocks only when there is no index yet"""
+        if not self.is_stale():
+            return
+        if not self.built_at or not background:
+            self.build(exchanges)
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self.build, args=(exchanges,), daemon=True).start()
+
+    def build(self, exchanges: Dict):
+        """Reload venue markets and the CoinGecko coin list (keeping old data on failure)"""
+        try:
+            venues = dict(self.venues)
+            for name, exchange in exchanges.items():
+                try:
+                    venues[name] = set(exchange.load_markets())
+                except Exception as e:
+                    logger.warning(f"Could not load markets for {name}: {e}")
+
+            coingecko_ids = self._fetch_coingecko_ids() or self.coingecko_ids
+
+            with self._lock:
+                self.venues = venues
+                self.coingecko_ids = coingecko_ids
+                self.built_at = time.time()
+                self.unavailable.clear()
+            self._save()
+            logger.info(f"Market index built: {', '.join(f'{v}={len(s)}' for v, s in venues.items())}, "
+                        f"coingecko={len(coingecko_ids)}")
+        finally:
+            self._refreshing = False
+
+    def _fetch_coingecko_ids(self) -> Dict[str, str]:
+        try:
+            response = self.session.get(COINS_LIST_URL, timeout=30)
+            response.raise_for_status()
+            coins = response.json()
+        except Exception as e:
+            logger.warning(f"Could not fetch CoinGecko coin list: {e}")
+            return {}
+
+        # Shortest non-derivative id per symbol (the native coin is usually the plain name)
+        ids = {}
+        for coin in coins:
+            coin_id = coin.get('id', '')
+            symbol = coin.get('symbol', '').upper()
+            if not coin_id or not symbol or any(marker in coin_id for marker in _DERIVATIVE_MARKERS):
+                continue
+            current = ids.get(symbol)
+            if current is None or len(coin_id) < len(current):
+                ids[symbol] = coin_id
+
+        ids.update(PREFERRED_COINGECKO_IDS)
+        return ids
+
+    # Queries -------------------------------------------------------------
+
+    def listed_symbols(self, venue: str) -> Optional[set]:
+        """Symbols a venue lists, or None when unknown"""
+        return self.venues.get(venue)
+
+    def coingecko_id(self, symbol: str) -> str:
+        """CoinGecko id for a pair's base asset ('' if unknown or negatively cached)"""
+        if self.is_unavailable('coingecko', symbol):
+            return ''
+        base = _base(symbol)
+        return self.coingecko_ids.get(base) or PREFERRED_COINGECKO_IDS.get(base, '')
+
+    def mark_unavailable(self, source: str, symbol: str, ttl: Optional[float] = None):
+        """Skip this symbol on this source (venue name, 'coingecko', ...) until the entry expires"""
+        with self._lock:
+            self.unavailable[(source, _base(symbol) if source == 'coingecko' else symbol)] = \
+                time.time() + (ttl or self.negative_ttl)
+
+    def is_unavailable(self, source: str, symbol: str) -> bool:
+        key = (source, _base(symbol) if source == 'coingecko' else symbol)
+        with self._lock:
+            expiry = self.unavailable.get(key)
+            if expiry is None:
+                return False
+            if expiry <= time.time():
+                del self.unavailable[key]
+                return False
+            return True
+
+    def report(self, symbols: List[str], quote_aliases: Optional[Dict[str, List[str]]] = None) -> Dict[str, List[str]]:
+        """Data sources each pair is missing from: {symbol: [venue or 'coingecko', ...]}"""
+        quote_aliases = quote_aliases or {}
+        missing = {}
+        for symbol in symbols:
+            base, _, quote = symbol.partition('/')
+            candidates = [f"{base}/{q}" for q in quote_aliases.get(quote, [quote])]
+            gaps = [venue for venue, listed in self.venues.items()
+                    if not any(candidate in listed for candidate in candidates)]
+            if not self.coingecko_id(symbol):
+                gaps.append('coingecko')
+            if gaps:
+                missing[symbol] = gaps
+        return missing
+
+
+_shared_index = None
+_shared_lock = threading.Lock()
+
+
+def shared_market_index() -> MarketAvailabilityIndex:
+    """Process-wide index shared by the data, on-chain, event and sentiment managers"""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = MarketAvailabilityIndex()
+        return _shared_index
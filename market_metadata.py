@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Disk-cached ccxt market metadata.
+Every exchange client created through create_exchange() shares one copy of its
+venue's markets (symbols, precision, limits) per process, loaded lazily from a
+local cache file and only downloaded when that file is missing or stale.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+import ccxt
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = 'market_cache'
+MAX_AGE = 24 * 3600  # Re-download markets once a day
+
+# Exchanges renamed in newer ccxt releases
+EXCHANGE_ALIASES = {'coinbasepro': 'coinbase'}
+
+
+class MarketMetadataCache:
+    """Per-venue markets shared in memory and persisted as JSON"""
+
+    def __init__(self, directory: str = CACHE_DIR, max_age: float = MAX_AGE):
+        self.directory = directory
+        self.max_age = max_age
+        self.loaded = {}   # exchange id -> (saved_at, markets, currencies)
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _path(self, exchange_id: str) -> str:
+        return os.path.join(self.directory, f"{exchange_id}_markets.json")
+
+    def _venue_lock(self, exchange_id: str) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(exchange_id, threading.Lock())
+
+    def _read(self, exchange_id: str):
+        path = self._path(exchange_id)
+        try:
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                return data['saved_at'], data['markets'], data.get('currencies')
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable market cache {path}: {e}")
+        return None
+
+    def _write(self, exchange_id: str, saved_at: float, markets: Dict, currencies: Optional[Dict]):
+        path = self._path(exchange_id)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump({'saved_at': saved_at, 'markets': markets, 'currencies': currencies},
+                          f, separators=(',', ':'), default=str)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not write market cache {path}: {e}")
+
+    def is_fresh(self, saved_at: float) -> bool:
+        return time.time() - saved_at < self.max_age
+
+    def load_markets(self, exchange, original_load_markets, reload: bool = False, params: Optional[Dict] = None):
+        """Replacement for exchange.load_markets(): memory, then disk, then network"""
+        if exchange.markets and not reload:
+            return exchange.markets
+
+        exchange_id = exchange.id
+        with self._venue_lock(exchange_id):
+            entry = None if reload else self.loaded.get(exchange_id)
+            if entry is None and not reload:
+                entry = self._read(exchange_id)
+
+            if entry is None or not self.is_fresh(entry[0]):
+                try:
+                    markets = original_load_markets(True, params or {})
+                    entry = (time.time(), markets, exchange.currencies)
+                    self._write(exchange_id, *entry)
+                except Exception as e:
+                    if entry is None:
+                        raise
+                    # Offline: a stale cache is still better than no markets
+                    logger.warning(f"Using stale markets for {exchange_id}: {e}")
+
+            self.loaded[exchange_id] = entry
+
+        _, markets, currencies = entry
+        if exchange.markets is not markets:
+            exchange.set_markets(markets, currencies)
+        return exchange.markets
+
+
+_shared_cache = MarketMetadataCache()
+
+
+def create_exchange(exchange_id: str, config: Optional[Dict] = None, cache: Optional[MarketMetadataCache] = None):
+    """Build a ccxt client whose markets come from the shared disk cache on first use"""
+    cache = cache or _shared_cache
+    exchange_class = getattr(ccxt, exchange_id, None)
+    if exchange_class is None and exchange_id in EXCHANGE_ALIASES:
+        exchange_class = getattr(ccxt, EXCHANGE_ALIASES[exchange_id])
+    if exchange_class is None:
+        raise ValueError(f"ccxt has no exchange '{exchange_id}'")
+
+    exchange = exchange_class(config or {})
+    original_load_markets = exchange.load_markets
+
+    # ccxt calls self.load_markets() before the first request; the instance attribute wins
+    def load_markets(reload=False, params={}):
+        return cache.load_markets(exchange, original_load_markets, reload, params)
+
+    exchange.load_markets = load_markets
+    return exchange
@@ -64,7 +64,7 @@ class MobileTradingDemo:
         for symbol in self.active_pairs:
             # Skip if already have suggestion or position
             if (symbol in self.position_manager.suggested_positions or 
-                symbol in self.position_manager.active_positions):
+                self.position_manager.has_active_position(symbol)):
                 continue
                 
             price, change_pct, signal_strength = self.simulate_market_data(symbol)
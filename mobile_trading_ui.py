@@ -9,19 +9,80 @@ from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.uix.tabs import TabPanel, TabbedPanel
 from kivy.uix.popup import Popup
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.metrics import dp
 from kivy.clock import Clock
 from mobile_trading_pairs import MobileTradingPairs, TIER_1_PAIRS, TIER_2_PAIRS
 from position_manager import PositionManager, PositionStatus
+from position_journal import PositionJournal
+from market_funnel import TickerFunnel, fetch_binance_us_tickers
+import os
+import threading
+import time
 
-class TradingPairCard(BoxLayout):
-    """Individual trading pair display card"""
-    def __init__(self, symbol, **kwargs):
+class PairDataStore:
+    """Shared symbol -> view-model store backing every pair list tab"""
+    def __init__(self):
+        self.rows = {}   # symbol -> view-model dict (shared by all tabs)
+        self.views = {}  # tab name -> (RecycleView, {symbol: index})
+    
+    def get_row(self, symbol):
+        """Get (or create) the view-model for a symbol"""
+        row = self.rows.get(symbol)
+        if row is None:
+            row = {
+                'symbol': symbol,
+                'price': 0.0,
+                'change_pct': 0.0,
+                'signal_strength': 0,
+                'position_status': ''
+            }
+            self.rows[symbol] = row
+        return row
+    
+    def bind_view(self, name, recycle_view, symbols):
+        """Attach a RecycleView tab to the store; its data list references the shared rows"""
+        self.views[name] = (recycle_view, {symbol: i for i, symbol in enumerate(symbols)})
+        recycle_view.data = [self.get_row(symbol) for symbol in symbols]
+    
+    def set_symbols(self, name, symbols):
+        """Replace the symbols shown in a tab (e.g. the dynamic Trending list)"""
+        if name in self.views:
+            self.bind_view(name, self.views[name][0], symbols)
+    
+    def symbols(self):
+        """All symbols currently shown in any tab (each listed once)"""
+        seen = {}
+        for _, index_map in self.views.values():
+            for symbol in index_map:
+                seen[symbol] = True
+        return list(seen)
+    
+    def update(self, symbol, **fields):
+        """Mutate one view-model and rebind only the rows currently on screen"""
+        row = self.get_row(symbol)
+        row.update(fields)
+        
+        for recycle_view, index_map in self.views.values():
+            index = index_map.get(symbol)
+            if index is None:
+                continue
+            view = recycle_view.view_adapter.get_visible_view(index)
+            if view is not None:
+                view.refresh_view_attrs(recycle_view, index, row)
+
+class TradingPairCard(RecycleDataViewBehavior, BoxLayout):
+    """Individual trading pair display card (recycled RecycleView row)"""
+    def __init__(self, **kwargs):
         super().__init__(orientation='horizontal', size_hint_y=None, height='60dp', **kwargs)
-        self.symbol = symbol
+        self.symbol = ''
+        self.index = None
         
         # Symbol name
         self.symbol_label = Label(
-            text=symbol,
+            text='',
             size_hint_x=0.25,
             font_size='14sp',
             bold=True
@@ -74,6 +135,13 @@ class TradingPairCard(BoxLayout):
         self.current_price = 0.0
         self.signal_strength = 0
     
+    def refresh_view_attrs(self, rv, index, data):
+        """Bind this recycled row to the view-model at index"""
+        self.index = index
+        self.symbol = data['symbol']
+        self.symbol_label.text = data['symbol']
+        self.update_data(data['price'], data['change_pct'], data['signal_strength'], data['position_status'])
+    
     def update_data(self, price, change_pct, signal_strength, position_status=""):
         """Update the card with new market data and position status"""
         self.current_price = price
@@ -135,8 +203,8 @@ class TradingPairCard(BoxLayout):
             # Check if there's a suggestion or active position
             if self.symbol in pm.suggested_positions:
                 self.show_suggestion_popup(pm.suggested_positions[self.symbol])
-            elif self.symbol in pm.active_positions:
-                self.show_active_position_popup(pm.active_positions[self.symbol])
+            elif pm.has_active_position(self.symbol):
+                self.show_active_position_popup(pm.get_positions_for_symbol(self.symbol)[0])
             elif self.signal_strength > 60:  # Strong signal
                 self.create_position_suggestion()
             else:
@@ -282,48 +350,49 @@ class MarketOverviewScreen(Screen):
         main_layout.add_widget(self.tabs)
         self.add_widget(main_layout)
         
+        # One all-market ticker request ranks every pair for the Trending tab. The rate limit is
+        # half the schedule so a tick arriving a little early (fetch latency) isn't skipped
+        self.funnel = TickerFunnel(fetch_binance_us_tickers, top_k=MOBILE_SETTINGS['max_pairs_per_tab'],
+                                   min_interval=MOBILE_SETTINGS['trending_refresh_seconds'] / 2)
+        
         # Start real-time updates
         Clock.schedule_interval(self.update_market_data, 10)  # Every 10 seconds
+        Clock.schedule_once(self.refresh_trending, 0)
+        Clock.schedule_interval(self.refresh_trending, MOBILE_SETTINGS['trending_refresh_seconds'])
     
     def create_tier_tabs(self):
         """Create tabs for different trading pair tiers"""
         mobile_config = MobileTradingPairs()
+        self.pair_store = PairDataStore()
         
         # Favorites Tab (User's selected pairs)
         favorites_tab = TabPanel(text='⭐ Favorites')
-        favorites_layout = self.create_pairs_layout(TIER_1_PAIRS[:6])
-        favorites_tab.add_widget(favorites_layout)
+        favorites_tab.add_widget(self.create_pairs_layout('favorites', TIER_1_PAIRS[:6]))
         self.tabs.add_widget(favorites_tab)
         
         # Major Cryptos Tab
         major_tab = TabPanel(text='🚀 Major')
-        major_layout = self.create_pairs_layout(TIER_1_PAIRS)
-        major_tab.add_widget(major_layout)
+        major_tab.add_widget(self.create_pairs_layout('major', TIER_1_PAIRS))
         self.tabs.add_widget(major_tab)
         
         # All Altcoins Tab
         alt_tab = TabPanel(text='📈 Alts')
-        alt_layout = self.create_pairs_layout(TIER_2_PAIRS)
-        alt_tab.add_widget(alt_layout)
+        alt_tab.add_widget(self.create_pairs_layout('alts', TIER_2_PAIRS))
         self.tabs.add_widget(alt_tab)
         
         # DeFi Tab
         defi_tab = TabPanel(text='🔥 DeFi')
-        defi_layout = self.create_pairs_layout(mobile_config.get_pairs_by_tier("tier3")[20:35])
-        defi_tab.add_widget(defi_layout)
+        defi_tab.add_widget(self.create_pairs_layout('defi', mobile_config.get_pairs_by_tier("tier3")[20:35]))
         self.tabs.add_widget(defi_tab)
         
         # Trending Tab (Dynamic)
         trending_tab = TabPanel(text='📊 Trending')
-        trending_layout = self.create_pairs_layout([])  # Will be populated dynamically
-        trending_tab.add_widget(trending_layout)
+        trending_tab.add_widget(self.create_pairs_layout('trending', []))  # Populated via set_trending_pairs
         self.tabs.add_widget(trending_tab)
     
-    def create_pairs_layout(self, pairs_list):
-        """Create scrollable layout for trading pairs"""
-        scroll = ScrollView()
-        grid = GridLayout(cols=1, size_hint_y=None, spacing=2)
-        grid.bind(minimum_height=grid.setter('height'))
+    def create_pairs_layout(self, name, pairs_list):
+        """Create a recycled (virtualized) list for trading pairs"""
+        layout = BoxLayout(orientation='vertical')
         
         # Add header
         header = BoxLayout(orientation='horizontal', size_hint_y=None, height='40dp')
@@ -333,37 +402,62 @@ class MarketOverviewScreen(Screen):
         header.add_widget(Label(text='Signal', size_hint_x=0.1, bold=True))
         header.add_widget(Label(text='Position', size_hint_x=0.15, bold=True))
         header.add_widget(Label(text='Action', size_hint_x=0.15, bold=True))
-        grid.add_widget(header)
-        
-        # Add trading pair cards
-        self.pair_cards = {}
-        for symbol in pairs_list:
-            card = TradingPairCard(symbol)
-            grid.add_widget(card)
-            self.pair_cards[symbol] = card
+        layout.add_widget(header)
+        
+        # Only the rows on screen get TradingPairCard widgets; they are reused while scrolling
+        recycle_view = RecycleView()
+        recycle_view.viewclass = TradingPairCard
+        rows_layout = RecycleBoxLayout(
+            orientation='vertical',
+            default_size=(None, dp(60)),
+            default_size_hint=(1, None),
+            size_hint_y=None,
+            spacing=2
+        )
+        rows_layout.bind(minimum_height=rows_layout.setter('height'))
+        recycle_view.add_widget(rows_layout)
         
-        scroll.add_widget(grid)
-        return scroll
+        self.pair_store.bind_view(name, recycle_view, pairs_list)
+        layout.add_widget(recycle_view)
+        return layout
+    
+    def set_trending_pairs(self, symbols):
+        """Show a new set of symbols in the Trending tab"""
+        self.pair_store.set_symbols('trending', symbols)
+    
+    def refresh_trending(self, dt):
+        """Re-rank the market off the UI thread, then update the Trending tab"""
+        threading.Thread(target=self._refresh_trending_worker, daemon=True).start()
+    
+    def _refresh_trending_worker(self):
+        if self.funnel.refresh():
+            trending = self.funnel.trending()
+            Clock.schedule_once(lambda dt: self.set_trending_pairs(trending), 0)
     
     def update_market_data(self, dt):
-        """Update market data for all visible pairs"""
+        """Update market data for every pair shown in any tab"""
         import random
         
         # Get position manager
         app = App.get_running_app()
         pm = getattr(app, 'position_manager', None)
         
-        for symbol, card in self.pair_cards.items():
-            # Simulate market data (replace with real data)
-            price = random.uniform(0.1, 50000)
-            change_pct = random.uniform(-10, 10)
+        for symbol in self.pair_store.symbols():
+            # Prices from the last all-market ticker snapshot; simulated until it arrives
+            ticker = self.funnel.ticker(symbol)
+            if ticker:
+                price = ticker['last']
+                change_pct = ticker['percentage']
+            else:
+                price = random.uniform(0.1, 50000)
+                change_pct = random.uniform(-10, 10)
             signal_strength = random.uniform(-100, 100)
             
             # Check position status
             position_status = ""
             if pm:
                 # Update any active positions
-                if symbol in pm.active_positions:
+                if pm.has_active_position(symbol):
                     result = pm.update_position(symbol, price)
                     position = result['position']
                     if position:
@@ -387,7 +481,13 @@ class MarketOverviewScreen(Screen):
                     suggestion = pm.suggest_position(symbol, signal_data)
                     position_status = f"💡{suggestion.signal_type}"
             
-            card.update_data(price, change_pct, signal_strength, position_status)
+            self.pair_store.update(
+                symbol,
+                price=price,
+                change_pct=change_pct,
+                signal_strength=signal_strength,
+                position_status=position_status
+            )
 
 class SignalAlertsScreen(Screen):
     """Screen for managing signal alerts"""
@@ -421,6 +521,110 @@ class SignalAlertsScreen(Screen):
         layout.add_widget(scroll)
         self.add_widget(layout)
 
+# Closed positions kept on the History tab
+HISTORY_ROWS = 10
+
+class SuggestionRow(BoxLayout):
+    """Suggestions grid row, created once per suggestion and updated in place"""
+    def __init__(self, screen, position, **kwargs):
+        super().__init__(orientation='horizontal', size_hint_y=None, height='50dp', **kwargs)
+        self.symbol = position.symbol
+        
+        self.symbol_label = Label(text=position.symbol, size_hint_x=0.2)
+        self.type_label = Label(size_hint_x=0.15)
+        self.entry_label = Label(size_hint_x=0.2)
+        self.rr_label = Label(size_hint_x=0.15)
+        self.confidence_label = Label(size_hint_x=0.15)
+        
+        # Accept button
+        accept_btn = Button(text="✅", size_hint_x=0.15, background_color=(0, 0.8, 0, 1))
+        accept_btn.bind(on_release=lambda x: screen.accept_suggestion(self.symbol))
+        
+        for widget in (self.symbol_label, self.type_label, self.entry_label,
+                       self.rr_label, self.confidence_label, accept_btn):
+            self.add_widget(widget)
+        
+        self.update(position)
+    
+    def update(self, position):
+        """Refresh the labels from the position"""
+        self.position_id = position.position_id
+        
+        # Color-coded signal type
+        self.type_label.text = position.signal_type
+        self.type_label.color = (0, 1, 0, 1) if position.signal_type == "BUY" else (1, 0, 0, 1)
+        self.entry_label.text = f"${position.entry_price:.2f}"
+        self.rr_label.text = f"{position.risk_reward_ratio:.1f}:1"
+        self.confidence_label.text = f"{position.confidence}%"
+
+class ActivePositionRow(BoxLayout):
+    """Active positions grid row, mutated in place as P&L changes"""
+    def __init__(self, screen, position, **kwargs):
+        super().__init__(orientation='horizontal', size_hint_y=None, height='50dp', **kwargs)
+        self.symbol = position.symbol
+        self.position_id = position.position_id
+        
+        self.symbol_label = Label(text=position.symbol, size_hint_x=0.2)
+        self.type_label = Label(size_hint_x=0.1)
+        self.entry_label = Label(size_hint_x=0.15)
+        self.current_label = Label(size_hint_x=0.15)
+        self.pnl_label = Label(size_hint_x=0.15)
+        self.pnl_pct_label = Label(size_hint_x=0.1)
+        
+        # Close button
+        close_btn = Button(text="🚪", size_hint_x=0.15, background_color=(0.8, 0.4, 0, 1))
+        close_btn.bind(on_release=lambda x: screen.close_position(self.position_id))
+        
+        for widget in (self.symbol_label, self.type_label, self.entry_label, self.current_label,
+                       self.pnl_label, self.pnl_pct_label, close_btn):
+            self.add_widget(widget)
+        
+        self.update(position)
+    
+    def update(self, position):
+        """Refresh prices and P&L from the position"""
+        # Color-coded signal type
+        self.type_label.text = position.signal_type
+        self.type_label.color = (0, 1, 0, 1) if position.signal_type == "BUY" else (1, 0, 0, 1)
+        self.entry_label.text = f"${position.entry_price:.2f}"
+        self.current_label.text = f"${position.current_price:.2f}"
+        
+        # Color-coded P&L
+        pnl_color = (0, 1, 0, 1) if position.profit_loss > 0 else (1, 0, 0, 1)
+        self.pnl_label.text = f"${position.profit_loss:.2f}"
+        self.pnl_label.color = pnl_color
+        self.pnl_pct_label.text = f"{position.profit_pct:+.1f}%"
+        self.pnl_pct_label.color = pnl_color
+
+class HistoryRow(BoxLayout):
+    """History grid row for a closed position (static once created)"""
+    def __init__(self, position, **kwargs):
+        super().__init__(orientation='horizontal', size_hint_y=None, height='40dp', **kwargs)
+        
+        self.add_widget(Label(text=position.symbol, size_hint_x=0.2))
+        
+        # Color-coded signal type
+        type_label = Label(text=position.signal_type, size_hint_x=0.1)
+        type_label.color = (0, 1, 0, 1) if position.signal_type == "BUY" else (1, 0, 0, 1)
+        self.add_widget(type_label)
+        
+        # Exit reason
+        exit_text = position.status.value.replace('_', ' ').title()
+        self.add_widget(Label(text=exit_text, size_hint_x=0.2))
+        
+        # Color-coded P&L
+        pnl_color = (0, 1, 0, 1) if position.profit_loss > 0 else (1, 0, 0, 1)
+        self.add_widget(Label(text=f"${position.profit_loss:.2f}", size_hint_x=0.15, color=pnl_color))
+        self.add_widget(Label(text=f"{position.profit_pct:+.1f}%", size_hint_x=0.15, color=pnl_color))
+        
+        # Duration
+        if position.exit_time:
+            duration = position.exit_time - position.entry_time
+            hours = duration.total_seconds() / 3600
+            self.add_widget(Label(text=f"{hours:.1f}h", size_hint_x=0.2))
+        else:
+            self.add_widget(Label(text="--", size_hint_x=0.2))
+
 class PositionsScreen(Screen):
     """Screen for managing active positions and suggestions"""
     def __init__(self, **kwargs):
@@ -453,8 +657,17 @@ class PositionsScreen(Screen):
         layout.add_widget(self.tabs)
         self.add_widget(layout)
         
-        # Update every 5 seconds
-        Clock.schedule_interval(self.update_positions, 5)
+        # Keyed row widgets, created once and mutated in place
+        self.suggestion_rows = {}  # symbol -> SuggestionRow
+        self.active_rows = {}      # position_id -> ActivePositionRow
+        self.history_rows = []     # last HISTORY_ROWS HistoryRow widgets, oldest first
+        
+        # Position changes are queued and applied once per frame
+        self._pending_events = []  # structural changes, in order
+        self._pending_updates = {}  # position_id -> position with new prices
+        self._apply_trigger = Clock.create_trigger(self.apply_position_events)
+        self._expiry_event = None  # one-shot clock for the next position/suggestion deadline
+        Clock.schedule_once(self.bind_position_manager, 0)
     
     def create_suggestions_layout(self):
         """Create layout for position suggestions"""
@@ -502,13 +715,14 @@ class PositionsScreen(Screen):
         self.history_grid.bind(minimum_height=self.history_grid.setter('height'))
         
         # Portfolio summary
-        summary_layout = BoxLayout(orientation='vertical', size_hint_y=None, height='120dp')
+        summary_layout = BoxLayout(orientation='vertical', size_hint_y=None, height='150dp')
         summary_layout.add_widget(Label(text='📊 Portfolio Summary', bold=True))
         
         self.portfolio_labels = {
             'total_pnl': Label(text='Total P&L: $0.00'),
             'win_rate': Label(text='Win Rate: 0%'),
             'active_count': Label(text='Active Positions: 0'),
+            'drawdown': Label(text='Max Drawdown: $0.00'),
         }
         
         for label in self.portfolio_labels.values():
@@ -529,148 +743,124 @@ class PositionsScreen(Screen):
         scroll.add_widget(self.history_grid)
         return scroll
     
-    def update_positions(self, dt):
-        """Update all position displays"""
+    def bind_position_manager(self, dt):
+        """Subscribe to position changes and build the initial rows"""
         app = App.get_running_app()
         pm = getattr(app, 'position_manager', None)
         
         if not pm:
             return
         
-        # Clear existing entries (except headers)
-        self.clear_grid_content(self.suggestions_grid, 1)  # Keep header
-        self.clear_grid_content(self.active_grid, 1)
-        self.clear_grid_content(self.history_grid, 2)  # Keep summary + header
+        pm.add_listener(self.on_position_event)
         
-        # Update suggestions
         for suggestion in pm.get_position_suggestions():
             self.add_suggestion_row(suggestion)
-        
-        # Update active positions
         for position in pm.get_active_positions():
             self.add_active_position_row(position)
+        for position in pm.position_history[-HISTORY_ROWS:]:
+            self.add_history_row(position)
+        self.update_portfolio_summary(pm)
+        self.schedule_expiry(pm)
+    
+    def schedule_expiry(self, pm):
+        """Wake up exactly at the next time-limit exit or suggestion expiry"""
+        if self._expiry_event:
+            self._expiry_event.cancel()
+            self._expiry_event = None
+        
+        deadline = pm.next_expiry()
+        if deadline is not None:
+            self._expiry_event = Clock.schedule_once(self.run_expiry, max(0, deadline - time.time()))
+    
+    def run_expiry(self, dt):
+        """Fire due deadlines; resulting events reschedule the next wake-up"""
+        self._expiry_event = None
+        app = App.get_running_app()
+        pm = getattr(app, 'position_manager', None)
+        if pm:
+            pm.expire_due()
+            self.schedule_expiry(pm)
+    
+    def on_position_event(self, event, position):
+        """PositionManager listener; batches changes until the next frame"""
+        if event == 'updated':
+            self._pending_updates[position.position_id] = position
+        else:
+            self._pending_events.append((event, position))
+        self._apply_trigger()
+    
+    def apply_position_events(self, dt):
+        """Apply queued changes to the affected rows only"""
+        app = App.get_running_app()
+        pm = getattr(app, 'position_manager', None)
         
-        # Update portfolio summary
+        events, self._pending_events = self._pending_events, []
+        updates, self._pending_updates = self._pending_updates, {}
+        
+        for event, position in events:
+            if event == 'suggested':
+                row = self.suggestion_rows.get(position.symbol)
+                if row:
+                    row.update(position)
+                else:
+                    self.add_suggestion_row(position)
+            elif event == 'entered':
+                self.remove_row(self.suggestion_rows, self.suggestions_grid, position.symbol)
+                self.add_active_position_row(position)
+            elif event == 'exited':
+                self.remove_row(self.active_rows, self.active_grid, position.position_id)
+                self.add_history_row(position)
+            elif event == 'expired':
+                row = self.suggestion_rows.get(position.symbol)
+                if row and row.position_id == position.position_id:
+                    self.remove_row(self.suggestion_rows, self.suggestions_grid, position.symbol)
+        
+        for position_id, position in updates.items():
+            row = self.active_rows.get(position_id)
+            if row:
+                row.update(position)
+        
+        if pm:
+            self.update_portfolio_summary(pm)
+            if events:
+                self.schedule_expiry(pm)
+    
+    def update_portfolio_summary(self, pm):
+        """Update portfolio summary labels"""
         summary = pm.get_portfolio_summary()
         self.portfolio_labels['total_pnl'].text = f"Total P&L: ${summary['total_pnl_30d']:.2f}"
         self.portfolio_labels['win_rate'].text = f"Win Rate: {summary['win_rate_30d']:.1f}%"
         self.portfolio_labels['active_count'].text = f"Active Positions: {summary['active_positions']}"
-        
-        # Update history (last 10 entries)
-        for position in pm.position_history[-10:]:
-            self.add_history_row(position)
+        self.portfolio_labels['drawdown'].text = f"Max Drawdown: ${summary['max_drawdown']:.2f}"
     
-    def clear_grid_content(self, grid, keep_count):
-        """Clear grid content but keep first 'keep_count' items"""
-        children = list(grid.children)
-        for i, child in enumerate(children):
-            if i < len(children) - keep_count:
-                grid.remove_widget(child)
+    def remove_row(self, rows, grid, key):
+        """Remove a keyed row widget from its grid"""
+        row = rows.pop(key, None)
+        if row is not None:
+            grid.remove_widget(row)
     
     def add_suggestion_row(self, suggestion):
         """Add suggestion row to suggestions grid"""
-        row = BoxLayout(orientation='horizontal', size_hint_y=None, height='50dp')
-        
-        row.add_widget(Label(text=suggestion.symbol, size_hint_x=0.2))
-        
-        # Color-coded signal type
-        type_label = Label(text=suggestion.signal_type, size_hint_x=0.15)
-        if suggestion.signal_type == "BUY":
-            type_label.color = (0, 1, 0, 1)  # Green
-        else:
-            type_label.color = (1, 0, 0, 1)  # Red
-        row.add_widget(type_label)
-        
-        row.add_widget(Label(text=f"${suggestion.entry_price:.2f}", size_hint_x=0.2))
-        row.add_widget(Label(text=f"{suggestion.risk_reward_ratio:.1f}:1", size_hint_x=0.15))
-        row.add_widget(Label(text=f"{suggestion.confidence}%", size_hint_x=0.15))
-        
-        # Accept button
-        accept_btn = Button(text="✅", size_hint_x=0.15, background_color=(0, 0.8, 0, 1))
-        accept_btn.bind(on_release=lambda x: self.accept_suggestion(suggestion.symbol))
-        row.add_widget(accept_btn)
-        
+        self.remove_row(self.suggestion_rows, self.suggestions_grid, suggestion.symbol)
+        row = SuggestionRow(self, suggestion)
+        self.suggestion_rows[suggestion.symbol] = row
         self.suggestions_grid.add_widget(row)
     
     def add_active_position_row(self, position):
         """Add active position row to active grid"""
-        row = BoxLayout(orientation='horizontal', size_hint_y=None, height='50dp')
-        
-        row.add_widget(Label(text=position.symbol, size_hint_x=0.2))
-        
-        # Color-coded signal type
-        type_label = Label(text=position.signal_type, size_hint_x=0.1)
-        if position.signal_type == "BUY":
-            type_label.color = (0, 1, 0, 1)  # Green
-        else:
-            type_label.color = (1, 0, 0, 1)  # Red
-        row.add_widget(type_label)
-        
-        row.add_widget(Label(text=f"${position.entry_price:.2f}", size_hint_x=0.15))
-        row.add_widget(Label(text=f"${position.current_price:.2f}", size_hint_x=0.15))
-        
-        # Color-coded P&L
-        pnl_label = Label(text=f"${position.profit_loss:.2f}", size_hint_x=0.15)
-        pnl_pct_label = Label(text=f"{position.profit_pct:+.1f}%", size_hint_x=0.1)
-        
-        if position.profit_loss > 0:
-            pnl_label.color = (0, 1, 0, 1)  # Green
-            pnl_pct_label.color = (0, 1, 0, 1)
-        else:
-            pnl_label.color = (1, 0, 0, 1)  # Red
-            pnl_pct_label.color = (1, 0, 0, 1)
-        
-        row.add_widget(pnl_label)
-        row.add_widget(pnl_pct_label)
-        
-        # Close button
-        close_btn = Button(text="🚪", size_hint_x=0.15, background_color=(0.8, 0.4, 0, 1))
-        close_btn.bind(on_release=lambda x: self.close_position(position.symbol))
-        row.add_widget(close_btn)
-        
+        self.remove_row(self.active_rows, self.active_grid, position.position_id)
+        row = ActivePositionRow(self, position)
+        self.active_rows[position.position_id] = row
         self.active_grid.add_widget(row)
     
     def add_history_row(self, position):
-        """Add history row to history grid"""
-        row = BoxLayout(orientation='horizontal', size_hint_y=None, height='40dp')
-        
-        row.add_widget(Label(text=position.symbol, size_hint_x=0.2))
-        
-        # Color-coded signal type
-        type_label = Label(text=position.signal_type, size_hint_x=0.1)
-        if position.signal_type == "BUY":
-            type_label.color = (0, 1, 0, 1)
-        else:
-            type_label.color = (1, 0, 0, 1)
-        row.add_widget(type_label)
-        
-        # Exit reason
-        exit_text = position.status.value.replace('_', ' ').title()
-        row.add_widget(Label(text=exit_text, size_hint_x=0.2))
-        
-        # Color-coded P&L
-        pnl_label = Label(text=f"${position.profit_loss:.2f}", size_hint_x=0.15)
-        pnl_pct_label = Label(text=f"{position.profit_pct:+.1f}%", size_hint_x=0.15)
-        
-        if position.profit_loss > 0:
-            pnl_label.color = (0, 1, 0, 1)
-            pnl_pct_label.color = (0, 1, 0, 1)
-        else:
-            pnl_label.color = (1, 0, 0, 1)
-            pnl_pct_label.color = (1, 0, 0, 1)
-        
-        row.add_widget(pnl_label)
-        row.add_widget(pnl_pct_label)
-        
-        # Duration
-        if position.exit_time:
-            duration = position.exit_time - position.entry_time
-            hours = duration.total_seconds() / 3600
-            row.add_widget(Label(text=f"{hours:.1f}h", size_hint_x=0.2))
-        else:
-            row.add_widget(Label(text="--", size_hint_x=0.2))
-        
+        """Add history row to history grid, dropping the oldest beyond HISTORY_ROWS"""
+        row = HistoryRow(position)
+        self.history_rows.append(row)
         self.history_grid.add_widget(row)
+        
+        while len(self.history_rows) > HISTORY_ROWS:
+            self.history_grid.remove_widget(self.history_rows.pop(0))
     
     def accept_suggestion(self, symbol):
         """Accept a position suggestion"""
@@ -678,18 +868,19 @@ class PositionsScreen(Screen):
         if hasattr(app, 'position_manager'):
             app.position_manager.accept_suggestion(symbol)
     
-    def close_position(self, symbol):
+    def close_position(self, position_id):
         """Close an active position"""
         app = App.get_running_app()
-        if hasattr(app, 'position_manager') and symbol in app.position_manager.active_positions:
-            position = app.position_manager.active_positions[symbol]
+        if hasattr(app, 'position_manager') and position_id in app.position_manager.active_positions:
+            position = app.position_manager.active_positions[position_id]
             app.position_manager._handle_position_exit(position, "manual_exit")
 
 class MobileTradingApp(App):
     """Main mobile trading application"""
     def build(self):
-        # Initialize position manager
-        self.position_manager = PositionManager()
+        # Initialize position manager, restoring open positions from the journal
+        journal = PositionJournal(os.path.join(self.user_data_dir, 'positions.db'))
+        self.position_manager = PositionManager(journal=journal)
         
         sm = ScreenManager()
         
@@ -699,10 +890,18 @@ class MobileTradingApp(App):
         sm.add_widget(PositionsScreen())
         
         return sm
+    
+    def on_stop(self):
+        """Snapshot positions so the next launch replays as little as possible"""
+        journal = self.position_manager.journal
+        if journal:
+            self.position_manager.compact_journal()
+            journal.close()
 
 # Performance optimizations for mobile
 MOBILE_SETTINGS = {
     'max_pairs_per_tab': 20,           # Limit pairs per tab for performance
+    'trending_refresh_seconds': 60,    # All-market ticker request behind the Trending tab
     'lazy_loading': True,              # Load data as user scrolls
     'background_updates': 6,           # Only update top 6 pairs in background
     'signal_threshold': 50,            # Only show signals above 50% strength
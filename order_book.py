@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Local order books from Binance.US diff-depth streams.
+Each book starts from a REST snapshot and applies the streamed depth updates in
+sequence; a gap in the update ids (or a reconnect) invalidates the book until a new
+snapshot covering the buffered updates is loaded and they are replayed onto it. Levels
+are kept best-first in sorted NumPy arrays, so an update is a few searchsorted/insert
+calls, and the books expose top-of-book imbalance, spread and wall features for signal
+scoring.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import requests
+
+from mobile_trading_pairs import TIER_1_PAIRS
+
+logger = logging.getLogger(__name__)
+
+BINANCE_US_STREAM_URL = "wss://stream.binance.us:9443/stream"
+BINANCE_US_DEPTH_URL = "https://api.binance.us/api/v3/depth"
+DEPTH_STREAM_SOURCE = 'depth_stream'  # Source name of stream frames in a session recording
+NO_BOOK_VERSION = ('no_book',)  # feature_version() of a symbol scored without book features
+SNAPSHOT_ATTEMPTS = 3  # Snapshots fetched per resync before backing off, if each is older than the buffer
+
+
+class SequenceGap(Exception):
+    """A depth update doesn't continue from the book's last update id"""
+
+
+def market_id(symbol: str) -> str:
+    """'BTC/USDT' -> 'BTCUSDT'"""
+    return symbol.replace('/', '').upper()
+
+
+class BookSide:
+    """One side's price levels, best first: sorted keys (price, negated for bids) and quantities"""
+
+    def __init__(self, descending: bool, max_levels: int = 5000):
+        self.sign = -1.0 if descending else 1.0
+        self.max_levels = max_levels
+        self.keys = np.empty(0)
+        self.qty = np.empty(0)
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self.keys * self.sign
+
+    def load(self, levels: List):
+        """Replace every level from [[price, qty], ...] (strings or numbers)"""
+        arr = np.asarray(levels, dtype=float).reshape(-1, 2)
+        arr = arr[arr[:, 1] > 0]
+        keys = arr[:, 0] * self.sign
+        order = np.argsort(keys, kind='stable')[:self.max_levels]
+        self.keys = keys[order]
+        self.qty = arr[order, 1]
+
+    def apply(self, levels: List):
+        """Set the quantity of each [price, qty]; zero removes the level"""
+        if not levels:
+            return
+        arr = np.asarray(levels, dtype=float).reshape(-1, 2)
+        keys = arr[:, 0] * self.sign
+        qty = arr[:, 1]
+
+        idx = np.searchsorted(self.keys, keys)
+        found = idx < len(self.keys)
+        found[found] = self.keys[idx[found]] == keys[found]
+
+        changed = found & (qty > 0)
+        self.qty[idx[changed]] = qty[changed]
+
+        removed = found & (qty <= 0)
+        if removed.any():
+            self.keys = np.delete(self.keys, idx[removed])
+            self.qty = np.delete(self.qty, idx[removed])
+
+        added = ~found & (qty > 0)
+        if added.any():
+            order = np.argsort(keys[added], kind='stable')
+            new_keys, new_qty = keys[added][order], qty[added][order]
+            positions = np.searchsorted(self.keys, new_keys)
+            self.keys = np.insert(self.keys, positions, new_keys)
+            self.qty = np.insert(self.qty, positions, new_qty)
+            if len(self.keys) > self.max_levels:
+                self.keys = self.keys[:self.max_levels]
+                self.qty = self.qty[:self.max_levels]
+
+    def levels_within(self, mid: float, range_pct: float) -> int:
+        """Number of best levels priced within range_pct of mid"""
+        limit = self.sign * mid * (1 + self.sign * range_pct / 100)
+        return int(np.searchsorted(self.keys, limit, side='right'))
+
+
+class LocalOrderBook:
+    """One symbol's book, kept in sync with the diff-depth stream"""
+
+    def __init__(self, symbol: str, max_levels: int = 5000):
+        self.symbol = symbol
+        self.bids = BookSide(descending=True, max_levels=max_levels)
+        self.asks = BookSide(descending=False, max_levels=max_levels)
+        self.last_update_id = None
+        self.synced = False
+        self.updated_at = None  # Monotonic time of the last applied snapshot/update
+        self.stats = {'updates': 0, 'resyncs': 0, 'gaps': 0, 'stale_snapshots': 0, 'overflows': 0}
+        self._awaiting_first = False
+
+    def load_snapshot(self, snapshot: Dict):
+        self.bids.load(snapshot.get('bids', []))
+        self.asks.load(snapshot.get('asks', []))
+        self.last_update_id = int(snapshot['lastUpdateId'])
+        self.synced = True
+        self._awaiting_first = True
+        self.updated_at = time.monotonic()
+        self.stats['resyncs'] += 1
+
+    def apply_diff(self, event: Dict) -> bool:
+        """Apply a depthUpdate event; False if the snapshot already covers it"""
+        first, last = int(event['U']), int(event['u'])
+        if last <= self.last_update_id:
+            return False
+        if self._awaiting_first:
+            # The first update after a snapshot must straddle lastUpdateId + 1
+            if first > self.last_update_id + 1:
+                raise SequenceGap(f"{self.symbol}: first update {first} is past snapshot {self.last_update_id}")
+        elif first != self.last_update_id + 1:
+            raise SequenceGap(f"{self.symbol}: expected update {self.last_update_id + 1}, got {first}")
+
+        self.bids.apply(event.get('b'))
+        self.asks.apply(event.get('a'))
+        self.last_update_id = last
+        self._awaiting_first = False
+        self.updated_at = time.monotonic()
+        self.stats['updates'] += 1
+        return True
+
+    def invalidate(self):
+        self.synced = False
+
+    def _wall(self, side: BookSide, mid: float, range_pct: float, wall_factor: float) -> Dict:
+        """Largest level near the mid if it dwarfs the median level there"""
+        n = side.levels_within(mid, range_pct)
+        if n < 3:
+            return {'wall': False}
+        qty = side.qty[:n]
+        i = int(np.argmax(qty))
+        ratio = float(qty[i] / np.median(qty))
+        if ratio < wall_factor:
+            return {'wall': False}
+        price = float(side.keys[i] * side.sign)
+        return {'wall': True, 'wall_price': price, 'wall_size': float(qty[i]), 'wall_ratio': ratio,
+                'wall_distance_pct': abs(price - mid) / mid * 100}
+
+    def features(self, depth: int = 10, wall_range_pct: float = 1.0, wall_factor: float = 5.0) -> Optional[Dict]:
+        """Spread, top-N notional imbalance (-1 all asks .. +1 all bids) and walls; None if unusable"""
+        if not self.synced or not len(self.bids) or not len(self.asks):
+            return None
+        best_bid = float(self.bids.keys[0] * self.bids.sign)
+        best_ask = float(self.asks.keys[0])
+        mid = (best_bid + best_ask) / 2
+        bid_depth = float(np.dot(self.bids.prices[:depth], self.bids.qty[:depth]))
+        ask_depth = float(np.dot(self.asks.prices[:depth], self.asks.qty[:depth]))
+        total = bid_depth + ask_depth
+
+        features = {
+            'best_bid': best_bid,
+            'best_ask': best_ask,
+            'mid': mid,
+            'spread': best_ask - best_bid,
+            'spread_bps': (best_ask - best_bid) / mid * 10000 if mid > 0 else 0,
+            'bid_depth': bid_depth,
+            'ask_depth': ask_depth,
+            'imbalance': (bid_depth - ask_depth) / total if total > 0 else 0,
+            'age': time.monotonic() - self.updated_at,
+        }
+        for name, side in (('bid', self.bids), ('ask', self.asks)):
+            for key, value in self._wall(side, mid, wall_range_pct, wall_factor).items():
+                features[f"{name}_{key}"] = value
+        return features
+
+
+class OrderBookManager:
+    """Diff-depth subscriptions and local books for a set of symbols"""
+
+    def __init__(self, symbols: Iterable[str] = TIER_1_PAIRS, depth_limit: int = 1000, max_levels: int = 5000,
+                 stream_url: str = BINANCE_US_STREAM_URL, snapshot_url: str = BINANCE_US_DEPTH_URL,
+                 update_speed: str = '100ms', stale_after: float = 60.0, pending_limit: int = 1000,
+                 inline_resync: bool = False, session: Optional[requests.Session] = None):
+        self.books = {symbol: LocalOrderBook(symbol, max_levels) for symbol in symbols}
+        self.depth_limit = depth_limit
+        self.stream_url = stream_url      # Point both URLs at a local server to test against recorded depth
+        self.snapshot_url = snapshot_url
+        self.update_speed = update_speed
+        self.stale_after = stale_after    # Seconds without updates before a book's features are withheld
+        self.session = session or requests.Session()
+        self.session.headers.update({'User-Agent': 'TradingBot/1.0'})
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='orderbook')
+        self.recorder = None              # Optional SessionRecorder for the raw stream frames
+        self.inline_resync = inline_resync  # Resync on the feeding thread (deterministic replays)
+
+        self._symbols = {market_id(symbol): symbol for symbol in self.books}
+        self._pending = {symbol: deque(maxlen=pending_limit) for symbol in self.books}  # Updates awaiting a snapshot
+        self._dropped = dict.fromkeys(self.books, 0)  # Oldest pending updates pushed out since the last resync
+        self._resyncing = set()
+        self._retry_at = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._ws = None
+
+    def stream_names(self) -> List[str]:
+        return [f"{mid.lower()}@depth@{self.update_speed}" for mid in self._symbols]
+
+    def start(self):
+        """Connect in a background thread (reconnecting until stop); needs websocket-client"""
+        import websocket  # websocket-client, only needed for live streaming
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(websocket,), daemon=True, name='orderbook-stream')
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._ws is not None:
+            self._ws.close()
+
+    def _run(self, websocket):
+        url = f"{self.stream_url}?streams={'/'.join(self.stream_names())}"
+        while not self._stop.is_set():
+            self._ws = websocket.WebSocketApp(
+                url,
+                on_message=lambda ws, message: self.feed(message),
+                on_error=lambda ws, error: logger.error(f"Depth stream error: {error}")
+            )
+            self._ws.run_forever(ping_interval=20, ping_timeout=10)
+            # Updates were lost while disconnected; every book needs a new snapshot
+            with self._lock:
+                for book in self.books.values():
+                    book.invalidate()
+            if self._stop.wait(5):
+                break
+            logger.warning("Depth stream disconnected; reconnecting")
+
+    def feed(self, message: str):
+        """Handle one raw stream frame (combined-stream or plain depthUpdate JSON)"""
+        if self.recorder is not None:
+            self.recorder.record(DEPTH_STREAM_SOURCE, self.stream_url, message)
+        try:
+            payload = json.loads(message)
+        except ValueError:
+            return
+        event = payload.get('data', payload)
+        if event.get('e') != 'depthUpdate':
+            return
+        symbol = self._symbols.get(event.get('s'))
+        if symbol is not None:
+            self.handle_event(symbol, event)
+
+    def handle_event(self, symbol: str, event: Dict):
+        with self._lock:
+            book = self.books[symbol]
+            if book.synced:
+                try:
+                    book.apply_diff(event)
+                    return
+                except SequenceGap as e:
+                    logger.warning(f"{e}; resyncing")
+                    book.invalidate()
+                    book.stats['gaps'] += 1
+            pending = self._pending[symbol]
+            if len(pending) == pending.maxlen:
+                # The oldest update falls out; the snapshot then has to cover the rest instead
+                self._dropped[symbol] += 1
+                book.stats['overflows'] += 1
+            pending.append(event)
+            if not self._claim_resync(symbol):
+                return
+        if self.inline_resync:
+            self._resync(symbol)
+        else:
+            self.executor.submit(self._resync, symbol)
+
+    def _claim_resync(self, symbol: str) -> bool:
+        """Mark a resync as started unless one is running or backing off (time is virtual in a replay)"""
+        if symbol in self._resyncing or time.monotonic() < self._retry_at.get(symbol, 0):
+            return False
+        self._resyncing.add(symbol)
+        return True
+
+    def fetch_snapshot(self, symbol: str) -> Dict:
+        response = self.session.get(self.snapshot_url, params={'symbol': market_id(symbol), 'limit': self.depth_limit},
+                                    timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    def _resync(self, symbol: str):
+        """Load a snapshot covering the updates buffered since the book went out of sync, then replay them"""
+        for _ in range(SNAPSHOT_ATTEMPTS):
+            try:
+                snapshot = self.fetch_snapshot(symbol)
+            except Exception as e:
+                logger.error(f"Error fetching depth snapshot for {symbol}: {e}")
+                with self._lock:
+                    self._retry_at[symbol] = time.monotonic() + 5
+                    self._resyncing.discard(symbol)
+                return
+
+            with self._lock:
+                book = self.books[symbol]
+                pending = self._pending[symbol]
+                if pending and int(snapshot['lastUpdateId']) + 1 < int(pending[0]['U']):
+                    # Taken before the oldest buffered update; the next snapshot will cover it
+                    book.stats['stale_snapshots'] += 1
+                    continue
+                if self._dropped[symbol]:
+                    logger.warning(f"{symbol}: {self._dropped[symbol]} depth updates overflowed the buffer "
+                                   f"while awaiting a snapshot")
+                    self._dropped[symbol] = 0
+                self._pending[symbol] = deque(maxlen=pending.maxlen)
+                book.load_snapshot(snapshot)
+                try:
+                    for event in pending:
+                        book.apply_diff(event)
+                except SequenceGap as e:
+                    # The buffer itself has a hole (a missed frame); start over from the next update
+                    logger.warning(f"{e}; resyncing")
+                    book.invalidate()
+                    book.stats['gaps'] += 1
+                    self._retry_at[symbol] = time.monotonic() + 1
+                self._resyncing.discard(symbol)
+                return
+
+        logger.warning(f"No depth snapshot for {symbol} covers the buffered updates; retrying shortly")
+        with self._lock:
+            self._retry_at[symbol] = time.monotonic() + 1
+            self._resyncing.discard(symbol)
+
+    def features(self, symbol: str, depth: int = 10) -> Optional[Dict]:
+        """Book features for scoring; None if the symbol isn't tracked, synced and recently updated"""
+        book = self.books.get(symbol)
+        if book is None:
+            return None
+        with self._lock:
+            features = book.features(depth)
+        if features is None or features['age'] > self.stale_after:
+            return None
+        return features
+
+    def feature_version(self, symbol: str) -> tuple:
+        """Coarse book state, so a re-score is triggered by a material change only
+
+        Untracked, unsynced and stale books share one constant version: scoring without book
+        features is an unchanged input until the book (re)appears.
+        """
+        features = self.features(symbol)
+        if features is None:
+            return NO_BOOK_VERSION
+        return (round(features['imbalance'], 1), features['bid_wall'], features['ask_wall'],
+                round(features['spread_bps']))
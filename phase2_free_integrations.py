@@ -5,31 +5,169 @@ No monthly fees required!
 """
 
 import requests
+import threading
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import logging
+import re
+import numpy as np
+from market_index import shared_market_index
+from stablecoin_flows import shared_stablecoin_pipeline
 
 logger = logging.getLogger(__name__)
 
+VENUE_OTHER, VENUE_CEX, VENUE_DEX = 0, 1, 2
+
+# Centralized exchanges
+CEX_VENUES = ('binance', 'coinbase', 'kraken', 'okex', 'okx', 'huobi', 'htx', 'bybit', 'kucoin')
+# Decentralized exchanges
+DEX_VENUES = ('uniswap', 'sushiswap', 'pancakeswap', '1inch', 'dydx')
+
+TICKERS_PER_PAGE = 100  # CoinGecko /coins/{id}/tickers page size
+
+# Scored as neutral by _combine_signals; used until the first market-wide refresh lands
+NEUTRAL_MARKET_FLOWS = {
+    'stablecoin_flows': {'fresh_capital_score': 50, 'flow_direction': 'neutral'},
+    'defi_flows': {'tvl_change_percent': 0},
+}
+
+
+class VenueClassifier:
+    """CEX/DEX lookup table: patterns compiled once, each venue name classified once"""
+    
+    def __init__(self, cex_venues=CEX_VENUES, dex_venues=DEX_VENUES):
+        self.cex_pattern = re.compile('|'.join(re.escape(v) for v in cex_venues))
+        self.dex_pattern = re.compile('|'.join(re.escape(v) for v in dex_venues))
+        self.table = {}  # venue name -> VENUE_* class
+    
+    def classify(self, venue: str) -> int:
+        venue_class = self.table.get(venue)
+        if venue_class is None:
+            if self.cex_pattern.search(venue):
+                venue_class = VENUE_CEX
+            elif self.dex_pattern.search(venue):
+                venue_class = VENUE_DEX
+            else:
+                venue_class = VENUE_OTHER
+            self.table[venue] = venue_class
+        return venue_class
+
+
+class TickerPageCache:
+    """CoinGecko ticker pages per coin, each page re-fetched only once it is older than the TTL"""
+    
+    def __init__(self, session: requests.Session, base_url: str, ttl: float = 300, max_pages: int = 2):
+        self.session = session
+        self.base_url = base_url
+        self.ttl = ttl
+        self.max_pages = max_pages
+        self.pages = {}  # coin id -> {page number: (fetched_at, tickers)}
+        self._lock = threading.Lock()
+    
+    def tickers(self, coin_id: str) -> List[Dict]:
+        """Tickers across the cached pages (highest volume first), refreshing stale pages"""
+        with self._lock:
+            coin_pages = self.pages.setdefault(coin_id, {})
+        
+        tickers = []
+        now = time.time()
+        for page in range(1, self.max_pages + 1):
+            entry = coin_pages.get(page)
+            if entry is None or now - entry[0] >= self.ttl:
+                try:
+                    response = self.session.get(f"{self.base_url}/coins/{coin_id}/tickers",
+                                                params={'page': page, 'order': 'volume_desc'}, timeout=10)
+                    response.raise_for_status()
+                    entry = (now, response.json().get('tickers', []))
+                    coin_pages[page] = entry
+                except Exception:
+                    if entry is None:
+                        if page == 1:
+                            raise
+                        break
+                    # Keep serving the old page until the next successful refresh
+            tickers.extend(entry[1])
+            if len(entry[1]) < TICKERS_PER_PAGE:
+                break  # Last page
+        return tickers
+
 class FreePhase2Manager:
     """FREE alternatives to paid Phase 2 features"""
     
-    def __init__(self):
+    def __init__(self, request_timeout: float = 10.0):
         self.defillama_base = "https://api.llama.fi"
         self.coingecko_base = "https://api.coingecko.com/api/v3"
-        self.cache = {}
+        self.cache = {}  # key -> (fetched_at, value)
         self.cache_timeout = 300  # 5 minutes
+        self.request_timeout = request_timeout  # Deadline for one get_predictive_signals call
+        self.stablecoin_pipeline = shared_stablecoin_pipeline()  # persisted DeFiLlama series
+        self.executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='phase2')
+        self.market_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='phase2-market')  # runs the refresh
+        self.flow_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='phase2-flows')  # its two fetches
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self.market_index = shared_market_index()
+        self.venue_classifier = VenueClassifier()
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': 'TradingBot/1.0'})
+        self.ticker_pages = TickerPageCache(self.session, self.coingecko_base, ttl=self.cache_timeout)
+    
+    def _get_cached(self, key: str):
+        """(value, is_fresh) for a cache entry, or (None, False)"""
+        entry = self.cache.get(key)
+        if entry is None:
+            return None, False
+        fetched_at, value = entry
+        return value, time.time() - fetched_at < self.cache_timeout
+    
+    def _set_cached(self, key: str, value):
+        self.cache[key] = (time.time(), value)
+    
+    def get_market_flows(self) -> Dict:
+        """Market-wide stablecoin and DeFi TVL flows, refreshed at most once per cache_timeout
+        
+        Never blocks: a stale value (or neutral flows, before the first refresh has landed)
+        is returned immediately while a single background refresh runs.
+        """
+        flows, fresh = self._get_cached('market_flows')
+        if not fresh:
+            with self._lock:
+                start = not self._refreshing
+                self._refreshing = True
+            if start:
+                self.market_executor.submit(self.refresh_market_flows)
+        return flows if flows is not None else NEUTRAL_MARKET_FLOWS
+    
+    def refresh_market_flows(self) -> Dict:
+        """Fetch both market-wide components concurrently and cache them"""
+        try:
+            stablecoin = self.flow_executor.submit(self.get_stablecoin_flows)
+            defi = self.flow_executor.submit(self.get_defi_tvl_flows)
+            flows = {'stablecoin_flows': stablecoin.result(), 'defi_flows': defi.result()}
+            self._set_cached('market_flows', flows)
+            return flows
+        finally:
+            with self._lock:
+                self._refreshing = False
+    
+    def _get_symbol_patterns(self, symbol: str) -> Dict:
+        key = f"exchange_patterns_{symbol}"
+        patterns, fresh = self._get_cached(key)
+        if fresh:
+            return patterns
+        patterns = self.get_exchange_volume_patterns(symbol)
+        if 'error' not in patterns:
+            self._set_cached(key, patterns)
+        return patterns
         
     def get_stablecoin_flows(self) -> Dict:
         """Track stablecoin flows - FREE alternative to CryptoQuant"""
         try:
-            # Use correct DeFiLlama stablecoin endpoint
-            url = f"{self.defillama_base}/stablecoincharts/all"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            # Latest daily points of the locally persisted DeFiLlama stablecoin supply series
+            change = self.stablecoin_pipeline.latest_change('stablecoin_supply')
             
             flows = {
                 'total_supply_change_24h': 0,
@@ -38,19 +176,12 @@ class FreePhase2Manager:
                 'flow_direction': 'neutral'
             }
             
-            if not data:
+            if not change:
                 # Fallback: Use CoinGecko for stablecoin data
                 return self._get_stablecoin_flows_fallback()
             
-            # Get the latest data point
-            latest_data = data[-1] if data else {}
-            previous_data = data[-2] if len(data) > 1 else latest_data
-            
-            latest_total = latest_data.get('totalCirculatingUSD', 0)
-            previous_total = previous_data.get('totalCirculatingUSD', latest_total)
-            
-            total_change = latest_total - previous_total
-            change_percent = (total_change / previous_total * 100) if previous_total > 0 else 0
+            total_change = change['change']
+            change_percent = change['change_percent']
             
             flows['total_supply_change_24h'] = total_change
             
@@ -92,13 +223,12 @@ class FreePhase2Manager:
             
             total_volume_change = 0
             
-            for coin in stablecoins:
-                url = f"{self.coingecko_base}/coins/{coin}"
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                
-                market_data = data.get('market_data', {})
+            # Fetched concurrently rather than one after another
+            coin_data = self.stablecoin_pipeline.coingecko_market_data(stablecoins)
+            if not coin_data:
+                raise ValueError("No CoinGecko stablecoin data")
+            
+            for coin, market_data in coin_data.items():
                 volume_24h = market_data.get('total_volume', {}).get('usd', 0)
                 volume_change = market_data.get('total_volume_change_24h', 0)
                 
@@ -109,8 +239,6 @@ class FreePhase2Manager:
                 }
                 
                 total_volume_change += volume_change
-                
-                time.sleep(1)  # Rate limiting
             
             # Estimate fresh capital from volume changes
             if total_volume_change > 20:  # > 20% volume increase
@@ -140,28 +268,25 @@ class FreePhase2Manager:
     def get_defi_tvl_flows(self) -> Dict:
         """Monitor DeFi TVL flows - FREE exchange flow alternative"""
         try:
-            # Get historical chain TVL
-            url = f"{self.defillama_base}/v2/historicalChainTvl"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            # Historical chain TVL, kept locally and extended with new daily points
+            series = self.stablecoin_pipeline.get_series('chain_tvl')
             
-            if len(data) < 2:
+            if len(series) < 2:
                 return {'error': 'Insufficient data'}
             
             # Calculate 24h change
-            latest = data[-1]
-            previous = data[-2] if len(data) > 1 else data[-1]
+            latest_date, latest_tvl = series[-1]
+            previous_tvl = series[-2][1]
             
-            tvl_change = latest['tvl'] - previous['tvl']
-            tvl_change_percent = (tvl_change / previous['tvl']) * 100
+            tvl_change = latest_tvl - previous_tvl
+            tvl_change_percent = (tvl_change / previous_tvl) * 100
             
             flows = {
-                'total_tvl': latest['tvl'],
+                'total_tvl': latest_tvl,
                 'tvl_change_24h': tvl_change,
                 'tvl_change_percent': tvl_change_percent,
                 'flow_strength': self._calculate_flow_strength(tvl_change_percent),
-                'timestamp': latest['date']
+                'timestamp': latest_date
             }
             
             return flows
@@ -174,16 +299,11 @@ class FreePhase2Manager:
         """Enhanced volume analysis - FREE CoinGecko approach"""
         try:
             # Get exchange-specific volume data
-            coin_id = symbol.lower().replace('usdt', 'tether').replace('/', '')
-            if symbol.upper().startswith('BTC'):
-                coin_id = 'bitcoin'
-            elif symbol.upper().startswith('ETH'):
-                coin_id = 'ethereum'
+            coin_id = self.market_index.coingecko_id(symbol)
+            if not coin_id:
+                return {'error': f'No CoinGecko id for {symbol}', 'flow_score': 50}
             
-            url = f"{self.coingecko_base}/coins/{coin_id}/tickers"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            tickers = self.ticker_pages.tickers(coin_id)
             
             exchange_flows = {
                 'total_volume_24h': 0,
@@ -193,37 +313,30 @@ class FreePhase2Manager:
                 'flow_score': 50
             }
             
-            total_volume = 0
-            cex_volume = 0
-            dex_volume = 0
-            
-            # Centralized exchanges
-            cex_list = ['binance', 'coinbase', 'kraken', 'okex', 'huobi', 'bybit', 'kucoin']
-            # Decentralized exchanges  
-            dex_list = ['uniswap', 'sushiswap', 'pancakeswap', '1inch', 'dydx']
-            
-            for ticker in data.get('tickers', [])[:50]:  # Top 50 exchanges
-                exchange = ticker.get('market', {}).get('name', '').lower()
-                volume = ticker.get('converted_volume', {}).get('usd', 0)
-                
-                exchange_flows['exchange_distribution'][exchange] = volume
-                total_volume += volume
-                
-                if any(cex in exchange for cex in cex_list):
-                    cex_volume += volume
-                elif any(dex in exchange for dex in dex_list):
-                    dex_volume += volume
-            
+            # Aggregate ticker volumes per venue (a venue lists several pairs)
+            venue_ids = {}
+            venue_index = np.fromiter(
+                (venue_ids.setdefault(ticker.get('market', {}).get('name', '').lower(), len(venue_ids))
+                 for ticker in tickers), dtype=np.int64, count=len(tickers))
+            volumes = np.fromiter(
+                ((ticker.get('converted_volume', {}).get('usd') or 0) for ticker in tickers),
+                dtype=np.float64, count=len(tickers))
+            venue_volumes = np.bincount(venue_index, weights=volumes, minlength=len(venue_ids))
+            venue_classes = np.fromiter((self.venue_classifier.classify(venue) for venue in venue_ids),
+                                        dtype=np.int8, count=len(venue_ids))
+            
+            exchange_flows['exchange_distribution'] = dict(zip(venue_ids, venue_volumes.tolist()))
+            total_volume = float(venue_volumes.sum())
             exchange_flows['total_volume_24h'] = total_volume
             
             if total_volume > 0:
-                exchange_flows['cex_vs_dex_ratio'] = cex_volume / (cex_volume + dex_volume) if (cex_volume + dex_volume) > 0 else 0
+                cex_volume = venue_volumes[venue_classes == VENUE_CEX].sum()
+                dex_volume = venue_volumes[venue_classes == VENUE_DEX].sum()
+                exchange_flows['cex_vs_dex_ratio'] = float(cex_volume / (cex_volume + dex_volume)) if (cex_volume + dex_volume) > 0 else 0
                 
                 # Volume concentration (Herfindahl index)
-                volumes = list(exchange_flows['exchange_distribution'].values())
-                if volumes:
-                    hhi = sum((v/total_volume)**2 for v in volumes if v > 0)
-                    exchange_flows['volume_concentration'] = hhi
+                shares = venue_volumes / total_volume
+                exchange_flows['volume_concentration'] = float(np.dot(shares, shares))
             
             # Calculate flow score based on patterns
             flow_score = 50
@@ -269,12 +382,38 @@ class FreePhase2Manager:
     
     def get_predictive_signals(self, symbol: str) -> Dict:
         """Combine all FREE Phase 2 data for predictive signals"""
+        return self.get_predictive_signals_batch([symbol])[symbol]
+    
+    def get_predictive_signals_batch(self, symbols: List[str], timeout: Optional[float] = None) -> Dict[str, Dict]:
+        """Predictive signals for a watchlist: one market-wide lookup plus concurrent per-symbol fetches
+        
+        Symbols whose exchange data misses the deadline are scored with a neutral flow score.
+        """
+        deadline = time.monotonic() + (self.request_timeout if timeout is None else timeout)
+        try:
+            futures = {symbol: self.executor.submit(self._get_symbol_patterns, symbol) for symbol in symbols}
+            market_flows = self.get_market_flows()
+            wait(futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+        except Exception as e:
+            logger.error(f"Error generating predictive signals: {e}")
+            return {symbol: {'error': str(e), 'overall_score': 50} for symbol in symbols}
+        
+        results = {}
+        for symbol, future in futures.items():
+            if not future.done():
+                future.cancel()
+                exchange_patterns = {'error': 'timeout', 'flow_score': 50}
+            else:
+                try:
+                    exchange_patterns = future.result()
+                except Exception as e:
+                    exchange_patterns = {'error': str(e), 'flow_score': 50}
+            results[symbol] = self._combine_signals(market_flows['stablecoin_flows'],
+                                                    market_flows['defi_flows'], exchange_patterns)
+        return results
+    
+    def _combine_signals(self, stablecoin_flows: Dict, defi_flows: Dict, exchange_patterns: Dict) -> Dict:
         try:
-            # Get all data sources
-            stablecoin_flows = self.get_stablecoin_flows()
-            defi_flows = self.get_defi_tvl_flows()
-            exchange_patterns = self.get_exchange_volume_patterns(symbol)
-            
             # Combine signals
             prediction = {
                 'overall_score': 50,
@@ -0,0 +1,113 @@
+# Mobile Trading App - Append-Only Position Journal
+#
+# Every suggestion, entry, trailing-stop move, milestone and exit is appended
+# to a SQLite write-ahead log. State is rebuilt at startup from the latest
+# compaction snapshot plus the events written after it.
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+# Events written since the last snapshot before the journal asks for compaction
+COMPACT_EVERY = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    position_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshot (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    last_seq INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+def _dumps(data) -> str:
+    return json.dumps(data, separators=(',', ':'))
+
+class PositionJournal:
+    """Durable event log for PositionManager state"""
+
+    def __init__(self, path: str = 'positions.db', compact_every: int = COMPACT_EVERY):
+        self.path = path
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+
+        # Price updates may arrive from a worker thread; all access goes through the lock
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')  # Durable across app kills; fsync on checkpoint
+        self.conn.executescript(_SCHEMA)
+
+        self.events_since_snapshot = self.conn.execute(
+            'SELECT COUNT(*) FROM events WHERE seq > COALESCE((SELECT last_seq FROM snapshot), 0)'
+        ).fetchone()[0]
+
+    def append(self, kind: str, position_id: Optional[str], data: Dict) -> int:
+        """Append one event; returns its sequence number"""
+        with self._lock:
+            cursor = self.conn.execute(
+                'INSERT INTO events (ts, kind, position_id, data) VALUES (?, ?, ?, ?)',
+                (time.time(), kind, position_id, _dumps(data))
+            )
+            self.events_since_snapshot += 1
+            return cursor.lastrowid
+
+    def needs_compaction(self) -> bool:
+        return self.events_since_snapshot >= self.compact_every
+
+    def load(self) -> Tuple[Optional[Dict], Iterator[Tuple[str, Optional[str], Dict]]]:
+        """Latest snapshot state (or None) and the events recorded after it, oldest first"""
+        with self._lock:
+            row = self.conn.execute('SELECT last_seq, data FROM snapshot WHERE id = 1').fetchone()
+            last_seq, state = (row[0], json.loads(row[1])) if row else (0, None)
+            rows = self.conn.execute(
+                'SELECT kind, position_id, data FROM events WHERE seq > ? ORDER BY seq', (last_seq,)
+            ).fetchall()
+
+        events = ((kind, position_id, json.loads(data)) for kind, position_id, data in rows)
+        return state, events
+
+    def compact(self, state: Dict):
+        """Replace the snapshot with the given state and drop the events it covers"""
+        with self._lock:
+            last_seq = self.conn.execute('SELECT COALESCE(MAX(seq), 0) FROM events').fetchone()[0]
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO snapshot (id, last_seq, ts, data) VALUES (1, ?, ?, ?)',
+                    (last_seq, time.time(), _dumps(state))
+                )
+                self.conn.execute('DELETE FROM events WHERE seq <= ?', (last_seq,))
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+            self.events_since_snapshot = 0
+            self.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    def get_setting(self, key: str, default=None):
+        with self._lock:
+            row = self.conn.execute('SELECT value FROM settings WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_setting(self, key: str, value):
+        with self._lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)', (key, _dumps(value))
+            )
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -1,11 +1,18 @@
 # Mobile Trading App - Buy/Sell Recommendation & Monitoring System
 
+from collections import deque
 from datetime import datetime, timedelta
 import json
 import time
 from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from enum import Enum
+import uuid
+import numpy as np
+from trigger_index import TriggerIndex, BELOW, ABOVE
+from position_journal import PositionJournal
+from expiry_queue import ExpiryQueue
+from mobile_trading_pairs import TIER_1_PAIRS, TIER_2_PAIRS, TIER_3_PAIRS, TIER_4_PAIRS
 
 class PositionStatus(Enum):
     SUGGESTED = "suggested"
@@ -13,10 +20,39 @@ class PositionStatus(Enum):
     ENTERED = "entered"
     PROFIT_TARGET = "profit_target"
     STOP_LOSS = "stop_loss"
+    TRAILING_STOP = "trailing_stop"
+    TIME_LIMIT = "time_limit"
     MANUAL_EXIT = "manual_exit"
     EXPIRED = "expired"
 
-@dataclass
+# Exit reason -> final position status
+EXIT_STATUS = {
+    'take_profit': PositionStatus.PROFIT_TARGET,
+    'stop_loss': PositionStatus.STOP_LOSS,
+    'trailing_stop': PositionStatus.TRAILING_STOP,
+    'time_limit': PositionStatus.TIME_LIMIT,
+    'manual_exit': PositionStatus.MANUAL_EXIT,
+    'expired': PositionStatus.EXPIRED,
+}
+
+# Which exit wins when one price crosses several levels of a position
+EXIT_PRIORITY = {'stop_loss': 0, 'take_profit': 1, 'trailing_stop': 2}
+
+# Monitoring rules shared by the single-symbol and bulk update paths
+TRAILING_STOP_PCT = 0.03            # Trail 3% below the current price (BUY positions)
+MAX_HOLD_TIME = timedelta(hours=24)  # Close positions after 24 hours (pairs outside the tiers)
+SUGGESTION_TTL = timedelta(minutes=30)  # Expire untaken suggestions (pairs outside the tiers)
+MILESTONES = [5, 10, 15, 20, 25, 30]  # P&L % alert levels
+SUMMARY_WINDOW = timedelta(days=30)   # Realized P&L / win rate window
+EQUITY_CURVE_POINTS = 2000            # Equity samples kept for charting
+
+PAIR_TIERS = {}
+for _tier, _pairs in (('tier_1', TIER_1_PAIRS), ('tier_2', TIER_2_PAIRS),
+                      ('tier_3', TIER_3_PAIRS), ('tier_4', TIER_4_PAIRS)):
+    for _symbol in _pairs:
+        PAIR_TIERS.setdefault(_symbol, _tier)
+
+@dataclass(slots=True)
 class TradingPosition:
     """Represents a trading position suggestion or active trade"""
     symbol: str
@@ -35,10 +71,13 @@ class TradingPosition:
     risk_reward_ratio: float = 0.0
     trailing_stop: Optional[float] = None
     alerts_sent: List[str] = None
+    position_id: Optional[str] = None
     
     def __post_init__(self):
         if self.alerts_sent is None:
             self.alerts_sent = []
+        if self.position_id is None:
+            self.position_id = uuid.uuid4().hex[:12]
         self.calculate_metrics()
     
     def calculate_metrics(self):
@@ -59,26 +98,209 @@ class TradingPosition:
             reward = abs(self.entry_price - self.take_profit)
         
         self.risk_reward_ratio = reward / risk if risk > 0 else 0
+    
+    def to_record(self) -> Dict:
+        """Plain JSON-safe dict for the position journal"""
+        record = asdict(self)
+        record['status'] = self.status.value
+        record['entry_time'] = self.entry_time.timestamp()
+        record['exit_time'] = self.exit_time.timestamp() if self.exit_time else None
+        return record
+    
+    @classmethod
+    def from_record(cls, record: Dict) -> 'TradingPosition':
+        """Rebuild a position from a journal record"""
+        record = dict(record)
+        record['status'] = PositionStatus(record['status'])
+        record['entry_time'] = datetime.fromtimestamp(record['entry_time'])
+        if record.get('exit_time') is not None:
+            record['exit_time'] = datetime.fromtimestamp(record['exit_time'])
+        return cls(**record)
+
+class PositionArrays:
+    """Active positions laid out as parallel NumPy arrays for bulk price updates"""
+    
+    def __init__(self, positions: List[TradingPosition]):
+        self.positions = positions
+        self.symbols = [p.symbol for p in positions]
+        self.entry = np.array([p.entry_price for p in positions], dtype=float)
+        self.stop = np.array([p.stop_loss for p in positions], dtype=float)
+        self.target = np.array([p.take_profit for p in positions], dtype=float)
+        self.trailing = np.array([p.trailing_stop if p.trailing_stop else np.nan for p in positions], dtype=float)
+        self.size = np.array([p.position_size for p in positions], dtype=float)
+        self.side = np.array([1.0 if p.signal_type == "BUY" else -1.0 for p in positions])
+        # Milestones are always alerted lowest-first, so the sent ones form a prefix
+        self.milestones_sent = np.array(
+            [sum(1 for m in MILESTONES if f"milestone_{m}" in p.alerts_sent) for p in positions],
+            dtype=np.int64
+        )
+    
+    def __len__(self):
+        return len(self.positions)
+
+class PortfolioStats:
+    """Running portfolio aggregates, updated per price tick and exit so summaries are O(1)"""
+    
+    def __init__(self):
+        # Open positions
+        self.open_pnl = {}          # position_id -> last unrealized P&L
+        self.total_value = 0.0
+        self.unrealized_pnl = 0.0
+        self.winning = 0
+        self.losing = 0
+        
+        # Closed positions: all-time totals and a time-ordered 30-day window
+        self.realized_pnl = 0.0
+        self.wins = 0
+        self.losses = 0
+        self.window = deque()       # (exit timestamp, P&L), oldest first
+        self.window_pnl = 0.0
+        self.window_wins = 0
+        
+        # Equity = realized + unrealized; drawdown is tracked on every change
+        self.equity_curve = deque(maxlen=EQUITY_CURVE_POINTS)  # (timestamp, equity) at each exit
+        self.peak_equity = 0.0
+        self.max_drawdown = 0.0
+    
+    @staticmethod
+    def _sign(pnl: float) -> int:
+        return (pnl > 0) - (pnl < 0)
+    
+    def _count(self, pnl: float, step: int):
+        sign = self._sign(pnl)
+        if sign > 0:
+            self.winning += step
+        elif sign < 0:
+            self.losing += step
+    
+    def open(self, position: TradingPosition):
+        self.open_pnl[position.position_id] = position.profit_loss
+        self.total_value += position.position_size
+        self.unrealized_pnl += position.profit_loss
+        self._count(position.profit_loss, 1)
+        self._track_equity()
+    
+    def mark(self, position: TradingPosition):
+        """Apply a position's new unrealized P&L"""
+        old_pnl = self.open_pnl.get(position.position_id)
+        if old_pnl is None:
+            return
+        new_pnl = position.profit_loss
+        self.open_pnl[position.position_id] = new_pnl
+        self.unrealized_pnl += new_pnl - old_pnl
+        if self._sign(new_pnl) != self._sign(old_pnl):
+            self._count(old_pnl, -1)
+            self._count(new_pnl, 1)
+        self._track_equity()
+    
+    def close(self, position: TradingPosition):
+        """Move a position from unrealized to realized"""
+        old_pnl = self.open_pnl.pop(position.position_id, None)
+        if old_pnl is not None:
+            self.total_value -= position.position_size
+            self.unrealized_pnl -= old_pnl
+            self._count(old_pnl, -1)
+            if not self.open_pnl:
+                # Nothing open: clear accumulated float drift
+                self.total_value = self.unrealized_pnl = 0.0
+        self.record_exit(position)
+    
+    def record_exit(self, position: TradingPosition):
+        pnl = position.profit_loss
+        exit_ts = (position.exit_time or datetime.now()).timestamp()
+        self.realized_pnl += pnl
+        if pnl > 0:
+            self.wins += 1
+        else:
+            self.losses += 1
+        
+        self.window.append((exit_ts, pnl))
+        self.window_pnl += pnl
+        self.window_wins += pnl > 0
+        
+        equity = self._track_equity()
+        self.equity_curve.append((exit_ts, equity))
+    
+    def drawdown_state(self) -> Dict:
+        """Peak/drawdown for the journal; unrealized troughs can't be rebuilt from exits alone"""
+        return {'peak_equity': self.peak_equity, 'max_drawdown': self.max_drawdown}
+    
+    def restore_drawdown(self, state: Dict):
+        """Merge a journaled peak/drawdown into the values rebuilt from realized exits"""
+        self.peak_equity = max(self.peak_equity, state.get('peak_equity', 0.0))
+        self.max_drawdown = max(self.max_drawdown, state.get('max_drawdown', 0.0))
+    
+    def _track_equity(self) -> float:
+        equity = self.realized_pnl + self.unrealized_pnl
+        if equity > self.peak_equity:
+            self.peak_equity = equity
+        elif self.peak_equity - equity > self.max_drawdown:
+            self.max_drawdown = self.peak_equity - equity
+        return equity
+    
+    def expire_window(self, now: Optional[float] = None):
+        """Drop exits older than the summary window (amortized O(1))"""
+        cutoff = (now or time.time()) - SUMMARY_WINDOW.total_seconds()
+        window = self.window
+        while window and window[0][0] < cutoff:
+            _, pnl = window.popleft()
+            self.window_pnl -= pnl
+            self.window_wins -= pnl > 0
+        if not window:
+            self.window_pnl = 0.0
 
 class PositionManager:
     """Manages trading position suggestions and monitoring"""
     
-    def __init__(self):
-        self.active_positions = {}  # symbol -> TradingPosition
+    def __init__(self, journal: Optional[PositionJournal] = None):
+        self.journal = journal  # Durable event log; None keeps state in memory only
+        self.active_positions = {}  # position_id -> TradingPosition
+        self.positions_by_symbol = {}  # symbol -> {position_id: TradingPosition}
         self.suggested_positions = {}  # symbol -> TradingPosition
         self.position_history = []
+        self.trigger_index = TriggerIndex()  # stop/target/trailing/alert ladders per symbol
+        self.expiry_queue = ExpiryQueue()  # time-limit exits and suggestion expiry deadlines
+        self.last_prices = {}  # symbol -> last price seen
+        self.unplaced_alerts = {}  # symbol -> {alert_id: (level, message)} awaiting a first price
         self.user_preferences = self.load_user_preferences()
+        self.listeners = []  # callbacks(event, position) for UI refresh
+        self._arrays = None  # PositionArrays over active positions, rebuilt when the set changes
+        self.stats = PortfolioStats()
         
+        if self.journal:
+            self.restore_from_journal()
+    
+    def add_listener(self, callback: Callable[[str, TradingPosition], None]):
+        """Subscribe to position changes ('suggested', 'entered', 'updated', 'exited', 'expired')"""
+        if callback not in self.listeners:
+            self.listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[str, TradingPosition], None]):
+        """Unsubscribe from position changes"""
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+    
+    def _notify(self, event: str, position: TradingPosition):
+        """Tell listeners a position changed"""
+        for callback in list(self.listeners):
+            try:
+                callback(event, position)
+            except Exception as e:
+                print(f"⚠️ Position listener error: {e}")
+    
     def load_user_preferences(self) -> Dict:
-        """Load user trading preferences"""
-        # In real app, this would load from user settings
-        return {
+        """Load user trading preferences (saved settings over the defaults)"""
+        preferences = {
             'risk_tolerance': 'medium',    # low, medium, high
             'max_positions': 5,            # Maximum concurrent positions
             'default_position_size': 100,  # Default dollar amount
             'auto_stop_loss': True,        # Automatically set stop losses
             'trailing_stops': True,        # Use trailing stops
             'profit_target_method': 'risk_reward',  # risk_reward, percentage, technical
+            # Expiry windows by pair tier, scaled by the first confidence band reached
+            'max_hold_hours': {'tier_1': 24, 'tier_2': 24, 'tier_3': 12, 'tier_4': 8},
+            'suggestion_minutes': {'tier_1': 30, 'tier_2': 20, 'tier_3': 15, 'tier_4': 10},
+            'confidence_expiry_scale': [[85, 1.5], [70, 1.0], [0, 0.5]],
             'notification_preferences': {
                 'entry_signals': True,
                 'exit_alerts': True,
@@ -87,6 +309,92 @@ class PositionManager:
                 'daily_summary': True
             }
         }
+        
+        if self.journal:
+            preferences.update(self.journal.get_setting('user_preferences', {}))
+        return preferences
+    
+    def save_user_preferences(self, **changes):
+        """Update user preferences and persist them with the journal"""
+        self.user_preferences.update(changes)
+        if self.journal:
+            self.journal.set_setting('user_preferences', self.user_preferences)
+    
+    def _journal(self, kind: str, position: TradingPosition, data: Optional[Dict] = None):
+        """Append a state change to the journal (called after the change is applied)"""
+        if not self.journal:
+            return
+        try:
+            self.journal.append(kind, position.position_id, data or {})
+            if self.journal.needs_compaction():
+                self.compact_journal()
+        except Exception as e:
+            print(f"⚠️ Position journal error: {e}")
+    
+    def compact_journal(self):
+        """Snapshot the current state so replay starts from here"""
+        if self.journal:
+            self.journal.compact({
+                'suggested': [p.to_record() for p in self.suggested_positions.values()],
+                'active': [p.to_record() for p in self.active_positions.values()],
+                'history': [p.to_record() for p in self.position_history],
+                'drawdown': self.stats.drawdown_state(),
+            })
+    
+    def restore_from_journal(self):
+        """Rebuild suggestions, open positions and history from snapshot + events"""
+        state, events = self.journal.load()
+        state = state or {}
+        suggested = {}
+        active = {}
+        history = [TradingPosition.from_record(r) for r in state.get('history', [])]
+        drawdown = state.get('drawdown', {})
+        for record in state.get('suggested', []):
+            position = TradingPosition.from_record(record)
+            suggested[position.symbol] = position
+        for record in state.get('active', []):
+            position = TradingPosition.from_record(record)
+            active[position.position_id] = position
+        
+        for kind, position_id, data in events:
+            if kind == 'suggested':
+                position = TradingPosition.from_record(data)
+                suggested[position.symbol] = position
+            elif kind == 'entered':
+                position = suggested.pop(data['symbol'], None)
+                if position and position.position_id == position_id:
+                    position.status = PositionStatus.ENTERED
+                    active[position_id] = position
+            elif kind == 'trailing' and position_id in active:
+                active[position_id].trailing_stop = data['trailing_stop']
+            elif kind == 'milestone' and position_id in active:
+                active[position_id].alerts_sent.append(data['alert'])
+            elif kind == 'expired':
+                position = suggested.get(data['symbol'])
+                if position and position.position_id == position_id:
+                    del suggested[data['symbol']]
+            elif kind == 'exited' and position_id in active:
+                position = active.pop(position_id)
+                position.current_price = data['price']
+                position.calculate_metrics()
+                position.status = PositionStatus(data['status'])
+                position.exit_time = datetime.fromtimestamp(data['exit_time'])
+                history.append(position)
+                drawdown = data.get('drawdown', drawdown)
+        
+        self.suggested_positions = suggested
+        self.position_history = history
+        self.stats = PortfolioStats()
+        for position in sorted(history, key=lambda p: p.exit_time or p.entry_time):
+            self.stats.record_exit(position)
+        self.expiry_queue = ExpiryQueue()
+        for position in suggested.values():
+            self._schedule_suggestion_expiry(position)
+        for position in active.values():
+            self._add_active(position)
+        # Troughs while positions were open are only known up to the last snapshot/exit; merged
+        # last, since reopened positions restart their unrealized P&L from the entry price
+        self.stats.restore_drawdown(drawdown)
     
     def suggest_position(self, symbol: str, signal_data: Dict) -> TradingPosition:
         """Create a position suggestion based on signal"""
@@ -115,8 +423,14 @@ class PositionManager:
             entry_time=datetime.now()
         )
         
-        # Store suggestion
+        # Store suggestion (replacing any earlier one for the symbol)
+        previous = self.suggested_positions.get(symbol)
+        if previous:
+            self.expiry_queue.cancel(previous.position_id)
         self.suggested_positions[symbol] = position
+        self._schedule_suggestion_expiry(position)
+        self._journal('suggested', position, position.to_record())
+        self._notify('suggested', position)
         
         return position
     
@@ -181,25 +495,161 @@ class PositionManager:
         position.status = PositionStatus.ENTERED
         
         # Move to active positions
-        self.active_positions[symbol] = position
+        self.expiry_queue.cancel(position.position_id, 'suggestion')
+        self._add_active(position)
         del self.suggested_positions[symbol]
+        self._journal('entered', position, {'symbol': symbol})
         
         # Send entry confirmation
         self._send_alert(f"✅ Entered {symbol} {position.signal_type} at ${position.entry_price:.4f}")
+        self._notify('entered', position)
         
         return True
     
-    def update_position(self, symbol: str, current_price: float) -> Dict:
-        """Update position with current market price and check exit conditions"""
+    def _add_active(self, position: TradingPosition):
+        """Index an entered position by id and symbol and register its price triggers"""
+        self.active_positions[position.position_id] = position
+        self.positions_by_symbol.setdefault(position.symbol, {})[position.position_id] = position
+        self.stats.open(position)
+        self._arrays = None
+        
+        # BUY exits below entry on stops and above on targets; SELL is the mirror image
+        stop_side, target_side = (BELOW, ABOVE) if position.signal_type == "BUY" else (ABOVE, BELOW)
+        self.trigger_index.set_trigger(position.symbol, position.position_id, 'stop_loss', position.stop_loss, stop_side)
+        self.trigger_index.set_trigger(position.symbol, position.position_id, 'take_profit', position.take_profit, target_side)
+        if position.trailing_stop:
+            self.trigger_index.set_trigger(position.symbol, position.position_id, 'trailing_stop', position.trailing_stop, stop_side)
+        
+        hold_time = self.expiry_window(position, 'max_hold_hours', MAX_HOLD_TIME)
+        self.expiry_queue.schedule(position.position_id, 'time_limit', (position.entry_time + hold_time).timestamp())
+    
+    def _remove_active(self, position: TradingPosition):
+        """Drop a position from the active book and the trigger index"""
+        self.active_positions.pop(position.position_id, None)
+        symbol_positions = self.positions_by_symbol.get(position.symbol, {})
+        symbol_positions.pop(position.position_id, None)
+        if not symbol_positions:
+            self.positions_by_symbol.pop(position.symbol, None)
+        self.trigger_index.remove_owner(position.position_id)
+        self.expiry_queue.cancel(position.position_id)
+        self._arrays = None
+    
+    def expiry_window(self, position: TradingPosition, setting: str, default: timedelta) -> timedelta:
+        """Hold or suggestion window for a position from its pair tier and confidence"""
+        tier = PAIR_TIERS.get(position.symbol)
+        base = self.user_preferences[setting].get(tier)
+        if base is None:
+            return default
+        window = timedelta(hours=base) if setting == 'max_hold_hours' else timedelta(minutes=base)
+        
+        for min_confidence, scale in self.user_preferences['confidence_expiry_scale']:
+            if position.confidence >= min_confidence:
+                return window * scale
+        return window
+    
+    def _schedule_suggestion_expiry(self, position: TradingPosition):
+        ttl = self.expiry_window(position, 'suggestion_minutes', SUGGESTION_TTL)
+        self.expiry_queue.schedule(position.position_id, 'suggestion', (position.entry_time + ttl).timestamp())
+    
+    def next_expiry(self) -> Optional[float]:
+        """Timestamp of the next time-limit exit or suggestion expiry"""
+        return self.expiry_queue.next_deadline()
+    
+    def expire_due(self, now: Optional[float] = None) -> List[str]:
+        """Fire every deadline that has passed (each exactly once); returns alerts"""
+        alerts = []
+        suggestions_by_id = None
+        
+        for owner_id, kind in self.expiry_queue.pop_due(now or time.time()):
+            if kind == 'time_limit':
+                position = self.active_positions.get(owner_id)
+                if position:
+                    alerts.extend(self._handle_position_exit(position, 'time_limit'))
+            elif kind == 'suggestion':
+                if suggestions_by_id is None:
+                    suggestions_by_id = {p.position_id: p for p in self.suggested_positions.values()}
+                position = suggestions_by_id.get(owner_id)
+                if position:
+                    position.status = PositionStatus.EXPIRED
+                    del self.suggested_positions[position.symbol]
+                    self._journal('expired', position, {'symbol': position.symbol})
+                    self._notify('expired', position)
+        
+        return alerts
+    
+    def has_active_position(self, symbol: str) -> bool:
+        """Whether any position is open for a symbol"""
+        return bool(self.positions_by_symbol.get(symbol))
+    
+    def get_positions_for_symbol(self, symbol: str) -> List[TradingPosition]:
+        """Active positions for a symbol (several are allowed)"""
+        return list(self.positions_by_symbol.get(symbol, {}).values())
+    
+    def add_price_alert(self, symbol: str, level: float, direction: Optional[str] = None,
+                        message: str = '') -> str:
+        """Register a one-shot user alert at a price level; returns the alert id
+        
+        Without a direction the alert fires when the price reaches the level from where it
+        is now; before any price is seen for the symbol, that side is chosen on the first tick.
+        """
+        alert_id = f"alert_{uuid.uuid4().hex[:12]}"
+        if direction is None:
+            last_price = self.last_prices.get(symbol)
+            if last_price is None:
+                self.unplaced_alerts.setdefault(symbol, {})[alert_id] = (level, message)
+                return alert_id
+            direction = ABOVE if level >= last_price else BELOW
+        self._place_price_alert(symbol, alert_id, level, direction, message)
+        return alert_id
+    
+    def _place_price_alert(self, symbol: str, alert_id: str, level: float, direction: str, message: str):
+        message = message or f"🔔 {symbol} {'above' if direction == ABOVE else 'below'} ${level:.4f}"
+        self.trigger_index.set_trigger(symbol, alert_id, 'price_alert', level, direction, message)
+    
+    def remove_price_alert(self, alert_id: str):
+        """Cancel a user price alert"""
+        self.trigger_index.remove_owner(alert_id)
+        for symbol, alerts in list(self.unplaced_alerts.items()):
+            if alerts.pop(alert_id, None) is not None and not alerts:
+                del self.unplaced_alerts[symbol]
+    
+    def _process_price(self, symbol: str, price: float) -> tuple:
+        """Fire crossed triggers for a symbol; returns (alerts, exit reasons by position id)"""
+        self.last_prices[symbol] = price
         alerts = []
+        exits = {}
+        
+        # Alerts set before the symbol had a price take their side from this first one
+        for alert_id, (level, message) in self.unplaced_alerts.pop(symbol, {}).items():
+            self._place_price_alert(symbol, alert_id, level, ABOVE if level > price else BELOW, message)
+        
+        for trigger in self.trigger_index.crossed(symbol, price):
+            if trigger.kind == 'price_alert':
+                alerts.append(trigger.message)
+                self._send_alert(trigger.message)
+                continue
+            if trigger.owner_id not in self.active_positions:
+                continue
+            # A gap can cross several levels at once; stop loss wins, then target, then trailing
+            current = exits.get(trigger.owner_id)
+            if current is None or EXIT_PRIORITY[trigger.kind] < EXIT_PRIORITY[current]:
+                exits[trigger.owner_id] = trigger.kind
+        
+        return alerts, exits
+    
+    def update_position(self, symbol: str, current_price: float) -> Dict:
+        """Update a symbol's positions with the current market price and check exit conditions"""
+        alerts = self.expire_due()
+        price_alerts, exits = self._process_price(symbol, current_price)
+        alerts.extend(price_alerts)
         
-        if symbol in self.active_positions:
-            position = self.active_positions[symbol]
+        for position in self.get_positions_for_symbol(symbol):
             position.current_price = current_price
             position.calculate_metrics()
+            self.stats.mark(position)
             
-            # Check exit conditions
-            exit_reason = self._check_exit_conditions(position)
+            # Price exits come from the trigger index; time exits from the expiry queue
+            exit_reason = exits.get(position.position_id)
             
             if exit_reason:
                 alerts.extend(self._handle_position_exit(position, exit_reason))
@@ -210,10 +660,111 @@ class PositionManager:
                 
                 # Check for profit/loss milestones
                 alerts.extend(self._check_milestones(position))
+                self._arrays = None  # Trailing stop / milestones may have moved
+                self._notify('updated', position)
         
+        remaining = self.get_positions_for_symbol(symbol)
         return {
             'alerts': alerts,
-            'position': self.active_positions.get(symbol),
+            'position': remaining[0] if remaining else None,
+            'positions': remaining,
+            'status': 'updated'
+        }
+    
+    def update_all(self, prices: Dict[str, float]) -> Dict:
+        """Update every active position from a symbol -> price map in one vectorized pass"""
+        alerts = self.expire_due()
+        exited = []
+        
+        # User price alerts (and any position levels) crossed by this tick, via the ladders
+        trigger_exits = {}
+        for symbol, symbol_price in prices.items():
+            symbol_alerts, symbol_exits = self._process_price(symbol, symbol_price)
+            alerts.extend(symbol_alerts)
+            trigger_exits.update(symbol_exits)
+        
+        if not self.active_positions:
+            return {'alerts': alerts, 'exited': exited, 'updated': 0, 'status': 'updated'}
+        
+        if self._arrays is None:
+            self._arrays = PositionArrays(list(self.active_positions.values()))
+        book = self._arrays
+        
+        price = np.array([prices.get(symbol, np.nan) for symbol in book.symbols], dtype=float)
+        has_price = ~np.isnan(price)
+        
+        # P&L for all positions (side is +1 for BUY, -1 for SELL)
+        move = (price - book.entry) * book.side
+        profit_loss = move * book.size
+        profit_pct = move / book.entry * 100
+        
+        # Exit triggers, in the same priority order as _check_exit_conditions
+        with np.errstate(invalid='ignore'):
+            stop_hit = has_price & ((price - book.stop) * book.side <= 0)
+            target_hit = has_price & ((price - book.target) * book.side >= 0)
+            trailing_hit = has_price & ((price - book.trailing) * book.side <= 0)
+        
+        reasons = np.select(
+            [stop_hit, target_hit, trailing_hit],
+            ['stop_loss', 'take_profit', 'trailing_stop'],
+            default=''
+        ).astype(object)
+        if trigger_exits:
+            for i, position in enumerate(book.positions):
+                if not reasons[i] and position.position_id in trigger_exits:
+                    reasons[i] = trigger_exits[position.position_id]
+        exiting = reasons != ''
+        staying = has_price & ~exiting
+        
+        # Trailing stops only ratchet upward on BUY positions
+        ratchet = np.zeros(len(book), dtype=bool)
+        if self.user_preferences['trailing_stops']:
+            new_trailing = price * (1 - TRAILING_STOP_PCT)
+            with np.errstate(invalid='ignore'):
+                ratchet = staying & (book.side > 0) & (np.isnan(book.trailing) | (new_trailing > book.trailing))
+            book.trailing = np.where(ratchet, new_trailing, book.trailing)
+        
+        # Milestones newly reached since the last alert
+        reached = np.searchsorted(MILESTONES, np.abs(profit_pct), side='right')
+        new_milestones = staying & (reached > book.milestones_sent)
+        
+        # Write results back to the position objects
+        for i in np.flatnonzero(has_price | exiting).tolist():
+            position = book.positions[i]
+            if has_price[i]:
+                position.current_price = float(price[i])
+                position.profit_loss = float(profit_loss[i])
+                position.profit_pct = float(profit_pct[i])
+                self.stats.mark(position)
+            
+            if exiting[i]:
+                alerts.extend(self._handle_position_exit(position, str(reasons[i])))
+                exited.append(position)
+                continue
+            
+            if ratchet[i]:
+                position.trailing_stop = float(book.trailing[i])
+                self.trigger_index.set_trigger(position.symbol, position.position_id, 'trailing_stop',
+                                               position.trailing_stop, BELOW)
+                self._journal('trailing', position, {'trailing_stop': position.trailing_stop})
+                alerts.append(f"📊 {position.symbol} trailing stop updated: ${position.trailing_stop:.4f}")
+            
+            if new_milestones[i]:
+                for milestone in MILESTONES[book.milestones_sent[i]:reached[i]]:
+                    if profit_pct[i] >= 0:
+                        alerts.append(f"🚀 {position.symbol} up {milestone}%! Current: +{profit_pct[i]:.1f}%")
+                    else:
+                        alerts.append(f"⚠️ {position.symbol} down {milestone}%. Current: {profit_pct[i]:.1f}%")
+                    position.alerts_sent.append(f"milestone_{milestone}")
+                    self._journal('milestone', position, {'alert': f"milestone_{milestone}"})
+                book.milestones_sent[i] = reached[i]
+            
+            self._notify('updated', position)
+        
+        return {
+            'alerts': alerts,
+            'exited': exited,
+            'updated': int(np.count_nonzero(staying)),
             'status': 'updated'
         }
     
@@ -242,11 +793,7 @@ class PositionManager:
             if position.trailing_stop and current_price >= position.trailing_stop:
                 return "trailing_stop"
         
-        # Time-based exit (optional)
-        time_elapsed = datetime.now() - position.entry_time
-        if time_elapsed > timedelta(hours=24):  # Close after 24 hours
-            return "time_limit"
-        
+        # Time limits are enforced by the expiry queue
         return None
     
     def _handle_position_exit(self, position: TradingPosition, exit_reason: str) -> List[str]:
@@ -254,7 +801,7 @@ class PositionManager:
         alerts = []
         
         position.exit_time = datetime.now()
-        position.status = PositionStatus(exit_reason)
+        position.status = EXIT_STATUS.get(exit_reason, PositionStatus.MANUAL_EXIT)
         
         # Calculate final P&L
         final_pnl = position.profit_loss
@@ -276,7 +823,15 @@ class PositionManager:
         
         # Move to history
         self.position_history.append(position)
-        del self.active_positions[position.symbol]
+        self.stats.close(position)
+        self._remove_active(position)
+        self._journal('exited', position, {
+            'price': position.current_price,
+            'status': position.status.value,
+            'exit_time': position.exit_time.timestamp(),
+            'drawdown': self.stats.drawdown_state()
+        })
+        self._notify('exited', position)
         
         return alerts
     
@@ -287,13 +842,16 @@ class PositionManager:
         
         if position.signal_type == "BUY":
             # Calculate new trailing stop (e.g., 3% below current high)
-            trailing_distance = current_price * 0.03
+            trailing_distance = current_price * TRAILING_STOP_PCT
             new_trailing_stop = current_price - trailing_distance
             
             # Only update if new stop is higher than current
             if not position.trailing_stop or new_trailing_stop > position.trailing_stop:
                 old_stop = position.trailing_stop or position.stop_loss
                 position.trailing_stop = new_trailing_stop
+                self.trigger_index.set_trigger(position.symbol, position.position_id, 'trailing_stop',
+                                               new_trailing_stop, BELOW)
+                self._journal('trailing', position, {'trailing_stop': new_trailing_stop})
                 
                 alerts.append(f"📊 {position.symbol} trailing stop updated: ${new_trailing_stop:.4f}")
         
@@ -305,17 +863,17 @@ class PositionManager:
         profit_pct = position.profit_pct
         
         # Check for milestone alerts (5%, 10%, 15%, etc.)
-        milestones = [5, 10, 15, 20, 25, 30]
-        
-        for milestone in milestones:
+        for milestone in MILESTONES:
             alert_key = f"milestone_{milestone}"
             if alert_key not in position.alerts_sent:
                 if profit_pct >= milestone:
                     alerts.append(f"🚀 {position.symbol} up {milestone}%! Current: +{profit_pct:.1f}%")
                     position.alerts_sent.append(alert_key)
+                    self._journal('milestone', position, {'alert': alert_key})
                 elif profit_pct <= -milestone:
                     alerts.append(f"⚠️ {position.symbol} down {milestone}%. Current: {profit_pct:.1f}%")
                     position.alerts_sent.append(alert_key)
+                    self._journal('milestone', position, {'alert': alert_key})
         
         return alerts
     
@@ -325,45 +883,35 @@ class PositionManager:
         # In real app: send push notification, play sound, etc.
     
     def get_portfolio_summary(self) -> Dict:
-        """Get portfolio summary"""
-        total_value = 0
-        total_pnl = 0
-        winning_positions = 0
-        losing_positions = 0
-        
-        # Active positions
-        for position in self.active_positions.values():
-            total_value += position.position_size
-            total_pnl += position.profit_loss
-            if position.profit_loss > 0:
-                winning_positions += 1
-            elif position.profit_loss < 0:
-                losing_positions += 1
-        
-        # Historical positions (last 30 days)
-        recent_history = [
-            p for p in self.position_history 
-            if p.exit_time and (datetime.now() - p.exit_time).days <= 30
-        ]
-        
-        historical_pnl = sum(p.profit_loss for p in recent_history)
+        """Get portfolio summary from the running aggregates"""
+        stats = self.stats
+        stats.expire_window()
+        
         win_rate = 0
-        if recent_history:
-            wins = sum(1 for p in recent_history if p.profit_loss > 0)
-            win_rate = (wins / len(recent_history)) * 100
+        if stats.window:
+            win_rate = (stats.window_wins / len(stats.window)) * 100
         
         return {
             'active_positions': len(self.active_positions),
             'suggested_positions': len(self.suggested_positions),
-            'total_portfolio_value': total_value,
-            'unrealized_pnl': total_pnl,
-            'realized_pnl_30d': historical_pnl,
-            'total_pnl_30d': total_pnl + historical_pnl,
+            'total_portfolio_value': stats.total_value,
+            'unrealized_pnl': stats.unrealized_pnl,
+            'realized_pnl_30d': stats.window_pnl,
+            'total_pnl_30d': stats.unrealized_pnl + stats.window_pnl,
             'win_rate_30d': win_rate,
-            'winning_positions': winning_positions,
-            'losing_positions': losing_positions
+            'winning_positions': stats.winning,
+            'losing_positions': stats.losing,
+            'realized_pnl': stats.realized_pnl,
+            'total_wins': stats.wins,
+            'total_losses': stats.losses,
+            'equity': stats.realized_pnl + stats.unrealized_pnl,
+            'max_drawdown': stats.max_drawdown
         }
     
+    def get_equity_curve(self) -> List[tuple]:
+        """(timestamp, equity) samples taken at each exit"""
+        return list(self.stats.equity_curve)
+    
     def get_position_suggestions(self) -> List[TradingPosition]:
         """Get current position suggestions"""
         return list(self.suggested_positions.values())
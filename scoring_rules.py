@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Declarative signal scoring rules.
+Bullish/bearish scores are defined as a table of (conditions, points) rules instead of
+code, optionally overridden from a JSON file, and compiled into NumPy arrays so the
+whole watchlist is scored in one pass over a symbols x features matrix. Each rule's
+contribution is kept for explaining a score.
+
+Rule format:
+    {"name": "macd_bullish", "group": "technical",
+     "when": [["ind.macd_bullish", "==", true]],       # ANDed; missing features never match
+     "points": 12,                                      # or {"feature": ..., "scale", "abs", "min", "max"}
+     "chain": "legacy_volume"}                          # optional: only the first matching rule of a chain counts
+
+A direction's score is min(cap, sum over groups of weight * min(group cap, group points)).
+Features are namespaced by source: ind.* (5m indicators), onchain.*, book.* (local
+order book, tracked symbols only), event.*, sentiment.* and fear_greed.*.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+OPERATORS = ('>', '>=', '<', '<=', '==', '!=')
+
+DEFAULT_SCORING_RULES = {
+    'bullish': {
+        'cap': 100,
+        'groups': {
+            'technical': {'weight': 0.5, 'cap': 100},  # Technical + on-chain score, 50% weight
+            'events': {'weight': 1.0},
+            'sentiment': {'weight': 1.0},
+            'fear_greed': {'weight': 1.0},
+        },
+        'rules': [
+            # RSI signals
+            {'name': 'rsi_momentum_zone', 'group': 'technical', 'when': [['ind.rsi', '>', 50], ['ind.rsi', '<', 70]], 'points': 8},
+            {'name': 'rsi_divergence', 'group': 'technical', 'when': [['ind.rsi_divergence', '==', True]], 'points': 15},
+            {'name': 'rsi_oversold', 'group': 'technical', 'when': [['ind.rsi_oversold', '==', True]], 'points': 12},
+            # MACD / EMA
+            {'name': 'macd_bullish', 'group': 'technical', 'when': [['ind.macd_bullish', '==', True]], 'points': 12},
+            {'name': 'ema_bullish_alignment', 'group': 'technical', 'when': [['ind.ema_bullish_alignment', '==', True]], 'points': 8},
+            {'name': 'price_above_ema21', 'group': 'technical', 'when': [['ind.price_above_ema21', '==', True]], 'points': 4},
+            # Volume: Phase 1 score, legacy spike tiers, Phase 1 pattern bonuses
+            {'name': 'volume_phase1_score', 'group': 'technical', 'points': {'feature': 'ind.volume_phase1_score'}},
+            {'name': 'volume_spike_5x', 'group': 'technical', 'chain': 'volume_spike', 'when': [['ind.volume_spike_5x', '==', True]], 'points': 20},
+            {'name': 'volume_spike_3x', 'group': 'technical', 'chain': 'volume_spike', 'when': [['ind.volume_spike_3x', '==', True]], 'points': 15},
+            {'name': 'volume_surge', 'group': 'technical', 'chain': 'volume_spike', 'when': [['ind.volume_surge', '==', True]], 'points': 10},
+            {'name': 'sustained_volume', 'group': 'technical', 'when': [['ind.sustained_volume', '==', True]], 'points': 8},
+            {'name': 'volume_acceleration', 'group': 'technical', 'when': [['ind.volume_acceleration', '==', True]], 'points': 6},
+            {'name': 'volume_breakout', 'group': 'technical', 'when': [['ind.volume_breakout', '==', True]], 'points': 12},
+            {'name': 'smart_money_volume', 'group': 'technical', 'when': [['ind.smart_money_volume', '==', True]], 'points': 10},
+            {'name': 'volume_momentum', 'group': 'technical', 'when': [['ind.volume_momentum', '>', 1.5]], 'points': 8},
+            {'name': 'volume_trend_increasing', 'group': 'technical', 'when': [['ind.volume_trend_increasing', '==', True]], 'points': 5},
+            # Bollinger Bands, breakout, support
+            {'name': 'bb_squeeze', 'group': 'technical', 'when': [['ind.bb_squeeze', '==', True]], 'points': 8},
+            {'name': 'bb_lower', 'group': 'technical', 'when': [['ind.bb_position', '==', 'lower']], 'points': 8},
+            {'name': 'breakout_up', 'group': 'technical', 'when': [['ind.breakout_up', '==', True]], 'points': 15},
+            {'name': 'near_support', 'group': 'technical', 'when': [['ind.near_support', '==', True]], 'points': 8},
+            # On-chain: exchange outflows (accumulation), whales, smart money
+            {'name': 'large_outflow', 'group': 'technical', 'chain': 'net_flow', 'when': [['onchain.net_flow', '<', -1000000]], 'points': 15},
+            {'name': 'outflow', 'group': 'technical', 'chain': 'net_flow', 'when': [['onchain.net_flow', '<', 0]], 'points': 8},
+            {'name': 'whale_activity', 'group': 'technical', 'when': [['onchain.whale_activity', '==', True]], 'points': 12},
+            {'name': 'smart_money_inflow', 'group': 'technical', 'when': [['onchain.smart_money_flow', '>', 0]], 'points': 10},
+            # Order book: resting bids outweigh asks near the top, or a bid wall close below
+            {'name': 'bid_imbalance', 'group': 'technical', 'when': [['book.imbalance', '>', 0.3]], 'points': 8},
+            {'name': 'bid_wall', 'group': 'technical', 'when': [['book.bid_wall', '==', True], ['book.ask_wall', '==', False]], 'points': 6},
+            # Fundamental events
+            {'name': 'bullish_catalyst', 'group': 'events', 'when': [['event.has_bullish_catalyst', '==', True]], 'points': 20},
+            {'name': 'event_score', 'group': 'events', 'when': [['event.event_score', '>', 0]],
+             'points': {'feature': 'event.event_score', 'max': 15}},
+            # Market sentiment
+            {'name': 'positive_sentiment', 'group': 'sentiment', 'when': [['sentiment.sentiment_score', '>', 0.1]], 'points': 10},
+            {'name': 'positive_trend', 'group': 'sentiment', 'when': [['sentiment.trend', '==', 'positive']], 'points': 5},
+            # Fear & Greed, contrarian
+            {'name': 'extreme_fear', 'group': 'fear_greed', 'chain': 'fear_greed', 'when': [['fear_greed.value', '<', 25]], 'points': 10},
+            {'name': 'fear', 'group': 'fear_greed', 'chain': 'fear_greed', 'when': [['fear_greed.value', '<', 40]], 'points': 5},
+            {'name': 'extreme_greed', 'group': 'fear_greed', 'chain': 'fear_greed', 'when': [['fear_greed.value', '>', 80]], 'points': -5},
+        ],
+    },
+    'bearish': {
+        'cap': 100,
+        'groups': {
+            'technical': {'weight': 0.5, 'cap': 100},
+            'events': {'weight': 1.0},
+            'sentiment': {'weight': 1.0},
+            'fear_greed': {'weight': 1.0},
+        },
+        'rules': [
+            {'name': 'rsi_below_50', 'group': 'technical', 'when': [['ind.rsi', '<', 50]], 'points': 8},
+            {'name': 'rsi_overbought', 'group': 'technical', 'when': [['ind.rsi_overbought', '==', True]], 'points': 12},
+            {'name': 'macd_bearish', 'group': 'technical', 'when': [['ind.macd_bullish', '==', False]], 'points': 12},
+            {'name': 'ema_not_aligned', 'group': 'technical', 'when': [['ind.ema_bullish_alignment', '==', False]], 'points': 8},
+            {'name': 'price_below_ema21', 'group': 'technical', 'when': [['ind.price_above_ema21', '==', False]], 'points': 4},
+            # Selling volume
+            {'name': 'selling_spike_5x', 'group': 'technical', 'chain': 'selling_volume',
+             'when': [['ind.volume_spike_5x', '==', True], ['ind.price_change_pct', '<', 0]], 'points': 20},
+            {'name': 'selling_spike_3x', 'group': 'technical', 'chain': 'selling_volume',
+             'when': [['ind.volume_spike_3x', '==', True], ['ind.price_change_pct', '<', 0]], 'points': 15},
+            {'name': 'selling_surge', 'group': 'technical', 'chain': 'selling_volume',
+             'when': [['ind.volume_surge', '==', True], ['ind.price_change_pct', '<', 0]], 'points': 12},
+            {'name': 'bb_upper', 'group': 'technical', 'when': [['ind.bb_position', '==', 'upper']], 'points': 8},
+            {'name': 'breakdown', 'group': 'technical', 'when': [['ind.breakdown', '==', True]], 'points': 15},
+            {'name': 'near_resistance', 'group': 'technical', 'when': [['ind.near_resistance', '==', True]], 'points': 8},
+            # On-chain: exchange inflows (selling pressure), smart money selling
+            {'name': 'large_inflow', 'group': 'technical', 'chain': 'net_flow', 'when': [['onchain.net_flow', '>', 1000000]], 'points': 15},
+            {'name': 'inflow', 'group': 'technical', 'chain': 'net_flow', 'when': [['onchain.net_flow', '>', 0]], 'points': 8},
+            {'name': 'smart_money_outflow', 'group': 'technical', 'when': [['onchain.smart_money_flow', '<', 0]], 'points': 10},
+            # Order book: asks outweigh bids near the top, or an ask wall close above
+            {'name': 'ask_imbalance', 'group': 'technical', 'when': [['book.imbalance', '<', -0.3]], 'points': 8},
+            {'name': 'ask_wall', 'group': 'technical', 'when': [['book.ask_wall', '==', True], ['book.bid_wall', '==', False]], 'points': 6},
+            # Fundamental events
+            {'name': 'bearish_catalyst', 'group': 'events', 'when': [['event.has_bearish_catalyst', '==', True]], 'points': 20},
+            {'name': 'event_score', 'group': 'events', 'when': [['event.event_score', '<', 0]],
+             'points': {'feature': 'event.event_score', 'abs': True, 'max': 15}},
+            # Market sentiment
+            {'name': 'negative_sentiment', 'group': 'sentiment', 'when': [['sentiment.sentiment_score', '<', -0.1]], 'points': 10},
+            {'name': 'negative_trend', 'group': 'sentiment', 'when': [['sentiment.trend', '==', 'negative']], 'points': 5},
+            # Fear & Greed, contrarian
+            {'name': 'extreme_greed', 'group': 'fear_greed', 'chain': 'fear_greed', 'when': [['fear_greed.value', '>', 80]], 'points': 10},
+            {'name': 'greed', 'group': 'fear_greed', 'chain': 'fear_greed', 'when': [['fear_greed.value', '>', 65]], 'points': 5},
+        ],
+    },
+}
+
+
+def _feature_value(row: Dict[str, Dict], feature: str):
+    namespace, _, key = feature.partition('.')
+    return row.get(namespace, {}).get(key)
+
+
+@dataclass
+class RuleScores:
+    """One direction's scores for a batch of symbols"""
+    scores: np.ndarray         # (symbols,)
+    contributions: np.ndarray  # (symbols, rules) weighted points before group/total caps
+    rule_names: List[str]
+
+    def breakdown(self, index: int) -> Dict[str, float]:
+        """Non-zero rule contributions for one symbol, largest first"""
+        row = self.contributions[index]
+        nonzero = np.flatnonzero(row)
+        ordered = nonzero[np.argsort(-np.abs(row[nonzero]), kind='stable')]
+        return {self.rule_names[i]: float(row[i]) for i in ordered}
+
+
+class CompiledRuleTable:
+    """One direction's rules as condition/rule incidence arrays over shared feature columns"""
+
+    def __init__(self, spec: Dict, column_index):
+        rules = spec['rules']
+        groups = spec.get('groups', {})
+        self.cap = spec.get('cap', np.inf)
+        self.rule_names = [rule['name'] for rule in rules]
+
+        group_names = list(groups)
+        for rule in rules:
+            if rule['group'] not in groups:
+                group_names.append(rule['group'])
+                groups = {**groups, rule['group']: {}}
+        self.group_weights = np.array([groups[g].get('weight', 1.0) for g in group_names])
+        self.group_caps = np.array([groups[g].get('cap', np.inf) for g in group_names], dtype=float)
+        self.rule_groups = np.zeros((len(rules), len(group_names)))   # rule -> group one-hot
+
+        # Conditions: column, operator, value, and which rule they belong to
+        cond_columns, cond_ops, cond_values = [], [], []
+        self.cond_rules = np.zeros((0, len(rules)))
+        cond_rule_rows = []
+
+        self.points = np.zeros(len(rules))
+        self.point_features = []   # (rule index, column, scale, abs, min, max)
+        self.chains = {}           # chain name -> [rule indices in table order]
+
+        for r, rule in enumerate(rules):
+            self.rule_groups[r, group_names.index(rule['group'])] = 1.0
+            for feature, op, value in rule.get('when', []):
+                if op not in OPERATORS:
+                    raise ValueError(f"Rule {rule['name']}: unknown operator '{op}'")
+                if isinstance(value, str):
+                    # Categorical feature: compare a 0/1 "feature == value" column instead
+                    column = column_index(feature, value)
+                    op, value = ('==', 1.0) if op == '==' else ('==', 0.0)
+                else:
+                    column = column_index(feature, None)
+                cond_columns.append(column)
+                cond_ops.append(OPERATORS.index(op))
+                cond_values.append(float(value))
+                cond_rule_rows.append(r)
+
+            points = rule.get('points', 0)
+            if isinstance(points, dict):
+                self.point_features.append((r, column_index(points['feature'], None), points.get('scale', 1.0),
+                                            points.get('abs', False), points.get('min'), points.get('max')))
+            else:
+                self.points[r] = points
+            if rule.get('chain'):
+                self.chains.setdefault(rule['chain'], []).append(r)
+
+        self.cond_columns = np.array(cond_columns, dtype=np.int64)
+        self.cond_ops = np.array(cond_ops, dtype=np.int64)
+        self.cond_values = np.array(cond_values)
+        self.cond_rules = np.zeros((len(cond_columns), len(rules)))
+        self.cond_rules[np.arange(len(cond_columns)), cond_rule_rows] = 1.0
+
+    def evaluate(self, X: np.ndarray) -> RuleScores:
+        n = X.shape[0]
+        values = X[:, self.cond_columns]   # (symbols, conditions); NaN = feature missing
+        target = self.cond_values
+        with np.errstate(invalid='ignore'):
+            comparisons = (values > target, values >= target, values < target,
+                           values <= target, values == target, values != target)
+        met = np.choose(self.cond_ops, comparisons) & ~np.isnan(values)
+
+        # A rule fires when none of its conditions failed
+        fired = ((~met).astype(float) @ self.cond_rules) == 0
+
+        # First matching rule wins within a chain (if/elif)
+        for members in self.chains.values():
+            chain = fired[:, members]
+            first = np.cumsum(chain, axis=1) == 1
+            fired[:, members] = chain & first
+
+        points = np.broadcast_to(self.points, (n, len(self.points))).copy()
+        for r, column, scale, use_abs, low, high in self.point_features:
+            feature = np.nan_to_num(X[:, column]) * scale
+            if use_abs:
+                feature = np.abs(feature)
+            if low is not None or high is not None:
+                feature = np.clip(feature, low, high)
+            points[:, r] = feature
+
+        raw = np.where(fired, points, 0.0)
+        group_points = np.minimum(raw @ self.rule_groups, self.group_caps)
+        scores = np.minimum(group_points @ self.group_weights, self.cap)
+        contributions = raw * (self.rule_groups @ self.group_weights)
+        return RuleScores(scores=scores, contributions=contributions, rule_names=self.rule_names)
+
+
+class ScoringRules:
+    """Bullish/bearish rule tables compiled against one feature matrix"""
+
+    def __init__(self, tables: Optional[Dict[str, Dict]] = None):
+        self.columns = []          # [(feature, category or None)]
+        self._column_ids = {}
+        tables = tables or DEFAULT_SCORING_RULES
+        self.tables = {direction: CompiledRuleTable(spec, self._column) for direction, spec in tables.items()}
+
+    @classmethod
+    def from_file(cls, path: Optional[str]) -> 'ScoringRules':
+        """Rules from a JSON file ({direction: table}); missing directions keep the defaults"""
+        tables = dict(DEFAULT_SCORING_RULES)
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    tables.update(json.load(f))
+                logger.info(f"Loaded scoring rules from {path}")
+            except Exception as e:
+                logger.error(f"Invalid scoring rules {path}, using defaults: {e}")
+                tables = dict(DEFAULT_SCORING_RULES)
+        try:
+            return cls(tables)
+        except Exception as e:
+            logger.error(f"Could not compile scoring rules, using defaults: {e}")
+            return cls()
+
+    def _column(self, feature: str, category: Optional[str]) -> int:
+        key = (feature, category)
+        if key not in self._column_ids:
+            self._column_ids[key] = len(self.columns)
+            self.columns.append(key)
+        return self._column_ids[key]
+
+    def feature_matrix(self, rows: List[Dict[str, Dict]]) -> np.ndarray:
+        """(symbols, columns) float matrix; booleans as 0/1, categories one-hot, missing as NaN"""
+        X = np.full((len(rows), len(self.columns)), np.nan)
+        for i, row in enumerate(rows):
+            for j, (feature, category) in enumerate(self.columns):
+                value = _feature_value(row, feature)
+                if value is None:
+                    continue
+                if category is not None:
+                    X[i, j] = 1.0 if value == category else 0.0
+                elif isinstance(value, (bool, np.bool_, int, float, np.integer, np.floating)):
+                    X[i, j] = float(value)
+        return X
+
+    def score(self, rows: List[Dict[str, Dict]]) -> Dict[str, RuleScores]:
+        """Score every row for every direction in one pass"""
+        X = self.feature_matrix(rows)
+        return {direction: table.evaluate(X) for direction, table in self.tables.items()}
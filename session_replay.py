@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Record-and-replay harness for scan sessions.
+The recorder captures every exchange (ccxt) and free-API (requests) response of a live
+session, timestamped, into an append-only gzip file of JSON lines. The replayer serves
+those responses back to the same components under a stepped virtual clock, so a whole
+day of scanning can be rerun at 1x-1000x for profiling and regression comparison.
+
+Reruns are deterministic: virtual time is frozen while a scan runs and only jumps when
+the scan scheduler waits for its next tick, and each request gets the next response
+recorded for the same request from that tick on (not whatever happens to be latest when
+a thread gets scheduled), so host speed and thread timing don't change what a scan sees.
+"""
+
+import base64
+import gzip
+import io
+import json
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+RECORDED_METHODS = ('fetch_ohlcv', 'fetch_ticker', 'fetch_tickers', 'fetch_order_book')
+RECORDED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+MAX_SPEED = 1000.0
+
+
+class ReplayMiss(LookupError):
+    """No response for this request had been recorded by the current virtual time"""
+
+
+def request_key(method: str, url: str) -> str:
+    """'GET https://host/path?a=1&b=2' with the query sorted, so parameter order doesn't matter"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {urlunsplit(parts._replace(query=query))}"
+
+
+def call_key(exchange_id: str, method: str, args: Tuple, kwargs: Dict) -> str:
+    return json.dumps([exchange_id, method, list(args), kwargs], sort_keys=True, default=str)
+
+
+def read_records(path: str) -> Iterator[Dict]:
+    """Records in file order; a truncated last gzip member (crash mid-flush) ends the stream"""
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    except (EOFError, gzip.BadGzipFile) as e:
+        logger.warning(f"Recording {path} ends early: {e}")
+
+
+class SystemClock:
+    """Wall/monotonic time and event waits, as the live components use them"""
+    speed = 1.0
+
+    @staticmethod
+    def time() -> float:
+        return time.time()
+
+    @staticmethod
+    def monotonic() -> float:
+        return time.monotonic()
+
+    @staticmethod
+    def sleep(seconds: float):
+        time.sleep(seconds)
+
+    @staticmethod
+    def wait(event: threading.Event, timeout: Optional[float]) -> bool:
+        return event.wait(timeout)
+
+    @staticmethod
+    def now(tz=None) -> datetime:
+        return datetime.now(tz)
+
+
+class _VirtualTimeModule:
+    """Stands in for the `time` module inside a component module"""
+
+    def __init__(self, clock):
+        self._clock = clock
+
+    def time(self):
+        return self._clock.time()
+
+    def monotonic(self):
+        return self._clock.monotonic()
+
+    def sleep(self, seconds):
+        self._clock.sleep(seconds)
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+class VirtualClock(SystemClock):
+    """Stepped replay clock: frozen except when the scheduler waits, which jumps it forward
+
+    A wait of t virtual seconds takes t / speed real seconds (pacing only); sleeps in the
+    component modules are shortened the same way but never move the clock, so only the
+    scheduler's thread advances time, between scans.
+    """
+
+    def __init__(self, start: float, speed: float = 1.0):
+        if not 0 < speed <= MAX_SPEED:
+            raise ValueError(f"Replay speed must be in (0, {MAX_SPEED:g}], got {speed}")
+        self.start = start
+        self.speed = speed
+        self.listeners = []   # callbacks(target) run on the advancing thread before each jump lands
+        self._now = start
+        self._installed = []  # (module, name, original)
+
+    def monotonic(self) -> float:
+        return self._now - self.start
+
+    def time(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float):
+        target = self._now + max(0.0, seconds)
+        for listener in self.listeners:
+            listener(target)  # May step_to() instants on the way, e.g. each stream record's time
+        self._now = target
+
+    def step_to(self, when: float):
+        """Move forward to an instant within the jump in progress (never backwards)"""
+        self._now = max(self._now, when)
+
+    def sleep(self, seconds: float):
+        time.sleep(max(0.0, seconds) / self.speed)
+
+    def wait(self, event: threading.Event, timeout: Optional[float]) -> bool:
+        if timeout is None:
+            return event.wait()
+        if event.wait(max(0.0, timeout) / self.speed):
+            return True
+        self.advance(timeout)
+        return False
+
+    def now(self, tz=None) -> datetime:
+        return datetime.fromtimestamp(self.time(), tz)
+
+    def install(self, *modules):
+        """Point the `time` module and `datetime` class that each module imported at this clock"""
+        clock = self
+
+        class VirtualDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return cls.fromtimestamp(clock.time(), tz)
+
+        for module in modules:
+            for name, value in list(vars(module).items()):
+                if value is time:
+                    replacement = _VirtualTimeModule(self)
+                elif value is datetime:
+                    replacement = VirtualDatetime
+                else:
+                    continue
+                self._installed.append((module, name, value))
+                setattr(module, name, replacement)
+
+    def uninstall(self):
+        for module, name, original in reversed(self._installed):
+            setattr(module, name, original)
+        self._installed.clear()
+
+
+class SessionRecorder:
+    """Appends timestamped responses to a gzip file; each flush writes one gzip member"""
+
+    def __init__(self, path: str, flush_interval: float = 5.0, flush_records: int = 200):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_records = flush_records
+        self.stats = {'records': 0, 'flushes': 0}
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, source: str, key: str, data, timestamp: Optional[float] = None):
+        line = json.dumps({'t': timestamp or time.time(), 'src': source, 'key': key, 'data': data},
+                          separators=(',', ':'), default=str)
+        with self._lock:
+            self._pending.append(line)
+            self.stats['records'] += 1
+            due = (len(self._pending) >= self.flush_records or
+                   time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            lines, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+            if not lines:
+                return
+            try:
+                with gzip.open(self.path, 'at', encoding='utf-8') as f:
+                    f.write('\n'.join(lines) + '\n')
+                self.stats['flushes'] += 1
+            except Exception as e:
+                logger.error(f"Error writing recording {self.path}: {e}")
+
+    def close(self):
+        self.flush()
+
+    def attach_session(self, session: requests.Session, source: str):
+        """Record every response the session receives (streamed bodies are read in full)"""
+        def hook(response, *args, **kwargs):
+            try:
+                body = response.content or b''
+                try:
+                    data = {'body': body.decode('utf-8')}
+                except UnicodeDecodeError:
+                    data = {'body_b64': base64.b64encode(body).decode('ascii')}
+                data['status'] = response.status_code
+                data['headers'] = {h: response.headers[h] for h in RECORDED_HEADERS if h in response.headers}
+                self.record(source, request_key(response.request.method, response.request.url), data)
+            except Exception as e:
+                logger.error(f"Error recording {source} response: {e}")
+            return response
+
+        session.hooks['response'].append(hook)
+
+    def attach_exchange(self, exchange, name: str, methods: Iterable[str] = RECORDED_METHODS):
+        """Wrap the exchange's fetch methods on the instance so each result is recorded"""
+        for method in methods:
+            original = getattr(exchange, method, None)
+            if original is not None:
+                setattr(exchange, method, self._recording_call(name, method, original))
+
+    def _recording_call(self, name: str, method: str, original: Callable) -> Callable:
+        def call(*args, **kwargs):
+            result = original(*args, **kwargs)
+            self.record(name, call_key(name, method, args, kwargs), result)
+            return result
+        return call
+
+    def attach(self, sessions: Dict[str, requests.Session], exchanges: Dict):
+        for source, session in sessions.items():
+            self.attach_session(session, source)
+        for name, exchange in exchanges.items():
+            self.attach_exchange(exchange, name)
+
+
+class _ReplayAdapter(BaseAdapter):
+    """Transport that answers from the recording instead of the network"""
+
+    def __init__(self, replayer: 'SessionReplayer', source: str):
+        super().__init__()
+        self.replayer = replayer
+        self.source = source
+
+    def send(self, request, **kwargs):
+        try:
+            data = self.replayer.lookup(self.source, request_key(request.method, request.url))
+        except ReplayMiss as e:
+            raise requests.ConnectionError(str(e), request=request)
+
+        body = (base64.b64decode(data['body_b64']) if 'body_b64' in data
+                else data.get('body', '').encode('utf-8'))
+        response = requests.Response()
+        response.status_code = data.get('status', 200)
+        response.headers = CaseInsensitiveDict(data.get('headers', {}))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        response.reason = 'Replayed'
+        return response
+
+    def close(self):
+        pass
+
+
+class SessionReplayer:
+    """Serves a recording back in virtual time
+
+    A request made at virtual time `now` gets the next not-yet-served response recorded
+    for it at or after `now` (responses of the scan that ran from this tick), else the
+    last one recorded before. The file is read as a stream, `lookahead` seconds ahead of
+    the clock; subscribed stream sources (e.g. depth frames) are delivered in file order
+    as the clock reaches them, on the thread that advances it.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0, start: Optional[float] = None, lookahead: float = 300.0):
+        self.path = path
+        self.lookahead = lookahead  # Virtual seconds read ahead; must cover the longest scan
+        self._records = read_records(path)
+        self._next = next(self._records, None)
+        if self._next is None:
+            raise ValueError(f"Recording {path} is empty")
+        self.clock = VirtualClock(start or self._next['t'], speed)
+        self.clock.listeners.append(self._on_clock)
+        self.upcoming = {}     # (source, key) -> deque of (t, data) read ahead, not yet served
+        self.latest = {}       # (source, key) -> data last served or passed by the clock
+        self.subscribers = {}  # source -> callbacks receiving each record's data in order (streams)
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'records': 0}
+        self._stream = deque()  # subscribed records read ahead, awaiting delivery
+        self._lock = threading.RLock()
+
+    @property
+    def finished(self) -> bool:
+        """The clock has passed every recorded response"""
+        with self._lock:
+            self._read_ahead()
+            return self._next is None and not self._stream and all(
+                not queue or queue[-1][0] < self.clock.time() for queue in self.upcoming.values())
+
+    def _read_ahead(self, now: Optional[float] = None):
+        horizon = (now or self.clock.time()) + self.lookahead
+        while self._next is not None and self._next['t'] <= horizon:
+            record = self._next
+            self.stats['records'] += 1
+            if record['src'] in self.subscribers:
+                self._stream.append(record)
+            else:
+                self.upcoming.setdefault((record['src'], record['key']), deque()).append(
+                    (record['t'], record['data']))
+            self._next = next(self._records, None)
+
+    def _on_clock(self, now: float):
+        """Deliver stream records the clock has reached, each at its own recorded time"""
+        with self._lock:
+            self._read_ahead(now)
+            while self._stream and self._stream[0]['t'] <= now:
+                record = self._stream.popleft()
+                self.clock.step_to(record['t'])
+                self.latest[(record['src'], record['key'])] = record['data']
+                for callback in self.subscribers[record['src']]:
+                    try:
+                        callback(record['data'])
+                    except Exception as e:
+                        logger.error(f"Error delivering replayed {record['src']} record: {e}")
+
+    def subscribe(self, source: str, callback: Callable):
+        """Deliver every record of a stream source, in order, as the virtual clock reaches it"""
+        with self._lock:
+            self.subscribers.setdefault(source, []).append(callback)
+            # Records of this source already read ahead move over to the stream, in file order
+            moved = [{'t': t, 'src': src, 'key': key, 'data': data}
+                     for (src, key), queue in self.upcoming.items() if src == source for t, data in queue]
+            if moved:
+                self.upcoming = {k: q for k, q in self.upcoming.items() if k[0] != source}
+                self._stream = deque(sorted([*self._stream, *moved], key=lambda record: record['t']))
+        self._on_clock(self.clock.time())
+
+    def lookup(self, source: str, key: str):
+        with self._lock:
+            self._read_ahead()
+            now = self.clock.time()
+            queue = self.upcoming.get((source, key))
+            # Responses recorded before this tick that nothing asked for are superseded
+            while queue and queue[0][0] < now:
+                self.latest[(source, key)] = queue.popleft()[1]
+            if queue:
+                data = queue.popleft()[1]
+                self.latest[(source, key)] = data
+                self.stats['hits'] += 1
+                return data
+            if (source, key) in self.latest:
+                self.stats['stale'] += 1
+                return self.latest[(source, key)]
+            self.stats['misses'] += 1
+            raise ReplayMiss(f"No recorded {source} response for {key}")
+
+    def attach_session(self, session: requests.Session, source: str):
+        adapter = _ReplayAdapter(self, source)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+    def attach_exchange(self, exchange, name: str, methods: Iterable[str] = RECORDED_METHODS):
+        for method in methods:
+            if getattr(exchange, method, None) is not None:
+                setattr(exchange, method, self._replayed_call(name, method))
+
+    def _replayed_call(self, name: str, method: str) -> Callable:
+        def call(*args, **kwargs):
+            return self.lookup(name, call_key(name, method, args, kwargs))
+        return call
+
+    def attach(self, sessions: Dict[str, requests.Session], exchanges: Dict):
+        for source, session in sessions.items():
+            self.attach_session(session, source)
+        for name, exchange in exchanges.items():
+            self.attach_exchange(exchange, name)
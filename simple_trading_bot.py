@@ -8,8 +8,9 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import pandas as pd
 import numpy as np
-import ccxt
 import requests
+from market_metadata import create_exchange
+from market_funnel import TickerFunnel
 import threading
 import time
 from datetime import datetime, timedelta
@@ -234,13 +235,16 @@ class SimpleTradingBot:
         self.price_data = {}
         self.latest_signals = {}
         self.signal_count = 0
+        self.funnel = None
         
         # Initialize exchange (using real data, not sandbox)
         try:
-            self.exchange = ccxt.binanceus({
+            self.exchange = create_exchange('binanceus', {
                 'rateLimit': 1200,
                 'enableRateLimit': True,
             })
+            # One fetch_tickers call ranks every USDT pair; deep analysis for the displayed pairs + the top 10
+            self.funnel = TickerFunnel(self.exchange.fetch_tickers, top_k=10, always_include=self.symbols)
             print("✅ Exchange connection established")
         except Exception as e:
             logger.error(f"Error initializing exchange: {e}")
@@ -354,9 +358,9 @@ class SimpleTradingBot:
                 self.status_label.config(text="❌ No exchange connection", foreground="red")
                 return
             
-            # Test with one symbol first
+            # One request for every ticker on the exchange
             test_symbol = 'BTC/USDT'
-            ticker = self.exchange.fetch_ticker(test_symbol)
+            ticker = self.funnel.ticker(test_symbol) if self.funnel.refresh(force=True) else None
             
             if ticker:
                 self.status_label.config(text="✅ Connection successful! Loading market data...", foreground="green")
@@ -378,11 +382,13 @@ class SimpleTradingBot:
             self.status_label.config(text=error_msg, foreground="red")
             print(f"Connection error: {e}")
     
-    def update_market_display(self, symbol):
-        """Update market display for a symbol"""
+    def update_market_display(self, symbol, initial=True):
+        """Update market display for a symbol from the last all-market ticker snapshot"""
         try:
             # Get current price data
-            ticker = self.exchange.fetch_ticker(symbol)
+            ticker = self.funnel.ticker(symbol)
+            if ticker is None:
+                raise ValueError("not in the latest tickers")
             
             if symbol in self.market_vars:
                 # Update price
@@ -398,9 +404,9 @@ class SimpleTradingBot:
                 self.market_vars[symbol]['volume'].set(volume_text)
                 
                 # Initialize signal display
-                self.market_vars[symbol]['signal'].set("Analyzing...")
-                
-                print(f"📊 {symbol}: ${price:,.4f} ({change_pct:+.2f}%) Vol: {volume:,.0f}")
+                if initial:
+                    self.market_vars[symbol]['signal'].set("Analyzing...")
+                    print(f"📊 {symbol}: ${price:,.4f} ({change_pct:+.2f}%) Vol: {volume:,.0f}")
                 
         except Exception as e:
             if symbol in self.market_vars:
@@ -430,7 +436,12 @@ class SimpleTradingBot:
         """Monitor markets for signals"""
         while self.running:
             try:
-                for symbol in self.symbols:
+                # Stage 1: one all-market ticker request refreshes prices and the trend ranking
+                if self.funnel.refresh():
+                    self.root.after(0, self.refresh_market_display)
+                
+                # Stage 2: deep OHLCV analysis only for tier 1 and the top-ranked pairs
+                for symbol in self.funnel.deep_candidates():
                     if not self.running:
                         break
                     
@@ -452,6 +463,11 @@ class SimpleTradingBot:
                 logger.error(f"Error in monitoring: {e}")
                 time.sleep(30)
     
+    def refresh_market_display(self):
+        """Update prices/volumes of every displayed pair (Tk thread)"""
+        for symbol in self.symbols:
+            self.update_market_display(symbol, initial=False)
+    
     def get_market_data(self, symbol: str) -> Dict:
         """Get market data for symbol"""
         try:
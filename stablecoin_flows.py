@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Stablecoin supply and DeFi TVL pipeline.
+DeFiLlama's full-history endpoints are streamed and only the tail window is kept,
+the series are persisted locally and only re-downloaded when a new daily point is
+due, and the per-coin CoinGecko lookups run concurrently.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFILLAMA_BASE = "https://api.llama.fi"
+STABLECOINS_BASE = "https://stablecoins.llama.fi"
+COINGECKO_BASE = "https://api.coingecko.com/api/v3"
+
+DAY = 86400
+HISTORY_DAYS = 90          # Points kept per series
+RETRY_INTERVAL = 15 * 60   # When a new daily point is due but not yet published
+
+
+def iter_json_array(chunks: Iterable[str]) -> Iterator:
+    """Yield the elements of a top-level JSON array of objects as the text arrives"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    started = False
+
+    for chunk in chunks:
+        buffer += chunk
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if not started:
+                if buffer[pos] != '[':
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == ']':
+                return
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # Element split across chunks; wait for more text
+            yield item
+        buffer = buffer[pos:]
+
+    # Only ']' ends the array; a dropped connection may stop right after a complete element
+    raise ValueError("Truncated JSON array")
+
+
+class TimeSeriesStore:
+    """Daily (timestamp, value) points persisted as JSON with HTTP validators"""
+
+    def __init__(self, path: str, max_points: int = HISTORY_DAYS):
+        self.path = path
+        self.max_points = max_points
+        self.points = deque(maxlen=max_points)
+        self.etag = None
+        self.last_modified = None
+        self.checked_at = 0.0
+        self._load()
+
+    def _load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                self.points.extend(tuple(point) for point in data.get('points', []))
+                self.etag = data.get('etag')
+                self.last_modified = data.get('last_modified')
+                self.checked_at = data.get('checked_at', 0.0)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable series {self.path}: {e}")
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump({'points': list(self.points), 'etag': self.etag,
+                           'last_modified': self.last_modified, 'checked_at': self.checked_at},
+                          f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not write series {self.path}: {e}")
+
+    @property
+    def last_timestamp(self) -> int:
+        return self.points[-1][0] if self.points else 0
+
+    def is_due(self, now: Optional[float] = None) -> bool:
+        """A new daily point may exist and we haven't just looked for it"""
+        now = now or time.time()
+        return now - self.last_timestamp >= DAY and now - self.checked_at >= RETRY_INTERVAL
+
+    def extend(self, points: Iterable[Tuple[int, float]]):
+        last = self.last_timestamp
+        for timestamp, value in points:
+            if timestamp > last:
+                self.points.append((timestamp, value))
+                last = timestamp
+
+
+def _total_usd(value) -> float:
+    """totalCirculatingUSD is a {peg: amount} dict on the stablecoin charts"""
+    if isinstance(value, dict):
+        return float(sum(v for v in value.values() if isinstance(v, (int, float))))
+    return float(value or 0)
+
+
+class StablecoinFlowPipeline:
+    """Stablecoin supply / chain TVL series and concurrent CoinGecko stablecoin lookups"""
+
+    def __init__(self, data_dir: str = 'market_cache', history_days: int = HISTORY_DAYS,
+                 session: Optional[requests.Session] = None):
+        self.session = session or requests.Session()
+        self.session.headers.update({'User-Agent': 'TradingBot/1.0'})
+        self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='stablecoin')
+        self.series = {
+            'stablecoin_supply': TimeSeriesStore(os.path.join(data_dir, 'stablecoin_supply.json'), history_days),
+            'chain_tvl': TimeSeriesStore(os.path.join(data_dir, 'chain_tvl.json'), history_days),
+        }
+        self.sources = {
+            'stablecoin_supply': (f"{STABLECOINS_BASE}/stablecoincharts/all", 'totalCirculatingUSD'),
+            'chain_tvl': (f"{DEFILLAMA_BASE}/v2/historicalChainTvl", 'tvl'),
+        }
+        self._locks = {name: threading.Lock() for name in self.series}
+
+    def refresh(self, force: bool = False):
+        """Update every due series concurrently"""
+        futures = [self.executor.submit(self._refresh_series, name, force) for name in self.series]
+        for future in futures:
+            future.result()
+
+    def _refresh_series(self, name: str, force: bool = False):
+        store = self.series[name]
+        with self._locks[name]:
+            if not force and not store.is_due():
+                return
+
+            url, value_key = self.sources[name]
+            headers = {}
+            if store.etag:
+                headers['If-None-Match'] = store.etag
+            if store.last_modified:
+                headers['If-Modified-Since'] = store.last_modified
+
+            try:
+                with self.session.get(url, headers=headers, timeout=30, stream=True) as response:
+                    store.checked_at = time.time()
+                    if response.status_code == 304:
+                        store.save()
+                        return
+                    response.raise_for_status()
+                    response.encoding = response.encoding or 'utf-8'
+
+                    # Only points newer than what we have, and at most the window size
+                    last = store.last_timestamp
+                    tail = deque(maxlen=store.max_points)
+                    for item in iter_json_array(response.iter_content(chunk_size=65536, decode_unicode=True)):
+                        timestamp = int(item.get('date', 0))
+                        if timestamp > last:
+                            tail.append((timestamp, _total_usd(item.get(value_key))))
+
+                    store.etag = response.headers.get('ETag')
+                    store.last_modified = response.headers.get('Last-Modified')
+                store.extend(tail)
+                store.save()
+            except Exception as e:
+                logger.error(f"Error refreshing {name}: {e}")
+
+    def get_series(self, name: str, refresh: bool = True) -> List[Tuple[int, float]]:
+        if refresh:
+            self._refresh_series(name)
+        return list(self.series[name].points)
+
+    def latest_change(self, name: str) -> Optional[Dict]:
+        """Last point and its change from the previous one"""
+        points = self.get_series(name)
+        if not points:
+            return None
+        timestamp, latest = points[-1]
+        previous = points[-2][1] if len(points) > 1 else latest
+        change = latest - previous
+        return {
+            'timestamp': timestamp,
+            'latest': latest,
+            'previous': previous,
+            'change': change,
+            'change_percent': (change / previous * 100) if previous > 0 else 0
+        }
+
+    def coingecko_market_data(self, coins: List[str]) -> Dict[str, Dict]:
+        """CoinGecko market_data for several coins, fetched concurrently"""
+        def fetch(coin):
+            response = self.session.get(f"{COINGECKO_BASE}/coins/{coin}", params={
+                'localization': 'false', 'tickers': 'false', 'community_data': 'false',
+                'developer_data': 'false', 'sparkline': 'false'
+            }, timeout=10)
+            response.raise_for_status()
+            return response.json().get('market_data', {})
+
+        futures = {coin: self.executor.submit(fetch, coin) for coin in coins}
+        results = {}
+        for coin, future in futures.items():
+            try:
+                results[coin] = future.result()
+            except Exception as e:
+                logger.error(f"Error fetching CoinGecko data for {coin}: {e}")
+        return results
+
+
+_shared_pipeline = None
+_shared_lock = threading.Lock()
+
+
+def shared_stablecoin_pipeline() -> StablecoinFlowPipeline:
+    """Process-wide pipeline so every consumer reads the same persisted series"""
+    global _shared_pipeline
+    with _shared_lock:
+        if _shared_pipeline is None:
+            _shared_pipeline = StablecoinFlowPipeline()
+        return _shared_pipeline
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Alert dispatcher tests against a local webhook stub and a local SMTP debugging server
+(no network): coalescing into digests, per-symbol cooldown and latency metrics.
+"""
+
+import json
+import socketserver
+import threading
+import time
+from email import message_from_bytes, policy
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from alert_dispatcher import Alert, AlertChannel, AlertDispatcher, SmtpChannel, WebhookChannel
+
+
+class WebhookStub(BaseHTTPRequestHandler):
+    received = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.received.append(json.loads(body))
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class SmtpDebugHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept messages and keep them for inspection"""
+    messages = []
+
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.reply('220 localhost test SMTP')
+        while True:
+            line = self.rfile.readline().decode().strip()
+            if not line:
+                return
+            command = line.split(' ', 1)[0].upper()
+            if command in ('EHLO', 'HELO'):
+                self.reply('250 localhost')
+            elif command == 'DATA':
+                self.reply('354 end with .')
+                data = b''
+                while True:
+                    chunk = self.rfile.readline()
+                    if chunk in (b'.\r\n', b''):
+                        break
+                    data += chunk
+                self.messages.append(message_from_bytes(data, policy=policy.default))
+                self.reply('250 queued')
+            elif command == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('250 ok')
+
+
+def serve(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def webhook_url():
+    WebhookStub.received = []
+    server = serve(HTTPServer(('127.0.0.1', 0), WebhookStub))
+    yield f"http://127.0.0.1:{server.server_port}/hook"
+    server.shutdown()
+
+
+@pytest.fixture
+def smtp_port():
+    SmtpDebugHandler.messages = []
+    server = serve(socketserver.ThreadingTCPServer(('127.0.0.1', 0), SmtpDebugHandler))
+    yield server.server_address[1]
+    server.shutdown()
+
+
+def make_alert(symbol: str, confidence: str = 'high') -> Alert:
+    return Alert(title=f"{confidence.upper()} SIGNAL", message=f"{symbol} - BULLISH\nStrength: 80%",
+                 confidence=confidence, symbols=[symbol], created_at=time.time(),
+                 payload=[{'symbol': symbol}])
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+def test_channel_requires_send():
+    with pytest.raises(TypeError):
+        AlertChannel()
+
+
+def test_webhook_coalesces_burst_and_records_latency(webhook_url):
+    dispatcher = AlertDispatcher([WebhookChannel(webhook_url)], cooldown=300, coalesce_window=0.3)
+    try:
+        assert dispatcher.submit(make_alert('BTC/USDT', 'high'))
+        assert dispatcher.submit(make_alert('ETH/USDT', 'critical'))
+        assert dispatcher.submit(make_alert('SOL/USDT', 'medium'))
+        wait_for(lambda: dispatcher.metrics()['delivered'] == 1)
+        time.sleep(0.2)
+
+        assert len(WebhookStub.received) == 1
+        digest = WebhookStub.received[0]
+        assert digest['count'] == 3
+        assert digest['confidence'] == 'critical'
+        assert digest['symbols'] == ['BTC/USDT', 'ETH/USDT', 'SOL/USDT']
+        assert [s['symbol'] for s in digest['signals']] == digest['symbols']
+
+        metrics = dispatcher.metrics()
+        assert metrics['digests'] == 1 and metrics['delivered'] == 1
+        latency = metrics['latency']['webhook']
+        assert latency['count'] == 1
+        # The digest waits out the coalescing window before it is sent
+        assert 0.3 <= latency['p50'] <= latency['max'] < 5
+    finally:
+        dispatcher.stop()
+
+
+def test_cooldown_suppresses_repeats_per_symbol(webhook_url):
+    dispatcher = AlertDispatcher([WebhookChannel(webhook_url)], cooldown=60, coalesce_window=0.05)
+    try:
+        assert dispatcher.submit(make_alert('BTC/USDT'))
+        assert not dispatcher.submit(make_alert('BTC/USDT'))
+        wait_for(lambda: WebhookStub.received)
+        assert dispatcher.submit(make_alert('ETH/USDT'))
+        wait_for(lambda: dispatcher.metrics()['delivered'] == 2)
+
+        assert [body['symbols'] for body in WebhookStub.received] == [['BTC/USDT'], ['ETH/USDT']]
+        metrics = dispatcher.metrics()
+        assert metrics['submitted'] == 3 and metrics['suppressed'] == 1 and metrics['delivered'] == 2
+    finally:
+        dispatcher.stop()
+
+
+def test_full_queue_drop_does_not_start_cooldown():
+    dispatcher = AlertDispatcher([], max_queue=1, cooldown=300, coalesce_window=0.01)
+    dispatcher.stop()  # Nothing drains the queue
+    assert dispatcher.submit(make_alert('BTC/USDT'))
+    assert not dispatcher.submit(make_alert('ETH/USDT'))  # Queue full: dropped
+
+    dispatcher.queue.get_nowait()
+    assert dispatcher.submit(make_alert('ETH/USDT'))  # Not muted by the dropped alert
+    metrics = dispatcher.metrics()
+    assert metrics['dropped'] == 1 and metrics['suppressed'] == 0
+
+
+def test_smtp_delivers_digest(smtp_port):
+    channel = SmtpChannel('127.0.0.1', smtp_port, 'bot@localhost', ['me@localhost', 'you@localhost'])
+    dispatcher = AlertDispatcher([channel], cooldown=0, coalesce_window=0.2)
+    try:
+        dispatcher.submit(make_alert('BTC/USDT'))
+        dispatcher.submit(make_alert('ETH/USDT'))
+        wait_for(lambda: dispatcher.metrics()['delivered'] == 1)
+
+        assert len(SmtpDebugHandler.messages) == 1
+        email = SmtpDebugHandler.messages[0]
+        assert email['Subject'].startswith('🚨 2 signals')
+        assert email['To'] == 'me@localhost, you@localhost'
+        body = email.get_content()
+        assert 'BTC/USDT - BULLISH' in body and 'ETH/USDT - BULLISH' in body
+
+        metrics = dispatcher.metrics()
+        assert metrics['digests'] == 1 and metrics['latency']['smtp']['count'] == 1
+    finally:
+        dispatcher.stop()
+
+
+def test_failing_channel_is_counted():
+    dispatcher = AlertDispatcher([WebhookChannel('http://127.0.0.1:9/unreachable', timeout=1)],
+                                 coalesce_window=0.01)
+    try:
+        dispatcher.submit(make_alert('BTC/USDT'))
+        wait_for(lambda: dispatcher.metrics()['failed'] == 1)
+        assert dispatcher.metrics()['delivered'] == 0
+    finally:
+        dispatcher.stop()
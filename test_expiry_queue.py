@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Deadline queue tests: earliest-first firing, exactly-once delivery and lazy
+cancellation of rescheduled and cancelled deadlines.
+"""
+
+import random
+
+from expiry_queue import ExpiryQueue
+
+
+def test_due_deadlines_fire_once_earliest_first():
+    queue = ExpiryQueue()
+    queue.schedule('p2', 'time_limit', 200.0)
+    queue.schedule('p1', 'time_limit', 100.0)
+    queue.schedule('s1', 'suggestion', 150.0)
+
+    assert queue.next_deadline() == 100.0
+    assert queue.pop_due(99.0) == []
+    assert queue.pop_due(150.0) == [('p1', 'time_limit'), ('s1', 'suggestion')]
+    assert queue.pop_due(150.0) == []
+    assert len(queue) == 1 and queue.next_deadline() == 200.0
+
+
+def test_cancelled_entries_stay_in_the_heap_until_they_surface():
+    queue = ExpiryQueue()
+    queue.schedule('p1', 'time_limit', 100.0)
+    queue.schedule('p1', 'suggestion', 50.0)
+    queue.schedule('p2', 'time_limit', 300.0)
+
+    queue.cancel('p1', 'suggestion')
+    assert len(queue) == 2 and len(queue.heap) == 3  # Lazy: only marked dead
+    assert queue.deadline_for('p1', 'suggestion') is None
+    assert queue.next_deadline() == 100.0             # The dead head is skipped and dropped
+    assert len(queue.heap) == 2
+
+    queue.cancel('p1')                                # Every kind of the owner
+    assert 'p1' not in queue.entries
+    assert queue.pop_due(1000.0) == [('p2', 'time_limit')]
+    assert queue.heap == [] and len(queue) == 0 and queue.next_deadline() is None
+
+
+def test_rescheduling_moves_the_deadline():
+    queue = ExpiryQueue()
+    queue.schedule('p1', 'time_limit', 100.0)
+    queue.schedule('p1', 'time_limit', 500.0)
+    assert queue.pop_due(200.0) == []                 # The old entry is dead
+    assert queue.deadline_for('p1', 'time_limit') == 500.0
+    assert queue.pop_due(500.0) == [('p1', 'time_limit')]
+
+
+def test_matches_brute_force():
+    rng = random.Random(5)
+    queue, model = ExpiryQueue(), {}  # (owner, kind) -> deadline
+    now = 0.0
+    for _ in range(3000):
+        owner, kind = f"p{rng.randrange(40)}", rng.choice(['time_limit', 'suggestion'])
+        action = rng.random()
+        if action < 0.5:
+            deadline = now + rng.uniform(0, 100)
+            queue.schedule(owner, kind, deadline)
+            model[(owner, kind)] = deadline
+        elif action < 0.7:
+            queue.cancel(owner, kind)
+            model.pop((owner, kind), None)
+        else:
+            now += rng.uniform(0, 30)
+            expected = sorted((deadline, key) for key, deadline in model.items() if deadline <= now)
+            assert queue.pop_due(now) == [key for _, key in expected]
+            for _, key in expected:
+                del model[key]
+        assert len(queue) == len(model)
+        assert queue.next_deadline() == (min(model.values()) if model else None)
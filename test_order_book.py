@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Order book tests (no network): BookSide against a plain dict, and a recorded depth
+session (stream frames, REST snapshots, a sequence gap and the resyncs it causes)
+replayed through the session harness under the stepped virtual clock.
+"""
+
+import json
+import random
+
+import pytest
+import requests
+
+import order_book
+from order_book import DEPTH_STREAM_SOURCE, NO_BOOK_VERSION, BookSide, OrderBookManager
+from session_replay import SessionRecorder, SessionReplayer, request_key
+
+T0 = 1_700_000_000
+SNAPSHOT_URL = 'http://depth.test/api/v3/depth'
+STREAM_URL = 'ws://depth.test/stream'
+DEPTH_LIMIT = 100
+
+
+def expected_side(levels, descending):
+    return sorted(((p, q) for p, q in levels.items() if q > 0), reverse=descending)
+
+
+def side_levels(side: BookSide):
+    return list(zip(side.prices.tolist(), side.qty.tolist()))
+
+
+@pytest.mark.parametrize('descending', [True, False])
+def test_book_side_matches_dict_model(descending):
+    rng = random.Random(7)
+    side, model = BookSide(descending), {}
+    snapshot = [[100 + i, rng.randint(1, 9)] for i in range(-20, 21)]
+    side.load(snapshot)
+    model.update(dict(snapshot))
+    for _ in range(300):
+        update = [[float(price), rng.choice([0, 0, rng.randint(1, 9)])]
+                  for price in rng.sample(range(70, 131), rng.randint(1, 6))]
+        side.apply(update)
+        model.update(dict(update))
+        assert side_levels(side) == expected_side(model, descending)
+
+
+def frame(symbol_id, first, last, bids=(), asks=()):
+    return json.dumps({'stream': f"{symbol_id.lower()}@depth@100ms",
+                       'data': {'e': 'depthUpdate', 's': symbol_id, 'U': first, 'u': last,
+                                'b': [[str(p), str(q)] for p, q in bids],
+                                'a': [[str(p), str(q)] for p, q in asks]}})
+
+
+def record_snapshot(recorder, symbol_id, t, last_update_id, bids, asks):
+    url = requests.Request('GET', SNAPSHOT_URL, params={'symbol': symbol_id, 'limit': DEPTH_LIMIT}).prepare().url
+    body = {'lastUpdateId': last_update_id, 'bids': [[str(p), str(q)] for p, q in bids],
+            'asks': [[str(p), str(q)] for p, q in asks]}
+    recorder.record('depth', request_key('GET', url), {'body': json.dumps(body), 'status': 200,
+                                                       'headers': {'Content-Type': 'application/json'}},
+                    timestamp=t)
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """BTC: a stale and a covering snapshot, diffs, a gap at +10s and a fresh snapshot; SOL: no snapshot"""
+    path = str(tmp_path / 'depth.jsonl.gz')
+    recorder = SessionRecorder(path)
+
+    def stream(t, message):
+        recorder.record(DEPTH_STREAM_SOURCE, STREAM_URL, message, timestamp=T0 + t)
+
+    stream(0.0, frame('BTCUSDT', 101, 102, bids=[(100, 5)]))
+    record_snapshot(recorder, 'BTCUSDT', T0 + 0.02, 90, bids=[(100, 9)], asks=[(101, 9)])  # Cached, too old
+    record_snapshot(recorder, 'BTCUSDT', T0 + 0.05, 102,
+                    bids=[(100, 1), (99, 2), (98, 3)], asks=[(101, 1), (102, 2), (103, 3)])
+    stream(0.1, frame('BTCUSDT', 103, 104, bids=[(100, 4), (97, 1)], asks=[(101, 0)]))
+    stream(0.2, frame('BTCUSDT', 105, 110, asks=[(101.5, 2)]))
+    for i, t in enumerate([0.0, 1.0, 2.0, 3.0, 6.0]):
+        stream(t, frame('SOLUSDT', 500 + i, 500 + i, bids=[(20, i + 1)]))
+    # 111-114 never arrive
+    stream(10.0, frame('BTCUSDT', 115, 116, bids=[(99, 0)]))
+    stream(10.2, frame('BTCUSDT', 117, 118, asks=[(104, 1)]))
+    record_snapshot(recorder, 'BTCUSDT', T0 + 10.5, 118,
+                    bids=[(100, 2), (98, 3), (97, 1)], asks=[(102, 2), (103, 3), (104, 1)])
+    stream(11.0, frame('BTCUSDT', 119, 120, bids=[(100.5, 6)], asks=[(102, 0), (105, 4)]))
+    recorder.close()
+    return path
+
+
+@pytest.fixture
+def replay(recording):
+    replayer = SessionReplayer(recording, speed=1000.0)
+    books = OrderBookManager(['BTC/USDT', 'SOL/USDT'], depth_limit=DEPTH_LIMIT, stream_url=STREAM_URL,
+                             snapshot_url=SNAPSHOT_URL, pending_limit=3, inline_resync=True)
+    replayer.attach_session(books.session, 'depth')
+    replayer.clock.install(order_book)
+    replayer.subscribe(DEPTH_STREAM_SOURCE, books.feed)
+    yield replayer, books
+    replayer.clock.uninstall()
+
+
+def test_resync_picks_first_covering_snapshot(replay):
+    replayer, books = replay
+    replayer.clock.advance(5)
+
+    book = books.books['BTC/USDT']
+    assert book.synced and book.last_update_id == 110
+    assert side_levels(book.bids) == [(100, 4), (99, 2), (98, 3), (97, 1)]
+    assert side_levels(book.asks) == [(101.5, 2), (102, 2), (103, 3)]
+    assert book.stats['stale_snapshots'] == 1 and book.stats['resyncs'] == 1
+    assert book.stats['updates'] == 2  # 101-102 is inside the snapshot
+
+
+def test_gap_resyncs_from_the_next_snapshot(replay):
+    replayer, books = replay
+    replayer.clock.advance(12)
+
+    book = books.books['BTC/USDT']
+    assert book.synced and book.last_update_id == 120
+    assert side_levels(book.bids) == [(100.5, 6), (100, 2), (98, 3), (97, 1)]
+    assert side_levels(book.asks) == [(103, 3), (104, 1), (105, 4)]
+    assert book.stats['gaps'] == 1 and book.stats['resyncs'] == 2 and book.stats['updates'] == 3
+
+    features = books.features('BTC/USDT', depth=2)
+    assert features['best_bid'] == 100.5 and features['best_ask'] == 103
+    assert features['spread'] == pytest.approx(2.5)
+    assert features['spread_bps'] == pytest.approx(2.5 / 101.75 * 10000)
+    bid_depth, ask_depth = 100.5 * 6 + 100 * 2, 103 * 3 + 104 * 1
+    assert features['bid_depth'] == pytest.approx(bid_depth) and features['ask_depth'] == pytest.approx(ask_depth)
+    assert features['imbalance'] == pytest.approx((bid_depth - ask_depth) / (bid_depth + ask_depth))
+    assert features['age'] == pytest.approx(1.0)  # Virtual seconds since the 11.0 update
+
+    replayer.clock.advance(60)
+    assert books.features('BTC/USDT') is None  # Stale after 60 s without updates
+
+
+def test_missing_snapshot_backs_off_in_virtual_time(replay):
+    replayer, books = replay
+    replayer.clock.advance(12)
+
+    book = books.books['SOL/USDT']
+    assert not book.synced and books.features('SOL/USDT') is None
+    # Fetched at 0 s, then not again until the 5 s backoff had passed (the 6 s frame)
+    assert replayer.stats['misses'] == 2
+    # Five frames buffered with room for three: the two oldest were pushed out (and counted)
+    assert book.stats['overflows'] == 2
+
+
+def test_feature_version_is_stable_without_a_book(replay):
+    replayer, books = replay
+    assert books.feature_version('ZZZ/USDT') == books.feature_version('ZZZ/USDT') == NO_BOOK_VERSION
+    assert books.feature_version('SOL/USDT') == NO_BOOK_VERSION  # Tracked, never synced
+
+    replayer.clock.advance(12)
+    synced = books.feature_version('BTC/USDT')
+    assert synced != NO_BOOK_VERSION and None not in synced
+    replayer.clock.advance(60)
+    assert books.feature_version('BTC/USDT') == NO_BOOK_VERSION  # Stale
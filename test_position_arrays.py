@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Bulk position update tests: PositionManager.update_all's vectorized pass (P&L, exits,
+trailing-stop ratchets, milestones) ends in the same state as calling update_position
+symbol by symbol.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from position_manager import MILESTONES, PositionArrays, PositionManager, PositionStatus
+
+SYMBOLS = [f"C{i}/USDT" for i in range(40)]
+
+
+def open_book(seed: int) -> PositionManager:
+    """Identical BUY/SELL positions across managers built from the same seed"""
+    rng = random.Random(seed)
+    manager = PositionManager()
+    for symbol in SYMBOLS:
+        manager.suggest_position(symbol, {'price': rng.uniform(1, 100), 'strength': rng.randint(50, 95),
+                                          'signal_type': rng.choice(['BUY', 'SELL'])})
+        manager.accept_suggestion(symbol)
+    return manager
+
+
+def state(manager: PositionManager):
+    positions = list(manager.active_positions.values()) + manager.position_history
+    return sorted((p.symbol, p.status.value, round(p.current_price, 9), round(p.profit_loss, 9),
+                   None if p.trailing_stop is None else round(p.trailing_stop, 9), tuple(p.alerts_sent))
+                  for p in positions)
+
+
+def test_bulk_update_matches_scalar_path():
+    scalar, bulk = open_book(11), open_book(11)
+    rng = random.Random(12)
+    prices = {symbol: p.entry_price for symbol in SYMBOLS for p in scalar.get_positions_for_symbol(symbol)}
+
+    for _ in range(60):
+        # A random walk with occasional gaps through several levels at once
+        prices = {symbol: price * (1 + rng.gauss(0, 0.02) + rng.choice([0] * 20 + [-0.12, 0.2]))
+                  for symbol, price in prices.items()}
+        tick = {symbol: price for symbol, price in prices.items() if rng.random() < 0.8}
+
+        scalar_alerts = []
+        for symbol, price in tick.items():
+            scalar_alerts += scalar.update_position(symbol, price)['alerts']
+        result = bulk.update_all(tick)
+
+        assert state(bulk) == state(scalar)
+        assert sorted(result['alerts']) == sorted(scalar_alerts)
+
+    assert bulk.position_history, "the walk should close some positions"
+    assert bulk.get_portfolio_summary() == pytest.approx(scalar.get_portfolio_summary())
+
+
+def test_gap_exit_priority_and_untouched_positions():
+    manager = PositionManager()
+    for symbol, price in (('BTC/USDT', 100.0), ('ETH/USDT', 50.0)):
+        manager.suggest_position(symbol, {'price': price, 'strength': 80, 'signal_type': 'BUY'})
+        manager.accept_suggestion(symbol)
+    btc = manager.get_positions_for_symbol('BTC/USDT')[0]
+
+    # BTC gaps through its stop; ETH gets no price this tick
+    result = manager.update_all({'BTC/USDT': 50.0})
+    assert result['exited'] == [btc] and btc.status == PositionStatus.STOP_LOSS
+    assert result['updated'] == 0
+    eth = manager.get_positions_for_symbol('ETH/USDT')[0]
+    assert eth.current_price == 50.0 and eth.trailing_stop is None
+
+
+def test_arrays_mirror_positions():
+    manager = open_book(3)
+    position = manager.get_positions_for_symbol(SYMBOLS[0])[0]
+    position.alerts_sent += [f"milestone_{m}" for m in MILESTONES[:2]]
+    position.trailing_stop = position.entry_price * 0.97
+    arrays = PositionArrays(list(manager.active_positions.values()))
+
+    i = arrays.symbols.index(SYMBOLS[0])
+    assert len(arrays) == len(SYMBOLS)
+    assert arrays.milestones_sent[i] == 2 and arrays.trailing[i] == position.trailing_stop
+    assert np.isnan(arrays.trailing).sum() == len(SYMBOLS) - 1
+    assert set(arrays.side) <= {1.0, -1.0}
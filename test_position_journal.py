@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Position journal tests: a PositionManager writing to a SQLite journal is reopened, and
+replaying the journal (with and without a compaction snapshot) restores open positions,
+pending suggestions, closed history, portfolio stats and saved preferences.
+"""
+
+import pytest
+
+from position_journal import PositionJournal
+from position_manager import PositionManager, PositionStatus
+
+
+def signal(price: float, strength: int = 80, signal_type: str = 'BUY'):
+    return {'price': price, 'signal_type': signal_type, 'strength': strength}
+
+
+def trade(manager: PositionManager):
+    """Enter BTC and ETH, leave SOL suggested; BTC runs up 10%, ETH hits its stop"""
+    for symbol, price in (('BTC/USDT', 100.0), ('ETH/USDT', 2000.0), ('SOL/USDT', 20.0)):
+        manager.suggest_position(symbol, signal(price))
+    assert manager.accept_suggestion('BTC/USDT') and manager.accept_suggestion('ETH/USDT')
+    manager.update_position('BTC/USDT', 110.0)
+    manager.update_position('ETH/USDT', 1900.0)
+
+
+def reopen(path, manager: PositionManager) -> PositionManager:
+    manager.journal.close()
+    return PositionManager(journal=PositionJournal(path))
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'positions.db')
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_replay_restores_positions_suggestions_and_stats(path, compact):
+    manager = PositionManager(journal=PositionJournal(path))
+    trade(manager)
+    if compact:
+        manager.compact_journal()
+        manager.update_position('BTC/USDT', 112.0)  # Events after the snapshot replay on top of it
+    live = manager.get_portfolio_summary()
+    btc = manager.get_positions_for_symbol('BTC/USDT')[0]
+
+    restored = reopen(path, manager)
+
+    assert list(restored.active_positions) == [btc.position_id]
+    position = restored.active_positions[btc.position_id]
+    assert position.status == PositionStatus.ENTERED
+    assert position.trailing_stop == pytest.approx(btc.trailing_stop)
+    assert position.alerts_sent == btc.alerts_sent == ['milestone_5', 'milestone_10']
+    assert position.stop_loss == btc.stop_loss and position.take_profit == btc.take_profit
+
+    assert list(restored.suggested_positions) == ['SOL/USDT']
+    assert restored.suggested_positions['SOL/USDT'].status == PositionStatus.SUGGESTED
+
+    assert [(p.symbol, p.status) for p in restored.position_history] == [('ETH/USDT', PositionStatus.STOP_LOSS)]
+    summary = restored.get_portfolio_summary()
+    for key in ('active_positions', 'suggested_positions', 'realized_pnl', 'total_wins', 'total_losses',
+                'max_drawdown', 'realized_pnl_30d', 'win_rate_30d'):
+        assert summary[key] == pytest.approx(live[key]), key
+    assert summary['realized_pnl'] < 0 and summary['max_drawdown'] > 0
+
+
+def test_restored_triggers_and_expiry_still_fire(path):
+    manager = PositionManager(journal=PositionJournal(path))
+    trade(manager)
+    btc = manager.get_positions_for_symbol('BTC/USDT')[0]
+    restored = reopen(path, manager)
+
+    # The restored trailing stop (106.7) is back in the trigger index
+    result = restored.update_position('BTC/USDT', 106.0)
+    assert result['positions'] == []
+    assert restored.position_history[-1].position_id == btc.position_id
+    assert restored.position_history[-1].status == PositionStatus.TRAILING_STOP
+
+    # So is the SOL suggestion's deadline
+    assert restored.next_expiry() is not None
+    restored.expire_due(now=restored.next_expiry() + 1)
+    assert restored.suggested_positions == {}
+
+    again = reopen(path, restored)
+    assert again.active_positions == {} and again.suggested_positions == {}
+    assert len(again.position_history) == 2
+
+
+def test_preferences_persist(path):
+    manager = PositionManager(journal=PositionJournal(path))
+    manager.save_user_preferences(risk_tolerance='low', max_positions=3)
+    restored = reopen(path, manager)
+    assert restored.user_preferences['risk_tolerance'] == 'low'
+    assert restored.user_preferences['max_positions'] == 3
+    assert restored.user_preferences['trailing_stops'] is True
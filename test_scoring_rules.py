@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Scoring rule tests: compiled rule tables against hand-worked scores, covering group
+weights and caps, chains (first match only), feature-valued points, categorical
+features and missing features, which never match.
+"""
+
+import operator
+import random
+
+import pytest
+
+from scoring_rules import DEFAULT_SCORING_RULES, ScoringRules
+
+COMPARE = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le,
+           '==': operator.eq, '!=': operator.ne}
+
+TABLE = {
+    'bullish': {
+        'cap': 25,
+        'groups': {'technical': {'weight': 0.5, 'cap': 20}, 'other': {'weight': 1.0}},
+        'rules': [
+            {'name': 'rsi_high', 'group': 'technical', 'when': [['ind.rsi', '>', 60]], 'points': 15},
+            {'name': 'macd', 'group': 'technical', 'when': [['ind.macd_bullish', '==', True]], 'points': 10},
+            {'name': 'large_outflow', 'group': 'other', 'chain': 'flow', 'when': [['onchain.net_flow', '<', -100]], 'points': 8},
+            {'name': 'outflow', 'group': 'other', 'chain': 'flow', 'when': [['onchain.net_flow', '<', 0]], 'points': 3},
+            {'name': 'trend_not_up', 'group': 'other', 'when': [['sentiment.trend', '!=', 'up']], 'points': 4},
+            {'name': 'event', 'group': 'other', 'when': [['event.score', '>', 0]],
+             'points': {'feature': 'event.score', 'scale': 2, 'max': 10}},
+            {'name': 'negative_event', 'group': 'other', 'when': [['event.score', '<', 0]],
+             'points': {'feature': 'event.score', 'abs': True}},
+        ],
+    },
+}
+
+
+def test_hand_worked_scores():
+    rows = [
+        # technical 15 + 10 capped at 20, x0.5 = 10; other 8 + 4 + min(14, 10) = 22; total capped at 25
+        {'ind': {'rsi': 70, 'macd_bullish': True}, 'onchain': {'net_flow': -500},
+         'sentiment': {'trend': 'down'}, 'event': {'score': 7}},
+        # Only the second chain rule matches; 'up' fails the != rule; |-3| from the event
+        {'ind': {'rsi': 50, 'macd_bullish': False}, 'onchain': {'net_flow': -50},
+         'sentiment': {'trend': 'up'}, 'event': {'score': -3}},
+        # Nothing known: no condition matches, not even !=
+        {},
+    ]
+    result = ScoringRules(TABLE).score(rows)['bullish']
+
+    assert result.scores.tolist() == pytest.approx([25.0, 6.0, 0.0])
+    # Contributions are weighted points before the group and total caps
+    assert result.breakdown(0) == pytest.approx({'event': 10.0, 'large_outflow': 8.0, 'rsi_high': 7.5,
+                                                 'macd': 5.0, 'trend_not_up': 4.0})
+    assert list(result.breakdown(0))[0] == 'event'  # Largest first
+    assert result.breakdown(1) == pytest.approx({'outflow': 3.0, 'negative_event': 3.0})
+    assert result.breakdown(2) == {}
+
+
+def test_non_numeric_values_count_as_missing():
+    rules = ScoringRules(TABLE)
+    row = {'ind': {'rsi': 'n/a', 'macd_bullish': None}, 'sentiment': {'trend': None}}
+    result = rules.score([row])['bullish']
+    assert result.scores[0] == 0 and result.breakdown(0) == {}
+
+
+def test_default_table():
+    row = {'ind': {'rsi': 60, 'macd_bullish': True, 'volume_spike_5x': True, 'volume_surge': True},
+           'onchain': {'net_flow': -2_000_000}}
+    result = ScoringRules().score([row])
+
+    # Technical 8 + 12 + 20 (surge loses the chain) + 15 (outflow loses its chain), 50% weight
+    assert result['bullish'].scores[0] == pytest.approx(27.5)
+    assert result['bullish'].breakdown(0) == pytest.approx({'volume_spike_5x': 10.0, 'large_outflow': 7.5,
+                                                            'macd_bullish': 6.0, 'rsi_momentum_zone': 4.0})
+    # Every bearish rule needs a feature this row lacks or contradicts
+    assert result['bearish'].scores[0] == 0
+
+
+def reference_score(spec, row):
+    """The table evaluated rule by rule in plain Python"""
+    def value_of(feature):
+        namespace, _, key = feature.partition('.')
+        value = row.get(namespace, {}).get(key)
+        return value if isinstance(value, (bool, int, float, str)) else None
+
+    def met(feature, op, target):
+        value = value_of(feature)
+        if value is None or isinstance(value, str) != isinstance(target, str):
+            return False
+        return COMPARE[op](value, target)
+
+    groups, taken = {}, set()
+    for rule in spec['rules']:
+        chain = rule.get('chain')
+        if chain in taken or not all(met(*condition) for condition in rule.get('when', [])):
+            continue
+        if chain:
+            taken.add(chain)
+        points = rule.get('points', 0)
+        if isinstance(points, dict):
+            value = value_of(points['feature'])
+            value = 0.0 if value is None or isinstance(value, str) else value * points.get('scale', 1.0)
+            value = abs(value) if points.get('abs') else value
+            if points.get('min') is not None:
+                value = max(points['min'], value)
+            if points.get('max') is not None:
+                value = min(points['max'], value)
+            points = value
+        groups[rule['group']] = groups.get(rule['group'], 0.0) + points
+
+    total = 0.0
+    for name, points in groups.items():
+        group = spec['groups'].get(name, {})
+        total += group.get('weight', 1.0) * min(group.get('cap', float('inf')), points)
+    return min(spec.get('cap', float('inf')), total)
+
+
+def test_default_tables_match_reference():
+    rng = random.Random(9)
+    rules = ScoringRules()
+
+    def maybe(value):
+        return value if rng.random() < 0.7 else None
+
+    def flag(p=0.5):
+        return maybe(rng.random() < p)
+
+    rows = [{'ind': {'rsi': maybe(rng.uniform(0, 100)), 'rsi_oversold': flag(0.2), 'rsi_overbought': flag(0.2),
+                     'macd_bullish': flag(), 'ema_bullish_alignment': flag(), 'price_above_ema21': flag(),
+                     'volume_phase1_score': maybe(rng.uniform(0, 30)), 'volume_spike_5x': flag(0.2),
+                     'volume_spike_3x': flag(0.3), 'volume_surge': flag(), 'volume_momentum': maybe(rng.uniform(0, 3)),
+                     'price_change_pct': maybe(rng.uniform(-5, 5)),
+                     'bb_position': maybe(rng.choice(['lower', 'middle', 'upper']))},
+             'onchain': {'net_flow': maybe(rng.uniform(-3e6, 3e6)), 'smart_money_flow': maybe(rng.uniform(-1, 1))},
+             'book': {'imbalance': maybe(rng.uniform(-1, 1)), 'bid_wall': flag(), 'ask_wall': flag()},
+             'event': {'has_bullish_catalyst': flag(0.2), 'event_score': maybe(rng.uniform(-30, 30))},
+             'sentiment': {'sentiment_score': maybe(rng.uniform(-1, 1)),
+                           'trend': maybe(rng.choice(['positive', 'negative', 'neutral']))},
+             'fear_greed': {'value': maybe(rng.uniform(0, 100))}}
+            for _ in range(3000)]
+
+    result = rules.score(rows)
+    assert len(set(result['bullish'].scores.tolist())) > 100  # Not vacuous
+    for direction, spec in DEFAULT_SCORING_RULES.items():
+        expected = [reference_score(spec, row) for row in rows]
+        assert result[direction].scores.tolist() == pytest.approx(expected), direction
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Session recording/replay tests against a local HTTP stub and a fake exchange (no
+network): a recorded run replays response-for-response, reruns are identical, and the
+stepped virtual clock only moves when the scheduler waits.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+import session_replay
+from candle_scheduler import CandleScheduler
+from session_replay import ReplayMiss, SessionRecorder, SessionReplayer, VirtualClock
+
+T0 = 1_700_000_040  # A minute boundary
+OFFSET = 2.0
+TICKS = 3
+
+
+class PriceStub(BaseHTTPRequestHandler):
+    """Every response differs, so a replay serving the wrong one is caught"""
+    served = 0
+
+    def do_GET(self):
+        PriceStub.served += 1
+        symbol = parse_qs(urlparse(self.path).query)['symbol'][0]
+        body = json.dumps({'symbol': symbol, 'n': PriceStub.served}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeExchange:
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_ticker(self, symbol):
+        self.calls += 1
+        return {'symbol': symbol, 'last': 100.0 + self.calls}
+
+
+class SteppedTime:
+    """Stands in for session_replay's `time` while recording, so records land on known ticks"""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def time(self):
+        self.now += 0.25  # Responses of one scan arrive over a few seconds
+        return self.now
+
+    def monotonic(self):
+        return time.monotonic()
+
+
+@pytest.fixture
+def stub_url():
+    PriceStub.served = 0
+    server = HTTPServer(('127.0.0.1', 0), PriceStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/price"
+    server.shutdown()
+
+
+def scan(session, exchange, url, tick):
+    """One scan: a repeated request, a per-tick exchange call and a request only tick 0 makes"""
+    results = [session.get(url, params={'symbol': 'BTC'}).json(),
+               session.get(url, params={'symbol': 'BTC'}).json(),
+               exchange.fetch_ticker('ETH/USDT')]
+    if tick == 0:
+        results.append(session.get(url, params={'symbol': 'ONCE'}).json())
+    return results
+
+
+@pytest.fixture
+def recording(tmp_path, stub_url, monkeypatch):
+    """Record TICKS scans, one per minute, and return (path, url, responses per tick)"""
+    path = str(tmp_path / 'session.jsonl.gz')
+    recorder = SessionRecorder(path, flush_records=2)
+    session, exchange = requests.Session(), FakeExchange()
+    recorder.attach({'prices': session}, {'fake': exchange})
+
+    recorded = []
+    for tick in range(TICKS):
+        monkeypatch.setattr(session_replay, 'time', SteppedTime(T0 + OFFSET + 60 * tick))
+        recorded.append(scan(session, exchange, stub_url, tick))
+    monkeypatch.undo()
+    recorder.close()
+    return path, stub_url, recorded
+
+
+def replay(path, url, speed=1000.0):
+    replayer = SessionReplayer(path, speed=speed)
+    session, exchange = requests.Session(), FakeExchange()
+    replayer.attach({'prices': session}, {'fake': exchange})
+    scheduler = CandleScheduler(['1m'], offset=OFFSET, clock=replayer.clock)
+    stop = threading.Event()
+
+    replayed = [scan(session, exchange, url, 0)]
+    while len(replayed) < TICKS:
+        scheduler.wait(stop)
+        replayed.append(scan(session, exchange, url, len(replayed)))
+    return replayer, replayed
+
+
+def test_replay_serves_recorded_responses(recording):
+    path, url, recorded = recording
+    served = PriceStub.served
+    replayer, replayed = replay(path, url)
+
+    assert replayed == recorded
+    assert PriceStub.served == served  # Nothing reached the network
+    assert replayer.clock.time() == T0 + OFFSET + 60 * (TICKS - 1)
+    assert replayer.stats['hits'] == 3 * TICKS + 1 and replayer.stats['misses'] == 0
+
+
+def test_reruns_are_identical_at_any_speed(recording):
+    path, url, recorded = recording
+    assert replay(path, url, speed=1000.0)[1] == replay(path, url, speed=1.0e3 / 7)[1] == recorded
+
+
+def test_unrequested_and_unrecorded_responses(recording):
+    path, url, recorded = recording
+    replayer = SessionReplayer(path, speed=1000.0)
+    session = requests.Session()
+    replayer.attach({'prices': session}, {})
+
+    replayer.clock.advance(60)
+    # Tick 0's responses are superseded by tick 1's, but a request only tick 0 made falls back to it
+    assert session.get(url, params={'symbol': 'BTC'}).json() == recorded[1][0]
+    assert session.get(url, params={'symbol': 'ONCE'}).json() == recorded[0][3]
+    assert replayer.stats['stale'] == 1
+
+    with pytest.raises(requests.ConnectionError):
+        session.get(url, params={'symbol': 'NEVER'})
+    with pytest.raises(ReplayMiss):
+        replayer.lookup('fake', 'unknown')
+
+
+def test_stream_records_follow_the_clock(tmp_path):
+    path = str(tmp_path / 'stream.jsonl.gz')
+    recorder = SessionRecorder(path)
+    for i, t in enumerate([T0, T0 + 1, T0 + 30, T0 + 61]):
+        recorder.record('depth', 'raw', {'i': i}, timestamp=t)
+    recorder.record('prices', 'GET x', {'body': ''}, timestamp=T0 + 200)
+    recorder.close()
+
+    replayer = SessionReplayer(path, speed=1000.0)
+    received = []
+    replayer.subscribe('depth', received.append)
+    assert received == [{'i': 0}]
+
+    replayer.clock.advance(30)
+    assert received == [{'i': 0}, {'i': 1}, {'i': 2}]
+    assert not replayer.finished
+    replayer.clock.advance(300)
+    assert received[-1] == {'i': 3} and len(received) == 4
+    assert replayer.finished
+
+
+def test_virtual_clock_is_frozen_between_waits():
+    clock = VirtualClock(T0, speed=1000.0)
+    time.sleep(0.01)
+    clock.sleep(5)
+    assert clock.time() == T0 and clock.monotonic() == 0
+
+    started = time.monotonic()
+    assert not clock.wait(threading.Event(), 50)
+    assert time.monotonic() - started < 1
+    assert clock.time() == T0 + 50
+
+    stop = threading.Event()
+    stop.set()
+    assert clock.wait(stop, 50) and clock.time() == T0 + 50
+
+    with pytest.raises(ValueError):
+        VirtualClock(T0, speed=5000)
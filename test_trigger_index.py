@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Price-level trigger tests: ladder crossing and removal against a brute-force model, and
+user price alerts placed through PositionManager firing once, on the side of the price
+they were set from.
+"""
+
+import random
+
+from position_manager import PositionManager
+from trigger_index import ABOVE, BELOW, PriceTrigger, TriggerIndex, TriggerLadder
+
+
+def test_ladder_fires_each_side_at_and_through_its_level():
+    ladder = TriggerLadder()
+    triggers = {name: PriceTrigger('BTC/USDT', level, direction, 'price_alert', name, seq=seq)
+                for seq, (name, level, direction) in enumerate([
+                    ('stop_95', 95.0, BELOW), ('stop_90', 90.0, BELOW), ('twin_90', 90.0, BELOW),
+                    ('target_105', 105.0, ABOVE), ('target_110', 110.0, ABOVE)])}
+    for trigger in triggers.values():
+        ladder.add(trigger)
+
+    assert ladder.crossed(100.0) == []
+    assert [t.owner_id for t in ladder.crossed(95.0)] == ['stop_95']  # Touching the level fires
+    assert ladder.crossed(95.0) == []  # Popped: fires once
+    assert sorted(t.owner_id for t in ladder.crossed(80.0)) == ['stop_90', 'twin_90']
+    assert [t.owner_id for t in ladder.crossed(120.0)] == ['target_105', 'target_110']
+    assert len(ladder) == 0
+
+
+def test_ladder_removal_keeps_equal_levels_apart():
+    ladder = TriggerLadder()
+    first = PriceTrigger('BTC/USDT', 90.0, BELOW, 'stop_loss', 'a', seq=1)
+    second = PriceTrigger('BTC/USDT', 90.0, BELOW, 'stop_loss', 'b', seq=2)
+    ladder.add(first)
+    ladder.add(second)
+    assert ladder.remove(first) and not ladder.remove(first)
+    assert [t.owner_id for t in ladder.crossed(90.0)] == ['b']
+
+
+def test_index_matches_brute_force():
+    rng = random.Random(3)
+    index, model = TriggerIndex(), {}  # (owner, kind) -> (symbol, level, direction)
+    for step in range(2000):
+        symbol = rng.choice(['BTC/USDT', 'ETH/USDT'])
+        action = rng.random()
+        if action < 0.4:
+            owner, kind = f"p{rng.randrange(30)}", rng.choice(['stop_loss', 'take_profit'])
+            level, direction = float(rng.randrange(80, 121)), rng.choice([BELOW, ABOVE])
+            index.set_trigger(symbol, owner, kind, level, direction)
+            model[(owner, kind)] = (symbol, level, direction)
+        elif action < 0.5:
+            owner = f"p{rng.randrange(30)}"
+            index.remove_owner(owner)
+            model = {key: value for key, value in model.items() if key[0] != owner}
+        else:
+            price = float(rng.randrange(75, 126))
+            expected = {key for key, (s, level, direction) in model.items() if s == symbol and
+                        (price <= level if direction == BELOW else price >= level)}
+            fired = {(t.owner_id, t.kind) for t in index.crossed(symbol, price)}
+            assert fired == expected, step
+            for key in expected:
+                del model[key]
+        assert len(index) == len(model)
+        assert {(owner, kind) for owner, kinds in index.by_owner.items() for kind in kinds} == set(model)
+
+
+def test_moving_a_trigger_replaces_the_old_level():
+    index = TriggerIndex()
+    index.set_trigger('BTC/USDT', 'p1', 'trailing_stop', 90.0, BELOW)
+    index.set_trigger('BTC/USDT', 'p1', 'trailing_stop', 95.0, BELOW)
+    index.set_trigger('BTC/USDT', 'p1', 'take_profit', 120.0, ABOVE)
+    assert len(index) == 2
+    assert [(t.kind, t.level) for t in index.crossed('BTC/USDT', 94.0)] == [('trailing_stop', 95.0)]
+    assert list(index.triggers_for('p1')) == ['take_profit']
+    index.set_trigger('BTC/USDT', 'p1', 'take_profit', None, ABOVE)  # None removes
+    assert len(index) == 0 and index.triggers_for('p1') == {}
+
+
+def test_alert_without_a_price_waits_for_the_first_tick():
+    manager = PositionManager()
+    below = manager.add_price_alert('BTC/USDT', 50.0)
+    above = manager.add_price_alert('BTC/USDT', 70.0)
+    assert manager.trigger_index.triggers_for(below) == {}
+
+    # The first price places both alerts instead of firing the one under the market
+    assert manager._process_price('BTC/USDT', 60.0) == ([], {})
+    assert manager.trigger_index.triggers_for(below)['price_alert'].direction == BELOW
+    assert manager.trigger_index.triggers_for(above)['price_alert'].direction == ABOVE
+
+    assert manager._process_price('BTC/USDT', 49.0)[0] == ['🔔 BTC/USDT below $50.0000']
+    assert manager._process_price('BTC/USDT', 71.0)[0] == ['🔔 BTC/USDT above $70.0000']
+    assert manager._process_price('BTC/USDT', 40.0)[0] == []  # One-shot
+
+
+def test_alert_side_follows_the_last_price_or_explicit_direction():
+    manager = PositionManager()
+    manager._process_price('ETH/USDT', 100.0)
+    implicit = manager.add_price_alert('ETH/USDT', 90.0)
+    explicit = manager.add_price_alert('ETH/USDT', 110.0, direction=BELOW, message='dip')
+    assert manager.trigger_index.triggers_for(implicit)['price_alert'].direction == BELOW
+
+    # An explicit BELOW under the market fires on the next price
+    assert manager._process_price('ETH/USDT', 100.0)[0] == ['dip']
+    assert manager.trigger_index.triggers_for(explicit) == {}
+
+
+def test_removing_an_unplaced_alert():
+    manager = PositionManager()
+    alert_id = manager.add_price_alert('SOL/USDT', 10.0)
+    manager.remove_price_alert(alert_id)
+    assert manager.unplaced_alerts == {}
+    assert manager._process_price('SOL/USDT', 20.0) == ([], {})
+    assert len(manager.trigger_index) == 0
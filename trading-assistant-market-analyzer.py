@@ -12,12 +12,23 @@ import json
 import os
 from typing import Dict, List, Optional, Tuple
 import logging
-from dataclasses import dataclass, asdict
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import sys
+from dataclasses import dataclass, asdict, field
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import seaborn as sns
-from plyer import notification
-import winsound  # For Windows sound alerts
+from live_chart import LiveChart
+from market_index import shared_market_index
+from market_metadata import create_exchange
+from stablecoin_flows import shared_stablecoin_pipeline
+from candle_scheduler import CandleScheduler, CATCH_UP
+from scoring_rules import ScoringRules
+from market_funnel import TickerFunnel
+from session_replay import SessionRecorder, SessionReplayer, SystemClock
+from order_book import OrderBookManager, DEPTH_STREAM_SOURCE
+from mobile_trading_pairs import TIER_1_PAIRS
+from alert_dispatcher import (Alert, AlertDispatcher, DesktopChannel, SoundChannel,
+                              WebhookChannel, SmtpChannel)
 
 # Configure logging
 logging.basicConfig(
@@ -30,7 +41,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Timeframes shown as tabs in the detailed analysis window
+DETAIL_TIMEFRAMES = ['1m', '5m', '15m', '1h']
+
+CONFIDENCE_LEVELS = ['critical', 'high', 'medium', 'low']
+
+if sys.version_info < (3, 10):
+    sys.exit("Python 3.10+ is required (signals are slotted dataclasses)")
+
+@dataclass(slots=True)
 class MarketSignal:
     symbol: str
     timeframe: str
@@ -42,16 +61,120 @@ class MarketSignal:
     take_profit: float
     risk_reward: float
     confidence: str  # low/medium/high/critical
-    indicators: Dict
+    indicators: Dict  # shared indicator snapshot for the symbol/timeframe; never mutated
     timestamp: datetime
+    fundamental_events: List = field(default_factory=list)
+    event_score: float = 0
+    score_breakdown: Dict = field(default_factory=dict)  # rule name -> contribution to strength
+
+class SignalStore:
+    """Fixed-capacity ring buffer of recent signals with per-symbol/per-confidence
+    indexes and rolling time-window counts maintained on insert"""
+    
+    def __init__(self, capacity: int = 50, window_seconds: int = 300):
+        self.capacity = capacity
+        self.window_seconds = window_seconds
+        self.buffer = [None] * capacity
+        self.head = 0   # next slot to write
+        self.size = 0
+        
+        # Eviction is always the globally oldest signal, which is also the oldest
+        # in its symbol/confidence deque, so indexes stay in sync with popleft()
+        self.by_symbol = {}      # symbol -> deque of signals, oldest first
+        self.by_confidence = {level: deque() for level in CONFIDENCE_LEVELS}
+        
+        # Signals inside the time window (independent of ring capacity)
+        self.window = deque()    # (timestamp, confidence), oldest first
+        self.window_counts = {level: 0 for level in CONFIDENCE_LEVELS}
+    
+    def __len__(self):
+        return self.size
+    
+    def add(self, signal: MarketSignal):
+        evicted = self.buffer[self.head] if self.size == self.capacity else None
+        if evicted is not None:
+            symbol_signals = self.by_symbol[evicted.symbol]
+            symbol_signals.popleft()
+            if not symbol_signals:
+                del self.by_symbol[evicted.symbol]
+            self.by_confidence.setdefault(evicted.confidence, deque()).popleft()
+        
+        self.buffer[self.head] = signal
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self.by_symbol.setdefault(signal.symbol, deque()).append(signal)
+        self.by_confidence.setdefault(signal.confidence, deque()).append(signal)
+        
+        self.window.append((signal.timestamp.timestamp(), signal.confidence))
+        self.window_counts[signal.confidence] = self.window_counts.get(signal.confidence, 0) + 1
+    
+    def extend(self, signals: List[MarketSignal]):
+        for signal in signals:
+            self.add(signal)
+    
+    def recent(self, limit: Optional[int] = None) -> List[MarketSignal]:
+        """Signals newest first"""
+        count = self.size if limit is None else min(limit, self.size)
+        return [self.buffer[(self.head - 1 - i) % self.capacity] for i in range(count)]
+    
+    def for_symbol(self, symbol: str) -> List[MarketSignal]:
+        """Buffered signals for a symbol, newest first"""
+        return list(reversed(self.by_symbol.get(symbol, ())))
+    
+    def for_confidence(self, confidence: str) -> List[MarketSignal]:
+        """Buffered signals at a confidence level, newest first"""
+        return list(reversed(self.by_confidence.get(confidence, ())))
+    
+    def counts_in_window(self, now: Optional[float] = None) -> Dict[str, int]:
+        """Signals per confidence level created within the window"""
+        cutoff = (now or time.time()) - self.window_seconds
+        while self.window and self.window[0][0] < cutoff:
+            _, confidence = self.window.popleft()
+            self.window_counts[confidence] -= 1
+        return dict(self.window_counts)
+
+CACHE_UNAVAILABLE = 'unavailable'  # Version of a missing or expired cache entry
+
+def cache_entry_version(cache: Dict, key: str, duration: float):
+    """Fetch time of a {'data', 'timestamp'} cache entry, or CACHE_UNAVAILABLE if missing or expired
+    
+    Expiry changes the version once, so the next score refetches; a fetch that then fails
+    (rate limit, no CoinGecko id) caches nothing and keeps the version constant, so the
+    symbol isn't rescored again until a refetch succeeds or its candles change.
+    """
+    entry = cache.get(key)
+    if entry is None or time.time() - entry['timestamp'] >= duration:
+        return CACHE_UNAVAILABLE
+    return entry['timestamp']
 
 class TechnicalAnalyzer:
+    # Bars each indicator needs before the values read below are defined (TA-Lib lookback + bars read)
+    INDICATOR_LOOKBACK = {
+        'rsi': 15,
+        'rsi_divergence': 34,     # RSI(14) over the last 20 bars
+        'macd': 35,               # 33-bar lookback, histogram compared with the previous bar
+        'ema': 50,                # EMA 9/21/50
+        'bollinger': 20,
+        'volume': 50,             # 20- and 50-bar volume averages
+        'atr': 15,
+        'support_resistance': 20,
+    }
+    MIN_BARS = max(INDICATOR_LOOKBACK.values())  # Fewer bars and the indicators are undefined
+    
+    # EMA, MACD and Wilder-smoothed RSI/ATR depend on every bar since their seed (TA-Lib's
+    # "unstable period"): at exactly their lookback, EMA(50) is still its SMA seed. Fetching
+    # this many extra bars keeps their values at what the 100-bar history always produced.
+    UNSTABLE_PERIOD = 50
+    UNSTABLE_INDICATORS = ('rsi', 'rsi_divergence', 'macd', 'ema', 'atr')
+    WARMUP_BARS = max(MIN_BARS, max(map(INDICATOR_LOOKBACK.get, UNSTABLE_INDICATORS)) + UNSTABLE_PERIOD)  # Bars fetched
+    
     def __init__(self):
         self.indicators = {}
+        self.series_cache = {}  # key -> {'last_bar', 'length', 'last_close', 'data'}
     
     def calculate_all_indicators(self, df: pd.DataFrame) -> Dict:
         """Calculate comprehensive technical indicators"""
-        if len(df) < 50:
+        if len(df) < self.MIN_BARS:
             return {}
         
         close = df['close'].values
@@ -174,6 +297,41 @@ class TechnicalAnalyzer:
             logger.error(f"Error calculating indicators: {e}")
             return {}
     
+    def calculate_overlay_series(self, key: str, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Full EMA/Bollinger arrays for charting, cached until the candles change"""
+        if df is None or df.empty:
+            return {}
+        
+        last_bar = df['timestamp'].iloc[-1] if 'timestamp' in df else len(df)
+        last_close = df['close'].iloc[-1]
+        cached = self.series_cache.get(key)
+        if (cached and cached['last_bar'] == last_bar and
+                cached['length'] == len(df) and cached['last_close'] == last_close):
+            return cached['data']
+        
+        try:
+            close = df['close'].values.astype(float)
+            bb_upper, bb_middle, bb_lower = talib.BBANDS(close, timeperiod=20)
+            series = {
+                'ema_9': talib.EMA(close, timeperiod=9),
+                'ema_21': talib.EMA(close, timeperiod=21),
+                'ema_50': talib.EMA(close, timeperiod=50),
+                'bb_upper': bb_upper,
+                'bb_middle': bb_middle,
+                'bb_lower': bb_lower
+            }
+        except Exception as e:
+            logger.error(f"Error calculating overlay series for {key}: {e}")
+            return {}
+        
+        self.series_cache[key] = {
+            'last_bar': last_bar,
+            'length': len(df),
+            'last_close': last_close,
+            'data': series
+        }
+        return series
+    
     def _detect_rsi_divergence(self, close: np.ndarray, rsi: np.ndarray) -> bool:
         """Detect RSI divergence patterns"""
         if len(close) < 20:
@@ -210,6 +368,8 @@ class TechnicalAnalyzer:
 
 class OnChainDataManager:
     def __init__(self):
+        self.market_index = shared_market_index()
+        self.stablecoin_pipeline = shared_stablecoin_pipeline()
         self.cache = {}
         self.cache_duration = 300  # 5 minutes for on-chain data
         self.session = requests.Session()
@@ -300,6 +460,8 @@ class OnChainDataManager:
             }
             
             response = self.session.get(url, params=params, timeout=10)
+            if response.status_code == 404:
+                self.market_index.mark_unavailable('coingecko', symbol)
             response.raise_for_status()
             data = response.json()
             
@@ -320,13 +482,8 @@ class OnChainDataManager:
             total_volume_change = 0
             individual_data = {}
             
-            for coin in stablecoins:
-                url = f"https://api.coingecko.com/api/v3/coins/{coin}"
-                response = self.session.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                
-                market_data = data.get('market_data', {})
+            # One concurrent round trip for all three coins
+            for coin, market_data in self.stablecoin_pipeline.coingecko_market_data(stablecoins).items():
                 volume_24h = market_data.get('total_volume', {}).get('usd', 0)
                 volume_change = market_data.get('total_volume_change_24h', 0)
                 
@@ -422,43 +579,13 @@ class OnChainDataManager:
             }
     
     def _symbol_to_coingecko_id(self, symbol: str) -> str:
-        """Convert trading symbol to CoinGecko ID"""
-        # Remove /USDT, /USD, etc. and get base currency
-        base_symbol = symbol.split('/')[0].upper()
-        
-        # Common mappings
-        symbol_map = {
-            'BTC': 'bitcoin',
-            'ETH': 'ethereum',
-            'BNB': 'binancecoin',
-            'ADA': 'cardano',
-            'SOL': 'solana',
-            'XRP': 'ripple',
-            'DOT': 'polkadot',
-            'AVAX': 'avalanche-2',
-            'MATIC': 'matic-network',
-            'LINK': 'chainlink',
-            'UNI': 'uniswap',
-            'LTC': 'litecoin',
-            'BCH': 'bitcoin-cash',
-            'ALGO': 'algorand',
-            'VET': 'vechain',
-            'FIL': 'filecoin',
-            'TRX': 'tron',
-            'ETC': 'ethereum-classic',
-            'XLM': 'stellar',
-            'ATOM': 'cosmos',
-            'HBAR': 'hedera-hashgraph',
-            'NEAR': 'near',
-            'MANA': 'decentraland',
-            'SAND': 'the-sandbox',
-            'CRO': 'crypto-com-chain',
-            'APE': 'apecoin',
-            'LDO': 'lido-dao',
-            'SHIB': 'shiba-inu'
-        }
-        
-        return symbol_map.get(base_symbol, '')
+        """Convert trading symbol to CoinGecko ID (shared market index)"""
+        return self.market_index.coingecko_id(symbol)
+    
+    def cache_version(self, symbol: str) -> Tuple:
+        """Versions of the cached on-chain inputs used to score a symbol"""
+        return (cache_entry_version(self.cache, f"exchange_flows_{symbol}", self.cache_duration),
+                cache_entry_version(self.cache, f"network_activity_{symbol}", self.cache_duration))
     
     def get_network_activity(self, symbol: str) -> Dict:
         """Get basic network activity using free APIs"""
@@ -487,6 +614,8 @@ class OnChainDataManager:
             }
             
             response = self.session.get(url, params=params, timeout=10)
+            if response.status_code == 404:
+                self.market_index.mark_unavailable('coingecko', symbol)
             response.raise_for_status()
             data = response.json()
             
@@ -567,29 +696,220 @@ class OnChainDataManager:
             logger.error(f"Error calculating social score: {e}")
             return 0
 
+class VenueLatencyTracker:
+    """Recent request latencies per exchange, used to pick hedge deadlines"""
+    
+    def __init__(self, percentile: float = 90, samples: int = 200, min_samples: int = 10,
+                 default_deadline: float = 1.5, min_deadline: float = 0.25, max_deadline: float = 5.0):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.default_deadline = default_deadline
+        self.min_deadline = min_deadline
+        self.max_deadline = max_deadline
+        self.latencies = {}  # venue -> deque of seconds (successful requests)
+        self.failures = {}   # venue -> count
+        self._samples = samples
+        self._lock = threading.Lock()
+    
+    def record(self, venue: str, seconds: float, ok: bool = True):
+        with self._lock:
+            if ok:
+                self.latencies.setdefault(venue, deque(maxlen=self._samples)).append(seconds)
+            else:
+                self.failures[venue] = self.failures.get(venue, 0) + 1
+    
+    def deadline(self, venue: str) -> float:
+        """How long to wait on a venue before hedging: its recent p90 latency"""
+        with self._lock:
+            samples = list(self.latencies.get(venue, ()))
+        if len(samples) < self.min_samples:
+            return self.default_deadline
+        value = float(np.percentile(samples, self.percentile))
+        return min(max(value, self.min_deadline), self.max_deadline)
+    
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            venues = set(self.latencies) | set(self.failures)
+            result = {}
+            for venue in venues:
+                samples = list(self.latencies.get(venue, ()))
+                result[venue] = {
+                    'requests': len(samples),
+                    'failures': self.failures.get(venue, 0),
+                    'p50': float(np.percentile(samples, 50)) if samples else None,
+                    'p90': float(np.percentile(samples, 90)) if samples else None,
+                }
+            return result
+
+class CandleMatrix:
+    """Candles of many symbols aligned on their last bar: (symbols, bars) arrays, NaN-padded on the left
+    
+    Rolling statistics over the bars before each bar are computed once per matrix and shared.
+    """
+    FIELDS = ('open', 'high', 'low', 'close', 'volume')
+    
+    def __init__(self, symbols: List[str], arrays: Dict[str, np.ndarray], lengths: np.ndarray):
+        self.symbols = symbols
+        self.arrays = arrays      # field -> (symbols, bars)
+        self.lengths = lengths    # bars actually available per symbol
+        self._rolling = {}
+    
+    @classmethod
+    def from_buffers(cls, symbols: List[str], buffers: List[Optional[np.ndarray]], bars: int) -> 'CandleMatrix':
+        """From per-symbol (bars, 5) OHLCV arrays, oldest bar first"""
+        block = np.full((len(cls.FIELDS), len(symbols), bars), np.nan)
+        lengths = np.zeros(len(symbols), dtype=np.int64)
+        for i, candles in enumerate(buffers):
+            if candles is None or not len(candles):
+                continue
+            n = min(len(candles), bars)
+            lengths[i] = n
+            block[:, i, bars - n:] = candles[-n:].T
+        return cls(symbols, dict(zip(cls.FIELDS, block)), lengths)
+    
+    def prior(self, field: str, window: int, how: str) -> np.ndarray:
+        """mean/max/min of the `window` bars before each bar, (symbols, bars); NaN where undefined"""
+        key = (field, window, how)
+        if key not in self._rolling:
+            values = self.arrays[field]
+            result = np.full(values.shape, np.nan)
+            if values.shape[1] > window:
+                windows = np.lib.stride_tricks.sliding_window_view(values[:, :-1], window, axis=1)
+                result[:, window:] = getattr(np, how)(windows, axis=2)
+            self._rolling[key] = result
+        return self._rolling[key]
+
 class DataManager:
+    # Quote currencies treated as interchangeable when routing a pair between venues
+    QUOTE_ALIASES = {'USDT': ['USDT', 'USD'], 'USD': ['USD', 'USDT']}
+    
     def __init__(self):
+        # Markets come from the shared disk cache on first use instead of a download per client
         self.exchanges = {
-            'binanceus': ccxt.binanceus({'enableRateLimit': True}),
-            'coinbase': ccxt.coinbasepro({'enableRateLimit': True}),
+            'binanceus': create_exchange('binanceus', {'enableRateLimit': True}),
+            'coinbase': create_exchange('coinbasepro', {'enableRateLimit': True}),
         }
+        self.primary_exchange = 'binanceus'
         self.onchain_manager = OnChainDataManager()
         self.cache = {}
         self.cache_duration = 30  # seconds
+        
+        # Hedged fetches: ask the primary venue, and the next venue listing the pair
+        # if the primary is slower than its usual p90 (or fails)
+        self.latency = VenueLatencyTracker()
+        self.market_index = shared_market_index()  # venue listings, refreshed daily
+        self.routes = {}         # symbol -> [(venue, venue symbol), ...] in preference order
+        self._routes_built_at = None
+        self.executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='venue')
+        self.prefetch_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='prefetch')
+        self.matrix_cache = {}   # (timeframe, bars, symbols) -> (cache versions, CandleMatrix)
+    
+    def _listed_symbols(self, venue: str) -> Optional[set]:
+        """Symbols a venue lists; None means unknown, so assume listed"""
+        return self.market_index.listed_symbols(venue)
+    
+    def availability_report(self, symbols: List[str]) -> Dict[str, List[str]]:
+        """Which data sources (venues, CoinGecko) each pair is missing from"""
+        self.market_index.ensure_fresh(self.exchanges)
+        return self.market_index.report(symbols, self.QUOTE_ALIASES)
+    
+    def route(self, symbol: str, primary: Optional[str] = None) -> List[Tuple[str, str]]:
+        """Venues that list the pair (quote normalized, e.g. BTC/USDT -> BTC/USD), primary first"""
+        primary = primary or self.primary_exchange
+        self.market_index.ensure_fresh(self.exchanges)
+        if self._routes_built_at != self.market_index.built_at:
+            self.routes = {}
+            self._routes_built_at = self.market_index.built_at
+        
+        if symbol not in self.routes:
+            base, _, quote = symbol.partition('/')
+            candidates = [f"{base}/{q}" for q in self.QUOTE_ALIASES.get(quote, [quote])]
+            
+            routes = []
+            for venue in self.exchanges:
+                listed = self._listed_symbols(venue)
+                if listed is None:
+                    routes.append((venue, symbol))
+                    continue
+                venue_symbol = next((c for c in candidates if c in listed), None)
+                if venue_symbol:
+                    routes.append((venue, venue_symbol))
+            self.routes[symbol] = routes
+        
+        routes = [r for r in self.routes[symbol] if not self.market_index.is_unavailable(r[0], symbol)]
+        return sorted(routes, key=lambda r: r[0] != primary)
+    
+    def _timed_fetch(self, symbol: str, venue: str, venue_symbol: str, timeframe: str, limit: int):
+        """fetch_ohlcv on one venue, recording its latency"""
+        started = time.monotonic()
+        try:
+            ohlcv = self.exchanges[venue].fetch_ohlcv(venue_symbol, timeframe, limit=limit)
+        except ccxt.BadSymbol:
+            # Delisted since the index was built: stop asking this venue for a while
+            self.market_index.mark_unavailable(venue, symbol)
+            raise
+        except Exception:
+            self.latency.record(venue, time.monotonic() - started, ok=False)
+            raise
+        self.latency.record(venue, time.monotonic() - started)
+        if not ohlcv:
+            raise ValueError(f"{venue} returned no candles for {venue_symbol}")
+        return venue, ohlcv
+    
+    def _fetch_hedged(self, symbol: str, timeframe: str, limit: int, primary: Optional[str]):
+        """First successful (venue, ohlcv) across the routed venues"""
+        routes = self.route(symbol, primary)
+        if not routes:
+            return None, []
+        
+        pending = {}
+        errors = []
+        next_route = 0
+        
+        def launch():
+            nonlocal next_route
+            venue, venue_symbol = routes[next_route]
+            next_route += 1
+            pending[self.executor.submit(self._timed_fetch, symbol, venue, venue_symbol, timeframe, limit)] = venue
+            return venue
+        
+        venue = launch()
+        deadline = self.latency.deadline(venue)
+        while pending:
+            timeout = deadline if next_route < len(routes) else None
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    errors.append(e)
+            
+            # Hedge: the primary was too slow or failed, bring in the next venue
+            if next_route < len(routes):
+                venue = launch()
+                deadline = self.latency.deadline(venue)
+        
+        raise errors[-1] if errors else ValueError(f"No data for {symbol}")
     
-    def get_market_data(self, symbol: str, timeframe: str = '5m', limit: int = 100, exchange: str = 'binanceus') -> pd.DataFrame:
-        """Fetch market data with caching"""
-        cache_key = f"{exchange}_{symbol}_{timeframe}"
+    def get_market_data(self, symbol: str, timeframe: str = '5m', limit: int = 100, exchange: Optional[str] = None) -> pd.DataFrame:
+        """Fetch market data with caching (hedged across the venues that list the pair)"""
+        cache_key = f"{symbol}_{timeframe}"
         current_time = time.time()
         
-        # Check cache
-        if (cache_key in self.cache and 
-            current_time - self.cache[cache_key]['timestamp'] < self.cache_duration):
-            return self.cache[cache_key]['data']
+        # Check cache: one buffer per symbol/timeframe, served when it holds at least `limit` bars
+        entry = self.cache.get(cache_key)
+        if (entry is not None and entry['limit'] >= limit and
+            current_time - entry['timestamp'] < self.cache_duration):
+            df = entry['data']
+            return df if len(df) <= limit else df.iloc[-limit:].reset_index(drop=True)
         
         try:
-            exchange_obj = self.exchanges[exchange]
-            ohlcv = exchange_obj.fetch_ohlcv(symbol, timeframe, limit=limit)
+            venue, ohlcv = self._fetch_hedged(symbol, timeframe, limit, exchange)
+            if venue is None:
+                # Not listed on any venue (see availability_report); skip without an error
+                return pd.DataFrame()
             
             df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
             df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
@@ -598,7 +918,10 @@ class DataManager:
             # Cache the data
             self.cache[cache_key] = {
                 'data': df,
-                'timestamp': current_time
+                'timestamp': current_time,
+                'limit': limit,
+                'candles': df[list(CandleMatrix.FIELDS)].to_numpy(dtype=float),  # OHLCV buffer for universe scans
+                'venue': venue
             }
             
             return df
@@ -607,18 +930,54 @@ class DataManager:
             logger.error(f"Error fetching data for {symbol}: {e}")
             return pd.DataFrame()
     
-    def get_multiple_timeframes(self, symbol: str, exchange: str = 'binanceus') -> Dict[str, pd.DataFrame]:
-        """Get data for multiple timeframes"""
-        timeframes = ['1m', '5m', '15m', '1h']
+    def prefetch(self, symbols: List[str], requirements: Dict[str, int], fresher_than: float, timeout: float = 15.0):
+        """Concurrently refetch {timeframe: bars} candles cached before `fresher_than` (a candle boundary, Unix time)"""
+        futures = []
+        for symbol in symbols:
+            for timeframe, limit in requirements.items():
+                entry = self.cache.get(f"{symbol}_{timeframe}")
+                if entry is not None and entry['timestamp'] >= fresher_than:
+                    continue
+                # Cached before the candle closed: drop it so the fetch sees the new bar
+                self.cache.pop(f"{symbol}_{timeframe}", None)
+                futures.append(self.prefetch_executor.submit(self.get_market_data, symbol, timeframe, limit))
+        if futures:
+            wait(futures, timeout=timeout)
+    
+    def candle_matrix(self, symbols: List[str], timeframe: str, bars: int) -> 'CandleMatrix':
+        """The last `bars` cached candles of every symbol as one matrix (no network access)"""
+        versions = tuple(self.cache.get(f"{symbol}_{timeframe}", {}).get('timestamp') for symbol in symbols)
+        key = (timeframe, bars, tuple(symbols))
+        cached = self.matrix_cache.get(key)
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+        
+        buffers = [self.cache.get(f"{symbol}_{timeframe}", {}).get('candles') for symbol in symbols]
+        matrix = CandleMatrix.from_buffers(symbols, buffers, bars)
+        self.matrix_cache[key] = (versions, matrix)
+        return matrix
+    
+    def get_cached_data(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+        """Return the last fetched candles for a symbol regardless of age, without touching the network"""
+        entry = self.cache.get(f"{symbol}_{timeframe}")
+        if entry is None or entry['data'].empty:
+            return None
+        return entry['data']
+    
+    def get_multiple_timeframes(self, symbol: str, requirements: Optional[Dict[str, int]] = None,
+                                exchange: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        """Get data for multiple timeframes: {timeframe: bars} (default: 1m/5m/15m/1h, 100 bars each)"""
+        requirements = requirements or {tf: 100 for tf in ('1m', '5m', '15m', '1h')}
         data = {}
         
-        for tf in timeframes:
-            data[tf] = self.get_market_data(symbol, tf, exchange=exchange)
+        for tf, limit in requirements.items():
+            data[tf] = self.get_market_data(symbol, tf, limit=limit, exchange=exchange)
         
         return data
 
 class FundamentalEventMonitor:
     def __init__(self):
+        self.market_index = shared_market_index()
         self.events_cache = {}
         self.cache_duration = 3600  # 1 hour
         self.session = requests.Session()
@@ -813,41 +1172,12 @@ class FundamentalEventMonitor:
         return 'neutral'
     
     def _symbol_to_coingecko_id(self, symbol: str) -> str:
-        """Convert trading symbol to CoinGecko ID (reusing from OnChainDataManager)"""
-        base_symbol = symbol.split('/')[0].upper()
-        
-        symbol_map = {
-            'BTC': 'bitcoin',
-            'ETH': 'ethereum',
-            'BNB': 'binancecoin',
-            'ADA': 'cardano',
-            'SOL': 'solana',
-            'XRP': 'ripple',
-            'DOT': 'polkadot',
-            'AVAX': 'avalanche-2',
-            'MATIC': 'matic-network',
-            'LINK': 'chainlink',
-            'UNI': 'uniswap',
-            'LTC': 'litecoin',
-            'BCH': 'bitcoin-cash',
-            'ALGO': 'algorand',
-            'VET': 'vechain',
-            'FIL': 'filecoin',
-            'TRX': 'tron',
-            'ETC': 'ethereum-classic',
-            'XLM': 'stellar',
-            'ATOM': 'cosmos',
-            'HBAR': 'hedera-hashgraph',
-            'NEAR': 'near',
-            'MANA': 'decentraland',
-            'SAND': 'the-sandbox',
-            'CRO': 'crypto-com-chain',
-            'APE': 'apecoin',
-            'LDO': 'lido-dao',
-            'SHIB': 'shiba-inu'
-        }
-        
-        return symbol_map.get(base_symbol, '')
+        """Convert trading symbol to CoinGecko ID (shared market index)"""
+        return self.market_index.coingecko_id(symbol)
+    
+    def cache_version(self, symbol: str) -> Tuple:
+        """Version of the cached events check_event_impact() reads"""
+        return (cache_entry_version(self.events_cache, f"events_{symbol}_2", self.cache_duration),)
     
     def check_event_impact(self, symbol: str) -> Dict:
         """Check if there are any impactful events in the next 24-48 hours"""
@@ -880,6 +1210,7 @@ class FundamentalEventMonitor:
 
 class MarketSentimentAnalyzer:
     def __init__(self):
+        self.market_index = shared_market_index()
         self.sentiment_cache = {}
         self.cache_duration = 1800  # 30 minutes
         self.session = requests.Session()
@@ -1013,6 +1344,8 @@ class MarketSentimentAnalyzer:
             }
             
             response = self.session.get(url, params=params, timeout=10)
+            if response.status_code == 404:
+                self.market_index.mark_unavailable('coingecko', symbol)
             response.raise_for_status()
             data = response.json()
             
@@ -1154,41 +1487,13 @@ class MarketSentimentAnalyzer:
             return 0
     
     def _symbol_to_coingecko_id(self, symbol: str) -> str:
-        """Convert trading symbol to CoinGecko ID"""
-        base_symbol = symbol.split('/')[0].upper()
-        
-        symbol_map = {
-            'BTC': 'bitcoin',
-            'ETH': 'ethereum',
-            'BNB': 'binancecoin',
-            'ADA': 'cardano',
-            'SOL': 'solana',
-            'XRP': 'ripple',
-            'DOT': 'polkadot',
-            'AVAX': 'avalanche-2',
-            'MATIC': 'matic-network',
-            'LINK': 'chainlink',
-            'UNI': 'uniswap',
-            'LTC': 'litecoin',
-            'BCH': 'bitcoin-cash',
-            'ALGO': 'algorand',
-            'VET': 'vechain',
-            'FIL': 'filecoin',
-            'TRX': 'tron',
-            'ETC': 'ethereum-classic',
-            'XLM': 'stellar',
-            'ATOM': 'cosmos',
-            'HBAR': 'hedera-hashgraph',
-            'NEAR': 'near',
-            'MANA': 'decentraland',
-            'SAND': 'the-sandbox',
-            'CRO': 'crypto-com-chain',
-            'APE': 'apecoin',
-            'LDO': 'lido-dao',
-            'SHIB': 'shiba-inu'
-        }
-        
-        return symbol_map.get(base_symbol, '')
+        """Convert trading symbol to CoinGecko ID (shared market index)"""
+        return self.market_index.coingecko_id(symbol)
+    
+    def cache_version(self, symbol: str) -> Tuple:
+        """Versions of the cached social sentiment and fear & greed inputs"""
+        return (cache_entry_version(self.sentiment_cache, f"social_sentiment_{symbol}", self.cache_duration),
+                cache_entry_version(self.sentiment_cache, "fear_greed_index", self.cache_duration))
     
     def get_market_sentiment_summary(self) -> Dict:
         """Get overall market sentiment summary"""
@@ -1239,280 +1544,203 @@ class MarketSentimentAnalyzer:
         else:
             return 'fearful'
 
-# Add these to the SignalGenerator class
+class ScoringInputTracker:
+    """Remembers what a symbol's last score was computed from, so unchanged symbols can reuse it
+    
+    Inputs count as changed when a candle closes (the forming bar's open time moves), when the
+    forming bar's close or volume moved past a tolerance, or when an on-chain/event/sentiment
+    cache entry was refetched or has expired.
+    """
+    
+    def __init__(self, timeframes: Tuple[str, ...] = ('5m', '1m'), price_tolerance: float = 0.0005,
+                 volume_tolerance: float = 0.05):
+        self.timeframes = timeframes
+        self.price_tolerance = price_tolerance    # relative move of the forming bar's close
+        self.volume_tolerance = volume_tolerance  # relative growth of the forming bar's volume
+        self.states = {}   # symbol -> ({timeframe: (open time, close, volume)}, versions, signals)
+        self.stats = {'rescored': 0, 'reused': 0}
+    
+    @staticmethod
+    def _forming_bar(df: Optional[pd.DataFrame]) -> Optional[Tuple]:
+        if df is None or df.empty:
+            return None
+        last = df.iloc[-1]
+        return (last['timestamp'], float(last['close']), float(last['volume']))
+    
+    def changed(self, symbol: str, data: Dict[str, pd.DataFrame], versions: Tuple) -> bool:
+        state = self.states.get(symbol)
+        if state is None or versions != state[1]:
+            return True
+        
+        for timeframe in self.timeframes:
+            bar = self._forming_bar(data.get(timeframe))
+            previous = state[0].get(timeframe)
+            if bar is None or previous is None:
+                if bar != previous:
+                    return True
+                continue
+            if bar[0] != previous[0]:
+                return True  # Candle closed
+            if abs(bar[1] - previous[1]) > self.price_tolerance * previous[1]:
+                return True
+            if bar[2] - previous[2] > self.volume_tolerance * max(previous[2], 1e-12):
+                return True
+        return False
+    
+    def remember(self, symbol: str, data: Dict[str, pd.DataFrame], versions: Tuple, signals: List[MarketSignal]):
+        bars = {timeframe: self._forming_bar(data.get(timeframe)) for timeframe in self.timeframes}
+        self.states[symbol] = (bars, versions, signals)
+    
+    def previous_signals(self, symbol: str) -> List[MarketSignal]:
+        state = self.states.get(symbol)
+        return state[2] if state else []
+
 class SignalGenerator:
-    def __init__(self):
+    def __init__(self, data_manager: Optional[DataManager] = None, scoring_rules: Optional[ScoringRules] = None,
+                 order_books: Optional[OrderBookManager] = None):
+        self.data_manager = data_manager
+        self.scoring_rules = scoring_rules or ScoringRules()
+        self.order_books = order_books  # Local depth books (tier-1 symbols) for the book.* features
+        self.score_breakdowns = {}  # symbol -> {direction: {rule: contribution}} from the last scoring
         self.analyzer = TechnicalAnalyzer()
         self.event_monitor = FundamentalEventMonitor()
         self.sentiment_analyzer = MarketSentimentAnalyzer()
+        self.indicator_snapshots = {}  # symbol -> {timeframe: indicators}
+        self.input_tracker = ScoringInputTracker(timeframes=tuple(self.data_requirements()))
+    
+    def data_requirements(self) -> Dict[str, int]:
+        """Candles the scoring reads, {timeframe: bars}: indicators on the 5m signal chart and the 1m confirmation chart"""
+        warmup = self.analyzer.WARMUP_BARS
+        return {'5m': warmup, '1m': warmup}
+    
+    def input_versions(self, symbol: str) -> Tuple:
+        """Cache versions of every non-candle input to a symbol's score"""
+        versions = self.event_monitor.cache_version(symbol) + self.sentiment_analyzer.cache_version(symbol)
+        if self.data_manager is not None:
+            versions += self.data_manager.onchain_manager.cache_version(symbol)
+        if self.order_books is not None:
+            versions += self.order_books.feature_version(symbol)
+        return versions
+    
+    def generate_changed_signals(self, data_by_symbol: Dict[str, Dict[str, pd.DataFrame]]) -> Dict[str, Tuple[List[MarketSignal], bool]]:
+        """{symbol: (signals, rescored)}; symbols whose inputs didn't change keep the previous scan's signals"""
+        tracker = self.input_tracker
+        changed = {symbol: data for symbol, data in data_by_symbol.items()
+                   if tracker.changed(symbol, data, self.input_versions(symbol))}
+        fresh = self.generate_signals_batch(changed) if changed else {}
+        
+        results = {}
+        for symbol, data in data_by_symbol.items():
+            if symbol in fresh:
+                # Versions read after scoring: the refetches it triggered are part of this result
+                tracker.remember(symbol, data, self.input_versions(symbol), fresh[symbol])
+                tracker.stats['rescored'] += 1
+                results[symbol] = (fresh[symbol], True)
+            else:
+                tracker.stats['reused'] += 1
+                results[symbol] = (tracker.previous_signals(symbol), False)
+        return results
+    
+    def get_indicator_snapshot(self, symbol: str, timeframe: str) -> Dict:
+        """Indicators computed for a symbol/timeframe by the last scan (empty if none)"""
+        return self.indicator_snapshots.get(symbol, {}).get(timeframe, {})
+    
+    def store_indicator_snapshot(self, symbol: str, timeframe: str, indicators: Dict):
+        """Record indicators so other views can reuse them instead of recomputing"""
+        if indicators:
+            self.indicator_snapshots.setdefault(symbol, {})[timeframe] = indicators
     
     def generate_signals(self, symbol: str, data: Dict[str, pd.DataFrame]) -> List[MarketSignal]:
         """Generate trading signals based on multi-factor analysis"""
-        signals = []
+        return self.generate_signals_batch({symbol: data})[symbol]
+    
+    def collect_features(self, symbol: str, data: Dict[str, pd.DataFrame]) -> Optional[Dict[str, Dict]]:
+        """Scoring inputs for one symbol, by source (see scoring_rules); None without enough 5m history"""
+        # Primary analysis on 5m chart
+        df_5m = data.get('5m')
+        df_1m = data.get('1m')
+        min_bars = self.analyzer.MIN_BARS
+        
+        if df_5m is None or len(df_5m) < min_bars:
+            return None
         
+        # Calculate technical indicators
+        indicators_5m = self.analyzer.calculate_all_indicators(df_5m)
+        indicators_1m = self.analyzer.calculate_all_indicators(df_1m) if df_1m is not None and len(df_1m) >= min_bars else {}
+        self.store_indicator_snapshot(symbol, '5m', indicators_5m)
+        self.store_indicator_snapshot(symbol, '1m', indicators_1m)
+        
+        # Get on-chain data (now using real free APIs)
+        onchain_data = {}
         try:
-            # Primary analysis on 5m chart
-            df_5m = data.get('5m')
-            df_1m = data.get('1m')
-            df_15m = data.get('15m')
-            
-            if df_5m is None or len(df_5m) < 50:
-                return signals
-            
-            # Calculate technical indicators
-            indicators_5m = self.analyzer.calculate_all_indicators(df_5m)
-            indicators_1m = self.analyzer.calculate_all_indicators(df_1m) if df_1m is not None and len(df_1m) >= 50 else {}
-            
-            # Get on-chain data (now using real free APIs)
-            onchain_data = {}
-            try:
-                # Get exchange flows and network activity
-                exchange_flows = self.data_manager.onchain_manager.get_exchange_flows(symbol)
-                network_activity = self.data_manager.onchain_manager.get_network_activity(symbol)
-                
-                onchain_data = {
-                    **exchange_flows,
-                    'network_activity_score': network_activity.get('activity_score', 0),
-                    'social_score': network_activity.get('social_score', 0)
-                }
-            except Exception as e:
-                logger.error(f"Error fetching on-chain data for {symbol}: {e}")
-            
-            # Get fundamental events (now using real free APIs)
-            event_data = self.event_monitor.check_event_impact(symbol)
-            
-            # Get sentiment data (now using real free APIs)
-            sentiment_data = self.sentiment_analyzer.get_social_sentiment(symbol)
-            fear_greed = self.sentiment_analyzer.get_fear_greed_index()
-            
-            # Generate bullish signals with enhanced scoring
-            bullish_score = self._calculate_enhanced_bullish_score(
-                indicators_5m, indicators_1m, onchain_data, event_data, sentiment_data, fear_greed
-            )
-            
-            if bullish_score > 40:
-                signal = self._create_enhanced_bullish_signal(symbol, indicators_5m, bullish_score, event_data)
-                if signal:
-                    signals.append(signal)
-            
-            # Generate bearish signals with enhanced scoring
-            bearish_score = self._calculate_enhanced_bearish_score(
-                indicators_5m, indicators_1m, onchain_data, event_data, sentiment_data, fear_greed
-            )
-            
-            if bearish_score > 40:
-                signal = self._create_enhanced_bearish_signal(symbol, indicators_5m, bearish_score, event_data)
-                if signal:
-                    signals.append(signal)
-            
-            return signals
-            
+            # Get exchange flows and network activity
+            exchange_flows = self.data_manager.onchain_manager.get_exchange_flows(symbol)
+            network_activity = self.data_manager.onchain_manager.get_network_activity(symbol)
+            
+            onchain_data = {
+                **exchange_flows,
+                'network_activity_score': network_activity.get('activity_score', 0),
+                'social_score': network_activity.get('social_score', 0)
+            }
         except Exception as e:
-            logger.error(f"Error generating signals for {symbol}: {e}")
-            return []
+            logger.error(f"Error fetching on-chain data for {symbol}: {e}")
+        
+        return {
+            'ind': indicators_5m,
+            'ind_1m': indicators_1m,
+            'onchain': onchain_data,
+            'book': (self.order_books.features(symbol) if self.order_books is not None else None) or {},
+            # Fundamental events and sentiment (now using real free APIs)
+            'event': self.event_monitor.check_event_impact(symbol),
+            'sentiment': self.sentiment_analyzer.get_social_sentiment(symbol),
+            'fear_greed': self.sentiment_analyzer.get_fear_greed_index(),
+        }
     
-    def _calculate_enhanced_bullish_score(self, ind_5m: Dict, ind_1m: Dict, onchain_data: Dict, 
-                                        event_data: Dict, sentiment_data: Dict, fear_greed: Dict) -> float:
-        """Enhanced bullish scoring with all data sources"""
-        score = 0
-        
-        # Technical Analysis (50% weight)
-        tech_score = self._calculate_bullish_score(ind_5m, ind_1m, onchain_data)
-        score += tech_score * 0.5
-        
-        # Fundamental Events (25% weight)
-        if event_data.get('has_bullish_catalyst', False):
-            score += 20
-        if event_data.get('event_score', 0) > 0:
-            score += min(event_data['event_score'], 15)
-        
-        # Market Sentiment (15% weight)
-        if sentiment_data.get('sentiment_score', 0) > 0.1:
-            score += 10
-        if sentiment_data.get('trend') == 'positive':
-            score += 5
-        
-        # Fear & Greed Contrarian (10% weight)
-        fg_value = fear_greed.get('value', 50)
-        if fg_value < 25:  # Extreme fear - contrarian bullish
-            score += 10
-        elif fg_value < 40:  # Fear - somewhat bullish
-            score += 5
-        elif fg_value > 80:  # Extreme greed - caution
-            score -= 5
-        
-        return min(score, 100)
-    
-    def _calculate_enhanced_bearish_score(self, ind_5m: Dict, ind_1m: Dict, onchain_data: Dict, 
-                                        event_data: Dict, sentiment_data: Dict, fear_greed: Dict) -> float:
-        """Enhanced bearish scoring with all data sources"""
-        score = 0
-        
-        # Technical Analysis (50% weight)
-        tech_score = self._calculate_bearish_score(ind_5m, ind_1m, onchain_data)
-        score += tech_score * 0.5
-        
-        # Fundamental Events (25% weight)
-        if event_data.get('has_bearish_catalyst', False):
-            score += 20
-        if event_data.get('event_score', 0) < 0:
-            score += min(abs(event_data['event_score']), 15)
-        
-        # Market Sentiment (15% weight)
-        if sentiment_data.get('sentiment_score', 0) < -0.1:
-            score += 10
-        if sentiment_data.get('trend') == 'negative':
-            score += 5
-        
-        # Fear & Greed Contrarian (10% weight)
-        fg_value = fear_greed.get('value', 50)
-        if fg_value > 80:  # Extreme greed - contrarian bearish
-            score += 10
-        elif fg_value > 65:  # Greed - somewhat bearish
-            score += 5
-        
-        return min(score, 100)
-    
-    def _calculate_bullish_score(self, ind_5m: Dict, ind_1m: Dict, onchain_data: Dict = None) -> float:
-        """Calculate bullish signal strength with on-chain data"""
-        score = 0
-        
-        # Technical Analysis (70% weight)
-        # RSI signals
-        if ind_5m.get('rsi', 50) > 50 and ind_5m.get('rsi', 50) < 70:
-            score += 8
-        if ind_5m.get('rsi_divergence', False):
-            score += 15
-        if ind_5m.get('rsi_oversold', False):
-            score += 12
-        
-        # MACD signals
-        if ind_5m.get('macd_bullish', False):
-            score += 12
-        
-        # EMA alignment
-        if ind_5m.get('ema_bullish_alignment', False):
-            score += 8
-        if ind_5m.get('price_above_ema21', False):
-            score += 4
-        
-        # Enhanced Volume Analysis (based on methodology + PHASE 1 ENHANCEMENTS)
-        # Phase 1 Volume Score Integration
-        volume_phase1_score = ind_5m.get('volume_phase1_score', 0)
-        score += volume_phase1_score  # Direct boost from Phase 1 patterns
-        
-        # Legacy volume patterns (keep for compatibility)
-        if ind_5m.get('volume_spike_5x', False):  # Extreme volume spike
-            score += 20
-        elif ind_5m.get('volume_spike_3x', False):  # Strong volume spike
-            score += 15
-        elif ind_5m.get('volume_surge', False):  # Regular volume surge
-            score += 10
-        
-        # NEW Phase 1 Volume Pattern Bonuses
-        if ind_5m.get('sustained_volume', False):  # 3+ consecutive high volume bars
-            score += 8
-        if ind_5m.get('volume_acceleration', False):  # Accelerating volume pattern
-            score += 6
-        if ind_5m.get('volume_breakout', False):  # Highest volume in 20 periods
-            score += 12
-        if ind_5m.get('smart_money_volume', False):  # High volume + small price change
-            score += 10
-        
-        # Volume momentum and trend
-        if ind_5m.get('volume_momentum', 1) > 1.5:
-            score += 8
-        if ind_5m.get('volume_trend_increasing', False):
-            score += 5
-        
-        # Bollinger Bands
-        if ind_5m.get('bb_squeeze', False):
-            score += 8
-        if ind_5m.get('bb_position') == 'lower':
-            score += 8
-        
-        # Breakout
-        if ind_5m.get('breakout_up', False):
-            score += 15
-        
-        # Support/Resistance
-        if ind_5m.get('near_support', False):
-            score += 8
-        
-        # On-Chain Analysis (30% weight) - NEW
-        if onchain_data:
-            # Exchange outflows (accumulation)
-            if onchain_data.get('net_flow', 0) < -1000000:  # Large outflows
-                score += 15
-            elif onchain_data.get('net_flow', 0) < 0:  # Any outflows
-                score += 8
-            
-            # Whale activity
-            if onchain_data.get('whale_activity', False):
-                score += 12
-            
-            # Smart money flows
-            smart_flow = onchain_data.get('smart_money_flow', 0)
-            if smart_flow > 0:
-                score += 10
+    def generate_signals_batch(self, data_by_symbol: Dict[str, Dict[str, pd.DataFrame]]) -> Dict[str, List[MarketSignal]]:
+        """Signals for many symbols, scored in one pass of the rule tables"""
+        results = {symbol: [] for symbol in data_by_symbol}
+        features = {}
+        for symbol, data in data_by_symbol.items():
+            try:
+                row = self.collect_features(symbol, data)
+                if row is not None:
+                    features[symbol] = row
+            except Exception as e:
+                logger.error(f"Error generating signals for {symbol}: {e}")
+        if not features:
+            return results
         
-        return min(score, 100)
-    
-    def _calculate_bearish_score(self, ind_5m: Dict, ind_1m: Dict, onchain_data: Dict = None) -> float:
-        """Calculate bearish signal strength with on-chain data"""
-        score = 0
-        
-        # Technical Analysis (70% weight)
-        # RSI signals
-        if ind_5m.get('rsi', 50) < 50:
-            score += 8
-        if ind_5m.get('rsi_overbought', False):
-            score += 12
-        
-        # MACD signals
-        if not ind_5m.get('macd_bullish', True):
-            score += 12
-        
-        # EMA alignment
-        if not ind_5m.get('ema_bullish_alignment', True):
-            score += 8
-        if not ind_5m.get('price_above_ema21', True):
-            score += 4
-        
-        # Enhanced Volume Analysis
-        if ind_5m.get('volume_spike_5x', False) and ind_5m.get('price_change_pct', 0) < 0:
-            score += 20  # Extreme selling volume
-        elif ind_5m.get('volume_spike_3x', False) and ind_5m.get('price_change_pct', 0) < 0:
-            score += 15  # Strong selling volume
-        elif ind_5m.get('volume_surge', False) and ind_5m.get('price_change_pct', 0) < 0:
-            score += 12  # Regular selling volume
-        
-        # Bollinger Bands
-        if ind_5m.get('bb_position') == 'upper':
-            score += 8
-        
-        # Breakdown
-        if ind_5m.get('breakdown', False):
-            score += 15
-        
-        # Resistance
-        if ind_5m.get('near_resistance', False):
-            score += 8
-        
-        # On-Chain Analysis (30% weight) - NEW
-        if onchain_data:
-            # Exchange inflows (selling pressure)
-            if onchain_data.get('net_flow', 0) > 1000000:  # Large inflows
-                score += 15
-            elif onchain_data.get('net_flow', 0) > 0:  # Any inflows
-                score += 8
+        symbols = list(features)
+        scores = self.scoring_rules.score([features[symbol] for symbol in symbols])
+        bullish, bearish = scores['bullish'], scores['bearish']
+        
+        for i, symbol in enumerate(symbols):
+            row = features[symbol]
+            breakdowns = {direction: result.breakdown(i) for direction, result in scores.items()}
+            self.score_breakdowns[symbol] = breakdowns
             
-            # Smart money selling
-            smart_flow = onchain_data.get('smart_money_flow', 0)
-            if smart_flow < 0:
-                score += 10
+            signals = []
+            try:
+                if bullish.scores[i] > 40:
+                    signal = self._create_enhanced_bullish_signal(symbol, row['ind'], float(bullish.scores[i]), row['event'])
+                    if signal:
+                        signal.score_breakdown = breakdowns['bullish']
+                        signals.append(signal)
+                
+                if bearish.scores[i] > 40:
+                    signal = self._create_enhanced_bearish_signal(symbol, row['ind'], float(bearish.scores[i]), row['event'])
+                    if signal:
+                        signal.score_breakdown = breakdowns['bearish']
+                        signals.append(signal)
+            except Exception as e:
+                logger.error(f"Error generating signals for {symbol}: {e}")
+            results[symbol] = signals
         
-        return min(score, 100)
+        return results
+    
+    def explain_score(self, symbol: str) -> Dict[str, Dict[str, float]]:
+        """Per-rule contributions behind the symbol's last bullish/bearish scores"""
+        return self.score_breakdowns.get(symbol, {})
     
     def _create_enhanced_bullish_signal(self, symbol: str, indicators: Dict, score: float, event_data: Dict) -> Optional[MarketSignal]:
         """Create an enhanced bullish trading signal with fundamental context"""
@@ -1535,11 +1763,6 @@ class SignalGenerator:
             else:
                 confidence = 'low'
             
-            # Add event context to indicators
-            enhanced_indicators = indicators.copy()
-            enhanced_indicators['fundamental_events'] = event_data.get('bullish_events', [])
-            enhanced_indicators['event_score'] = event_data.get('event_score', 0)
-            
             return MarketSignal(
                 symbol=symbol,
                 timeframe='5m',
@@ -1551,8 +1774,10 @@ class SignalGenerator:
                 take_profit=take_profit,
                 risk_reward=risk_reward,
                 confidence=confidence,
-                indicators=enhanced_indicators,
-                timestamp=datetime.now()
+                indicators=indicators,
+                timestamp=datetime.now(),
+                fundamental_events=event_data.get('bullish_events', []),
+                event_score=event_data.get('event_score', 0)
             )
         except:
             return None
@@ -1578,11 +1803,6 @@ class SignalGenerator:
             else:
                 confidence = 'low'
             
-            # Add event context to indicators
-            enhanced_indicators = indicators.copy()
-            enhanced_indicators['fundamental_events'] = event_data.get('bearish_events', [])
-            enhanced_indicators['event_score'] = event_data.get('event_score', 0)
-            
             return MarketSignal(
                 symbol=symbol,
                 timeframe='5m',
@@ -1594,8 +1814,10 @@ class SignalGenerator:
                 take_profit=take_profit,
                 risk_reward=risk_reward,
                 confidence=confidence,
-                indicators=enhanced_indicators,
-                timestamp=datetime.now()
+                indicators=indicators,
+                timestamp=datetime.now(),
+                fundamental_events=event_data.get('bearish_events', []),
+                event_score=event_data.get('event_score', 0)
             )
         except:
             return None
@@ -1606,33 +1828,123 @@ class TradingBotGUI:
         self.root.title("Local Day Trading Analysis Bot")
         self.root.geometry("1400x900")
         
+        # Configuration
+        self.config = self.load_config()
+        
         # Initialize components
         self.data_manager = DataManager()
-        self.signal_generator = SignalGenerator()
+        book_symbols = self.config.get('order_book_symbols')
+        self.order_books = OrderBookManager(TIER_1_PAIRS if book_symbols is None else book_symbols)
+        self.signal_generator = SignalGenerator(
+            self.data_manager, ScoringRules.from_file(self.config.get('scoring_rules_file', 'scoring_rules.json')),
+            self.order_books)
+        
+        # Optional session recording / accelerated replay (before anything binds exchange methods)
+        self.clock = SystemClock()
+        self.recorder = None
+        self.replayer = None
+        self.configure_session_harness()
+        self.start_order_books()
         
-        # Configuration
-        self.config = self.load_config()
         self.watchlist = self.config.get('watchlist', [
             'BTC/USDT', 'ETH/USDT', 'BNB/USDT', 'ADA/USDT',
             'SOL/USDT', 'XRP/USDT', 'DOT/USDT', 'AVAX/USDT'
         ])
         
+        # Stage one of the scan: rank the whole venue from one fetch_tickers() call, then only
+        # the watchlist plus the top movers get the deep OHLCV/on-chain analysis
+        self.funnel = TickerFunnel(
+            self.data_manager.exchanges[self.data_manager.primary_exchange].fetch_tickers,
+            top_k=self.config.get('funnel_top_k', 5),
+            always_include=self.watchlist
+        )
+        
         # State
-        self.signals = []
+        self.signals = SignalStore(capacity=50, window_seconds=300)
         self.running = False
         self.scan_thread = None
+        self.scan_stop = threading.Event()
+        self.scheduler = None
+        
+        # Alerts are delivered from a background worker, never on the Tk thread
+        self.alert_dispatcher = AlertDispatcher(
+            max_queue=self.config.get('alert_queue_size', 100),
+            cooldown=self.config.get('alert_cooldown', 300),
+            coalesce_window=self.config.get('alert_coalesce_seconds', 2.0)
+        )
+        self.configure_alert_channels()
         
         self.setup_gui()
         self.start_scanning()
     
+    def harness_endpoints(self) -> Tuple[Dict, Dict]:
+        """HTTP sessions and exchanges whose responses a recording captures"""
+        onchain = self.data_manager.onchain_manager
+        sessions = {
+            'onchain': onchain.session,
+            'stablecoins': onchain.stablecoin_pipeline.session,
+            'market_index': self.data_manager.market_index.session,
+            'events': self.signal_generator.event_monitor.session,
+            'sentiment': self.signal_generator.sentiment_analyzer.session,
+            'depth': self.order_books.session,
+        }
+        return sessions, self.data_manager.exchanges
+    
+    def configure_session_harness(self):
+        """Record this session, or replay a recorded one under a virtual clock"""
+        try:
+            if self.config.get('replay_session_file'):
+                self.replayer = SessionReplayer(self.config['replay_session_file'],
+                                                speed=self.config.get('replay_speed', 1.0))
+                self.replayer.attach(*self.harness_endpoints())
+                self.clock = self.replayer.clock
+                self.clock.install(*(sys.modules[name] for name in
+                                     (__name__, 'market_funnel', 'market_index', 'stablecoin_flows', 'alert_dispatcher',
+                                      'order_book')))
+                self.order_books.inline_resync = True
+                logger.info(f"Replaying {self.config['replay_session_file']} at {self.clock.speed:g}x")
+            elif self.config.get('record_session_file'):
+                self.recorder = SessionRecorder(self.config['record_session_file'])
+                self.recorder.attach(*self.harness_endpoints())
+                self.order_books.recorder = self.recorder
+                logger.info(f"Recording session to {self.config['record_session_file']}")
+        except Exception as e:
+            logger.error(f"Error setting up session recording/replay: {e}")
+    
+    def start_order_books(self):
+        """Stream depth for the tracked symbols, or feed the recorded stream during a replay"""
+        if not self.order_books.books:
+            return
+        if self.replayer:
+            # Frames are fed on the scheduler thread as each tick advances the virtual clock
+            self.replayer.subscribe(DEPTH_STREAM_SOURCE, self.order_books.feed)
+            return
+        try:
+            self.order_books.start()
+        except ImportError:
+            logger.warning("websocket-client not installed; order book features disabled")
+    
     def load_config(self) -> Dict:
         """Load configuration from file"""
         config_file = 'trading_config.json'
         default_config = {
             'scan_interval': 30,
+            'scan_timeframes': [],            # Scan just after these candles close (default: the scored ones)
+            'scan_boundary_offset': 2.0,      # Seconds after the close, so the venue has published the bar
+            'scan_overrun_policy': CATCH_UP,  # 'catch_up' or 'skip' boundaries missed by a slow scan
             'min_signal_strength': 50,
+            'funnel_top_k': 5,                # Top-ranked movers scanned alongside the watchlist (0 = watchlist only)
+            'scoring_rules_file': 'scoring_rules.json',  # Optional JSON overriding the bullish/bearish rule tables
+            'record_session_file': '',        # Append every exchange/API response to this .jsonl.gz
+            'replay_session_file': '',        # Serve responses from a recording instead of the network
+            'replay_speed': 1.0,              # Virtual-clock speed of a replay (1-1000x)
+            'order_book_symbols': None,       # Local depth books for book.* scoring (default: tier 1, [] = off)
             'sound_alerts': True,
             'desktop_notifications': True,
+            'alert_cooldown': 300,          # Seconds between alerts for the same symbol/direction
+            'alert_coalesce_seconds': 2.0,  # Signals within this window go out as one digest
+            'webhook_url': '',              # Optional JSON webhook (Slack/Discord/etc.)
+            'smtp': {},                     # Optional {host, port, sender, recipients, username, password, use_tls}
             'watchlist': [
                 'BTC/USDT', 'ETH/USDT', 'BNB/USDT', 'ADA/USDT',
                 'SOL/USDT', 'XRP/USDT', 'DOT/USDT', 'AVAX/USDT'
@@ -1736,6 +2048,12 @@ class TradingBotGUI:
         
         # Bind double-click event
         self.signals_tree.bind('<Double-1>', self.on_signal_double_click)
+        
+        # Configure tag colors
+        self.signals_tree.tag_configure('critical', background='#ffcccc')
+        self.signals_tree.tag_configure('high', background='#ffffcc')
+        self.signals_tree.tag_configure('medium', background='#ccffcc')
+        self.signals_tree.tag_configure('low', background='#f0f0f0')
     
     def setup_market_tab(self, parent):
         """Setup market overview tab"""
@@ -1860,6 +2178,9 @@ class TradingBotGUI:
             self.config['min_signal_strength'] = int(self.min_strength_var.get())
             self.config['sound_alerts'] = self.sound_alerts_var.get()
             self.config['desktop_notifications'] = self.desktop_notifications_var.get()
+            self.configure_alert_channels()
+            if self.scheduler:
+                self.scheduler.interval = self.config['scan_interval']
             self.save_config()
             messagebox.showinfo("Success", "Configuration saved successfully!")
         except Exception as e:
@@ -1876,6 +2197,7 @@ class TradingBotGUI:
         """Start the scanning process"""
         if not self.running:
             self.running = True
+            self.scan_stop.clear()
             self.start_button.config(text="Stop Scanning")
             self.status_var.set("Scanning...")
             
@@ -1886,42 +2208,94 @@ class TradingBotGUI:
     def stop_scanning(self):
         """Stop the scanning process"""
         self.running = False
+        self.scan_stop.set()
         self.start_button.config(text="Start Scanning")
         self.status_var.set("Stopped")
     
+    def report_data_availability(self):
+        """Log which watchlist pairs lack which data sources"""
+        try:
+            missing = self.data_manager.availability_report(self.watchlist)
+            for symbol, sources in missing.items():
+                logger.warning(f"{symbol}: no data from {', '.join(sources)}")
+        except Exception as e:
+            logger.error(f"Error building availability report: {e}")
+    
+    def create_scheduler(self) -> CandleScheduler:
+        """Scan schedule from config: candle closes plus aligned scan_interval wake-ups"""
+        return CandleScheduler(
+            timeframes=self.config.get('scan_timeframes') or list(self.signal_generator.data_requirements()),
+            offset=self.config.get('scan_boundary_offset', 2.0),
+            interval=self.config.get('scan_interval', 30),
+            policy=self.config.get('scan_overrun_policy', CATCH_UP),
+            clock=self.clock
+        )
+    
+    def scan_universe(self) -> List[str]:
+        """Watchlist plus the funnel's top-ranked pairs (one all-market ticker request, rate-limited)"""
+        if self.funnel.top_k <= 0 or not self.funnel.refresh():
+            return list(self.watchlist)
+        return self.funnel.deep_candidates()
+    
     def scan_loop(self):
-        """Main scanning loop"""
+        """Main scanning loop, woken just after candle boundaries"""
+        self.report_data_availability()
+        self.scheduler = self.create_scheduler()
+        self.perform_scan()
         while self.running:
             try:
-                self.perform_scan()
-                time.sleep(self.config.get('scan_interval', 30))
+                if self.replayer and self.replayer.finished:
+                    logger.info(f"Replay finished at tick {self.scheduler.stats['ticks']}: {self.replayer.stats}")
+                    break
+                tick = self.scheduler.wait(self.scan_stop)
+                if tick is None:
+                    break
+                symbols = self.scan_universe()
+                if tick.timeframes:
+                    # Candles closed: fetch the new bars for every symbol at once before scoring
+                    requirements = self.signal_generator.data_requirements()
+                    self.data_manager.prefetch(symbols, {tf: requirements[tf] for tf in tick.timeframes
+                                                         if tf in requirements}, tick.boundary)
+                self.perform_scan(symbols)
             except Exception as e:
                 logger.error(f"Error in scan loop: {e}")
-                time.sleep(5)
+                if self.scan_stop.wait(5):
+                    break
     
-    def perform_scan(self):
-        """Perform a single scan of all watchlist symbols"""
+    def perform_scan(self, symbols: Optional[List[str]] = None):
+        """Perform a single scan of the watchlist and the funnel's top-ranked symbols"""
         try:
+            symbols = symbols or self.scan_universe()
             new_signals = []
             market_data = []
             onchain_data_list = []
+            requirements = self.signal_generator.data_requirements()
             
-            for symbol in self.watchlist:
+            # Get multi-timeframe data
+            data_by_symbol = {}
+            for symbol in symbols:
                 try:
-                    # Get multi-timeframe data
-                    data = self.data_manager.get_multiple_timeframes(symbol)
-                    
-                    # Generate signals
-                    signals = self.signal_generator.generate_signals(symbol, data)
+                    data_by_symbol[symbol] = self.data_manager.get_multiple_timeframes(symbol, requirements)
+                except Exception as e:
+                    logger.error(f"Error fetching data for {symbol}: {e}")
+            
+            # Score every changed symbol in one pass (the rest reuse their previous signals)
+            results = self.signal_generator.generate_changed_signals(data_by_symbol)
+            
+            for symbol, data in data_by_symbol.items():
+                try:
+                    signals, rescored = results[symbol]
                     
                     # Filter signals by minimum strength
                     min_strength = self.config.get('min_signal_strength', 50)
                     filtered_signals = [s for s in signals if s.strength >= min_strength]
-                    new_signals.extend(filtered_signals)
+                    if rescored:
+                        new_signals.extend(filtered_signals)
                     
                     # Collect market data
                     if '5m' in data and not data['5m'].empty:
-                        indicators = self.signal_generator.analyzer.calculate_all_indicators(data['5m'])
+                        indicators = (self.signal_generator.get_indicator_snapshot(symbol, '5m') or
+                                      self.signal_generator.analyzer.calculate_all_indicators(data['5m']))
                         if indicators:
                             market_info = {
                                 'symbol': symbol,
@@ -1966,7 +2340,7 @@ class TradingBotGUI:
             # Send alerts for new high-confidence signals
             for signal in new_signals:
                 if signal.confidence in ['high', 'critical']:
-                    self.root.after(0, self.send_alert, signal)
+                    self.send_alert(signal)
             
         except Exception as e:
             logger.error(f"Error in perform_scan: {e}")
@@ -1978,30 +2352,13 @@ class TradingBotGUI:
     
     def update_signals_display(self, new_signals: List[MarketSignal]):
         """Update the signals display"""
-        # Add new signals to the list
+        # Add new signals to the ring buffer (oldest are evicted beyond capacity)
         self.signals.extend(new_signals)
         
-        # Keep only last 50 signals
-        self.signals = self.signals[-50:]
-        
-        # Clear existing items
-        for item in self.signals_tree.get_children():
-            self.signals_tree.delete(item)
-        
-        # Add signals to tree (newest first)
-        for signal in reversed(self.signals):
-            # Color coding based on confidence
-            tags = []
-            if signal.confidence == 'critical':
-                tags = ['critical']
-            elif signal.confidence == 'high':
-                tags = ['high']
-            elif signal.confidence == 'medium':
-                tags = ['medium']
-            else:
-                tags = ['low']
-            
-            self.signals_tree.insert('', 'end', values=(
+        # Insert only the new rows at the top (newest first), then trim evicted rows
+        for signal in new_signals[-self.signals.capacity:]:
+            tag = signal.confidence if signal.confidence in CONFIDENCE_LEVELS else 'low'
+            self.signals_tree.insert('', 0, values=(
                 signal.symbol,
                 signal.direction.upper(),
                 f"{signal.strength:.1f}%",
@@ -2011,13 +2368,11 @@ class TradingBotGUI:
                 f"${signal.take_profit:.4f}",
                 f"{signal.risk_reward:.1f}:1",
                 signal.timestamp.strftime('%H:%M:%S')
-            ), tags=tags)
+            ), tags=[tag])
         
-        # Configure tag colors
-        self.signals_tree.tag_configure('critical', background='#ffcccc')
-        self.signals_tree.tag_configure('high', background='#ffffcc')
-        self.signals_tree.tag_configure('medium', background='#ccffcc')
-        self.signals_tree.tag_configure('low', background='#f0f0f0')
+        children = self.signals_tree.get_children()
+        if len(children) > len(self.signals):
+            self.signals_tree.delete(*children[len(self.signals):])
     
     def update_market_display(self, market_data: List[Dict]):
         """Update the market overview display"""
@@ -2111,42 +2466,56 @@ class TradingBotGUI:
         """Update status information"""
         self.last_update_var.set(datetime.now().strftime('%H:%M:%S'))
         
-        # Count active signals by confidence
-        signal_counts = {'critical': 0, 'high': 0, 'medium': 0, 'low': 0}
-        recent_signals = [s for s in self.signals if (datetime.now() - s.timestamp).seconds < 300]  # Last 5 minutes
-        
-        for signal in recent_signals:
-            signal_counts[signal.confidence] += 1
+        # Count signals from the last 5 minutes by confidence
+        signal_counts = self.signals.counts_in_window()
         
         status_text = f"Active - Critical: {signal_counts['critical']}, High: {signal_counts['high']}, Medium: {signal_counts['medium']}"
         self.status_var.set(status_text)
     
+    def configure_alert_channels(self):
+        """Build the alert channels from the current configuration"""
+        channels = []
+        if self.replayer:
+            self.alert_dispatcher.set_channels(channels)  # Replays never notify
+            return
+        if self.config.get('desktop_notifications', True):
+            try:
+                channels.append(DesktopChannel())
+            except ImportError:
+                logger.warning("plyer not installed; desktop notifications disabled")
+        if self.config.get('sound_alerts', True):
+            channels.append(SoundChannel())
+        if self.config.get('webhook_url'):
+            channels.append(WebhookChannel(self.config['webhook_url']))
+        smtp = self.config.get('smtp') or {}
+        if smtp.get('host') and smtp.get('recipients'):
+            channels.append(SmtpChannel(
+                smtp['host'], smtp.get('port', 25), smtp.get('sender', 'trading-bot@localhost'),
+                smtp['recipients'], smtp.get('username'), smtp.get('password'), smtp.get('use_tls', False)
+            ))
+        self.alert_dispatcher.set_channels(channels)
+    
     def send_alert(self, signal: MarketSignal):
-        """Send alert notifications"""
+        """Queue alert notifications (returns immediately; safe from any thread)"""
         try:
-            # Desktop notification
-            if self.config.get('desktop_notifications', True):
-                title = f"🚨 {signal.confidence.upper()} SIGNAL"
-                message = f"{signal.symbol} - {signal.direction.upper()}\nStrength: {signal.strength:.1f}%\nEntry: ${signal.entry_price:.4f}"
-                
-                notification.notify(
-                    title=title,
-                    message=message,
-                    timeout=10
-                )
-            
-            # Sound alert
-            if self.config.get('sound_alerts', True):
-                try:
-                    # Play different sounds based on confidence
-                    if signal.confidence == 'critical':
-                        winsound.Beep(2000, 500)  # High pitch, long beep
-                    elif signal.confidence == 'high':
-                        winsound.Beep(1500, 300)  # Medium pitch, medium beep
-                    else:
-                        winsound.Beep(1000, 200)  # Low pitch, short beep
-                except:
-                    pass  # Ignore sound errors on non-Windows systems
+            alert = Alert(
+                title=f"🚨 {signal.confidence.upper()} SIGNAL",
+                message=f"{signal.symbol} - {signal.direction.upper()}\nStrength: {signal.strength:.1f}%\nEntry: ${signal.entry_price:.4f}",
+                confidence=signal.confidence,
+                symbols=[signal.symbol],
+                created_at=signal.timestamp.timestamp(),
+                payload=[{
+                    'symbol': signal.symbol,
+                    'direction': signal.direction,
+                    'strength': signal.strength,
+                    'confidence': signal.confidence,
+                    'entry_price': signal.entry_price,
+                    'stop_loss': signal.stop_loss,
+                    'take_profit': signal.take_profit,
+                    'timestamp': signal.timestamp.isoformat()
+                }]
+            )
+            self.alert_dispatcher.submit(alert, key=f"{signal.symbol}:{signal.direction}")
             
         except Exception as e:
             logger.error(f"Error sending alert: {e}")
@@ -2167,34 +2536,86 @@ class TradingBotGUI:
             detail_window.title(f"Detailed Analysis - {symbol}")
             detail_window.geometry("800x600")
             
-            # Get fresh data
-            data = self.data_manager.get_multiple_timeframes(symbol)
-            if '5m' not in data or data['5m'].empty:
-                messagebox.showerror("Error", f"No data available for {symbol}")
-                detail_window.destroy()
-                return
-            
-            # Calculate indicators
-            indicators = self.signal_generator.analyzer.calculate_all_indicators(data['5m'])
-            
-            # Create notebook for different views
+            # One tab per timeframe, each with indicators and a live chart
             notebook = ttk.Notebook(detail_window)
             notebook.pack(fill='both', expand=True, padx=10, pady=10)
             
-            # Indicators tab
-            indicators_frame = ttk.Frame(notebook)
-            notebook.add(indicators_frame, text='Technical Indicators')
-            self.create_indicators_display(indicators_frame, indicators)
+            tabs = {}
+            missing = []
+            for timeframe in DETAIL_TIMEFRAMES:
+                tab = ttk.Frame(notebook)
+                notebook.add(tab, text=timeframe)
+                tabs[timeframe] = tab
+                
+                # Open instantly from the scanner's candle buffers and indicator snapshots
+                df = self.data_manager.get_cached_data(symbol, timeframe)
+                indicators = self.signal_generator.get_indicator_snapshot(symbol, timeframe)
+                if df is not None and not indicators:
+                    indicators = self.signal_generator.analyzer.calculate_all_indicators(df)
+                    self.signal_generator.store_indicator_snapshot(symbol, timeframe, indicators)
+                
+                if df is not None:
+                    self.populate_timeframe_tab(detail_window, tab, symbol, timeframe, df, indicators)
+                else:
+                    ttk.Label(tab, text=f"Loading {timeframe} data...").pack(pady=20)
+                    missing.append(timeframe)
+            
+            notebook.select(tabs['5m'])
             
-            # Chart tab (simplified)
-            chart_frame = ttk.Frame(notebook)
-            notebook.add(chart_frame, text='Price Chart')
-            self.create_simple_chart(chart_frame, data['5m'], symbol)
+            # Fetch whatever the scanner has not cached yet and fill tabs as it arrives
+            if missing:
+                threading.Thread(
+                    target=self.load_missing_timeframes,
+                    args=(detail_window, tabs, symbol, missing),
+                    daemon=True
+                ).start()
             
         except Exception as e:
             logger.error(f"Error showing detailed analysis: {e}")
             messagebox.showerror("Error", f"Error showing analysis: {e}")
     
+    def load_missing_timeframes(self, window, tabs: Dict, symbol: str, timeframes: List[str]):
+        """Background fetch for a detail window; each timeframe is handed to the Tk thread when ready"""
+        for timeframe in timeframes:
+            try:
+                df = self.data_manager.get_market_data(symbol, timeframe)
+                indicators = {}
+                if not df.empty:
+                    indicators = self.signal_generator.analyzer.calculate_all_indicators(df)
+                    self.signal_generator.store_indicator_snapshot(symbol, timeframe, indicators)
+                self.root.after(0, self.fill_timeframe_tab, window, tabs[timeframe], symbol, timeframe, df, indicators)
+            except Exception as e:
+                logger.error(f"Error loading {timeframe} data for {symbol}: {e}")
+    
+    def fill_timeframe_tab(self, window, tab, symbol: str, timeframe: str, df: pd.DataFrame, indicators: Dict):
+        """Replace a tab's loading placeholder with its content"""
+        if not window.winfo_exists():
+            return
+        
+        for child in tab.winfo_children():
+            child.destroy()
+        
+        if df is None or df.empty:
+            ttk.Label(tab, text=f"No {timeframe} data available for {symbol}").pack(pady=20)
+            return
+        
+        self.populate_timeframe_tab(window, tab, symbol, timeframe, df, indicators)
+    
+    def populate_timeframe_tab(self, window, tab, symbol: str, timeframe: str, df: pd.DataFrame, indicators: Dict):
+        """Indicators and chart views for one timeframe"""
+        views = ttk.Notebook(tab)
+        views.pack(fill='both', expand=True)
+        
+        # Indicators view
+        indicators_frame = ttk.Frame(views)
+        views.add(indicators_frame, text='Technical Indicators')
+        self.create_indicators_display(indicators_frame, indicators)
+        
+        # Live chart view
+        chart_frame = ttk.Frame(views)
+        views.add(chart_frame, text='Price Chart')
+        self.create_price_chart(window, chart_frame, df, symbol, timeframe)
+    
     def create_indicators_display(self, parent, indicators: Dict):
         """Create indicators display"""
         # Create scrollable frame
@@ -2227,34 +2648,51 @@ class TradingBotGUI:
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
     
-    def create_simple_chart(self, parent, df: pd.DataFrame, symbol: str):
-        """Create a simple price chart"""
+    def create_price_chart(self, window, parent, df: pd.DataFrame, symbol: str, timeframe: str = '5m') -> Optional[LiveChart]:
+        """Create the live candlestick chart for a detail window"""
         try:
-            fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 6), gridspec_kw={'height_ratios': [3, 1]})
-            
-            # Price chart
-            ax1.plot(df.index, df['close'], label='Close Price', linewidth=1)
-            ax1.set_title(f"{symbol} - 5m Chart")
-            ax1.set_ylabel("Price")
-            ax1.grid(True, alpha=0.3)
-            ax1.legend()
+            chart = LiveChart(parent, symbol, timeframe)
+            overlays = self.signal_generator.analyzer.calculate_overlay_series(f"{symbol}_{timeframe}", df)
+            chart.update(df, overlays)
             
-            # Volume chart
-            ax2.bar(df.index, df['volume'], alpha=0.7, color='blue')
-            ax2.set_ylabel("Volume")
-            ax2.set_xlabel("Time")
-            ax2.grid(True, alpha=0.3)
-            
-            plt.tight_layout()
-            
-            # Embed in tkinter
-            canvas = FigureCanvasTkAgg(fig, parent)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill='both', expand=True)
+            # Release the figure with the window so figures never pile up
+            window.bind('<Destroy>', lambda e: chart.close() if e.widget is window else None, add='+')
+            self.schedule_chart_refresh(window, chart, symbol, timeframe)
+            return chart
             
         except Exception as e:
             logger.error(f"Error creating chart: {e}")
             ttk.Label(parent, text=f"Error creating chart: {e}").pack()
+            return None
+    
+    def schedule_chart_refresh(self, window, chart: LiveChart, symbol: str, timeframe: str, interval_ms: int = 5000):
+        """Periodically push new candles into an open chart without blocking the Tk thread"""
+        def fetch():
+            try:
+                df = self.data_manager.get_market_data(symbol, timeframe)
+                overlays = self.signal_generator.analyzer.calculate_overlay_series(f"{symbol}_{timeframe}", df)
+            except Exception as e:
+                # Keep the chain alive; the next tick retries
+                logger.error(f"Error refreshing chart for {symbol} {timeframe}: {e}")
+                self.root.after(interval_ms, tick)
+                return
+            self.root.after(0, apply, df, overlays)
+        
+        def apply(df, overlays):
+            if chart.closed or not window.winfo_exists():
+                return
+            try:
+                chart.update(df, overlays)
+            except Exception as e:
+                logger.error(f"Error drawing chart for {symbol} {timeframe}: {e}")
+            self.root.after(interval_ms, tick)
+        
+        def tick():
+            if chart.closed or not window.winfo_exists():
+                return
+            threading.Thread(target=fetch, daemon=True).start()
+        
+        self.root.after(interval_ms, tick)
     
     def run(self):
         """Start the GUI application"""
@@ -2267,6 +2705,10 @@ class TradingBotGUI:
     def on_closing(self):
         """Handle application closing"""
         self.stop_scanning()
+        self.alert_dispatcher.stop()
+        self.order_books.stop()
+        if self.recorder:
+            self.recorder.close()
         self.save_config()
         self.root.destroy()
 
@@ -2293,79 +2735,66 @@ class RiskManager:
 
 # Market Scanner for Additional Opportunities
 class MarketScanner:
+    """Universe-wide scans over the candles the regular scan already cached (no extra requests)"""
+    # Both scans read the same matrix so its rolling statistics are computed once
+    BUFFER_BARS = TechnicalAnalyzer.WARMUP_BARS
+    
     def __init__(self, data_manager: DataManager):
         self.data_manager = data_manager
     
-    def scan_for_volume_spikes(self, symbols: List[str], threshold: float = 3.0) -> List[Dict]:
-        """Scan for unusual volume spikes across symbols"""
-        volume_alerts = []
-        
-        for symbol in symbols:
-            try:
-                df = self.data_manager.get_market_data(symbol, '5m', 50)
-                if len(df) < 20:
-                    continue
-                
-                current_volume = df['volume'].iloc[-1]
-                avg_volume = df['volume'].iloc[-20:-1].mean()
-                
-                if current_volume > (avg_volume * threshold):
-                    price_change = ((df['close'].iloc[-1] - df['close'].iloc[-2]) / df['close'].iloc[-2]) * 100
-                    
-                    volume_alerts.append({
-                        'symbol': symbol,
-                        'volume_ratio': current_volume / avg_volume,
-                        'price_change': price_change,
-                        'current_price': df['close'].iloc[-1],
-                        'timestamp': datetime.now()
-                    })
-            except Exception as e:
-                logger.error(f"Error scanning volume for {symbol}: {e}")
-                continue
-        
-        return sorted(volume_alerts, key=lambda x: x['volume_ratio'], reverse=True)
-    
-    def scan_for_breakouts(self, symbols: List[str]) -> List[Dict]:
-        """Scan for price breakouts from recent ranges"""
-        breakout_alerts = []
-        
-        for symbol in symbols:
-            try:
-                df = self.data_manager.get_market_data(symbol, '15m', 100)
-                if len(df) < 50:
-                    continue
-                
-                # Calculate 20-period high/low
-                high_20 = df['high'].iloc[-20:-1].max()
-                low_20 = df['low'].iloc[-20:-1].min()
-                current_price = df['close'].iloc[-1]
-                current_volume = df['volume'].iloc[-1]
-                avg_volume = df['volume'].iloc[-20:-1].mean()
-                
-                # Check for breakout
-                if current_price > high_20 and current_volume > avg_volume * 1.5:
-                    breakout_alerts.append({
-                        'symbol': symbol,
-                        'type': 'upward_breakout',
-                        'breakout_level': high_20,
-                        'current_price': current_price,
-                        'volume_ratio': current_volume / avg_volume,
-                        'timestamp': datetime.now()
-                    })
-                elif current_price < low_20 and current_volume > avg_volume * 1.5:
-                    breakout_alerts.append({
-                        'symbol': symbol,
-                        'type': 'downward_breakout',
-                        'breakout_level': low_20,
-                        'current_price': current_price,
-                        'volume_ratio': current_volume / avg_volume,
-                        'timestamp': datetime.now()
-                    })
-            except Exception as e:
-                logger.error(f"Error scanning breakouts for {symbol}: {e}")
-                continue
-        
-        return breakout_alerts
+    def scan_for_volume_spikes(self, symbols: List[str], threshold: float = 3.0, timeframe: str = '5m',
+                               lookback: int = 20) -> List[Dict]:
+        """Scan for unusual volume spikes across symbols, strongest first"""
+        matrix = self.data_manager.candle_matrix(symbols, timeframe, max(self.BUFFER_BARS, lookback))
+        volume = matrix.arrays['volume'][:, -1]
+        close = matrix.arrays['close']
+        avg_volume = matrix.prior('volume', lookback - 1, 'mean')[:, -1]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = volume / avg_volume
+            price_change = (close[:, -1] - close[:, -2]) / close[:, -2] * 100
+        hits = np.flatnonzero((matrix.lengths >= lookback) & (volume > avg_volume * threshold))
+        hits = hits[np.argsort(-volume_ratio[hits], kind='stable')]
+        
+        now = datetime.now()
+        return [{
+            'symbol': matrix.symbols[i],
+            'volume_ratio': float(volume_ratio[i]),
+            'price_change': float(price_change[i]),
+            'current_price': float(close[i, -1]),
+            'timestamp': now
+        } for i in hits]
+    
+    def scan_for_breakouts(self, symbols: List[str], timeframe: str = '5m', lookback: int = 20,
+                           min_bars: int = 50, volume_factor: float = 1.5) -> List[Dict]:
+        """Scan for price breakouts from recent ranges, highest volume ratio first"""
+        matrix = self.data_manager.candle_matrix(symbols, timeframe, max(self.BUFFER_BARS, min_bars))
+        close = matrix.arrays['close'][:, -1]
+        volume = matrix.arrays['volume'][:, -1]
+        
+        # Range and volume of the previous bars, shared with the volume scan
+        high_prior = matrix.prior('high', lookback - 1, 'max')[:, -1]
+        low_prior = matrix.prior('low', lookback - 1, 'min')[:, -1]
+        avg_volume = matrix.prior('volume', lookback - 1, 'mean')[:, -1]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = volume / avg_volume
+        confirmed = (matrix.lengths >= min_bars) & (volume > avg_volume * volume_factor)
+        upward = confirmed & (close > high_prior)
+        downward = confirmed & ~upward & (close < low_prior)
+        
+        hits = np.flatnonzero(upward | downward)
+        hits = hits[np.argsort(-volume_ratio[hits], kind='stable')]
+        
+        now = datetime.now()
+        return [{
+            'symbol': matrix.symbols[i],
+            'type': 'upward_breakout' if upward[i] else 'downward_breakout',
+            'breakout_level': float(high_prior[i] if upward[i] else low_prior[i]),
+            'current_price': float(close[i]),
+            'volume_ratio': float(volume_ratio[i]),
+            'timestamp': now
+        } for i in hits]
 
 # News Sentiment Integration (Placeholder)
 class NewsSentimentMonitor:
@@ -0,0 +1,143 @@
+# Mobile Trading App - Price-Level Trigger Index
+#
+# Stops, targets, trailing stops and user price alerts are kept in sorted
+# per-symbol ladders so each new price only touches the levels it crossed.
+
+from bisect import bisect_left, bisect_right
+from itertools import count
+from typing import Dict, List, Optional
+
+# A trigger fires when price <= level ('below') or price >= level ('above')
+BELOW = 'below'
+ABOVE = 'above'
+
+class PriceTrigger:
+    """One price level watched for a position or a user alert"""
+    __slots__ = ('symbol', 'level', 'direction', 'kind', 'owner_id', 'message', 'seq')
+
+    def __init__(self, symbol: str, level: float, direction: str, kind: str,
+                 owner_id: str, message: str = '', seq: int = 0):
+        self.symbol = symbol
+        self.level = level
+        self.direction = direction
+        self.kind = kind            # stop_loss, take_profit, trailing_stop, price_alert
+        self.owner_id = owner_id    # position id or alert id
+        self.message = message
+        self.seq = seq
+
+    def key(self):
+        return (self.level, self.seq)
+
+class TriggerLadder:
+    """Sorted trigger levels for one symbol"""
+
+    def __init__(self):
+        # Parallel sorted lists: (level, seq) keys and their triggers
+        self.below_keys = []
+        self.below = []
+        self.above_keys = []
+        self.above = []
+
+    def __len__(self):
+        return len(self.below) + len(self.above)
+
+    def add(self, trigger: PriceTrigger):
+        keys, triggers = self._side(trigger.direction)
+        key = trigger.key()
+        index = bisect_left(keys, key)
+        keys.insert(index, key)
+        triggers.insert(index, trigger)
+
+    def remove(self, trigger: PriceTrigger) -> bool:
+        keys, triggers = self._side(trigger.direction)
+        key = trigger.key()
+        index = bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            del keys[index]
+            del triggers[index]
+            return True
+        return False
+
+    def crossed(self, price: float) -> List[PriceTrigger]:
+        """Pop every trigger the price has reached (binary search on each side)"""
+        fired = []
+
+        # 'below' triggers fire for every level >= price
+        index = bisect_left(self.below_keys, (price,))
+        if index < len(self.below_keys):
+            fired.extend(self.below[index:])
+            del self.below_keys[index:]
+            del self.below[index:]
+
+        # 'above' triggers fire for every level <= price
+        index = bisect_right(self.above_keys, (price, float('inf')))
+        if index > 0:
+            fired.extend(self.above[:index])
+            del self.above_keys[:index]
+            del self.above[:index]
+
+        return fired
+
+    def _side(self, direction: str):
+        if direction == BELOW:
+            return self.below_keys, self.below
+        return self.above_keys, self.above
+
+class TriggerIndex:
+    """Per-symbol trigger ladders with lookup by owner for updates and removal"""
+
+    def __init__(self):
+        self.ladders = {}   # symbol -> TriggerLadder
+        self.by_owner = {}  # owner_id -> {kind: PriceTrigger}
+        self._seq = count()
+
+    def __len__(self):
+        return sum(len(ladder) for ladder in self.ladders.values())
+
+    def set_trigger(self, symbol: str, owner_id: str, kind: str, level: Optional[float],
+                    direction: str, message: str = '') -> Optional[PriceTrigger]:
+        """Add or move the owner's trigger of this kind (None level removes it)"""
+        self.remove_trigger(owner_id, kind)
+        if level is None:
+            return None
+
+        trigger = PriceTrigger(symbol, level, direction, kind, owner_id, message, next(self._seq))
+        self.ladders.setdefault(symbol, TriggerLadder()).add(trigger)
+        self.by_owner.setdefault(owner_id, {})[kind] = trigger
+        return trigger
+
+    def remove_trigger(self, owner_id: str, kind: str):
+        """Remove one trigger of an owner"""
+        owned = self.by_owner.get(owner_id)
+        if not owned or kind not in owned:
+            return
+        trigger = owned.pop(kind)
+        ladder = self.ladders.get(trigger.symbol)
+        if ladder:
+            ladder.remove(trigger)
+        if not owned:
+            del self.by_owner[owner_id]
+
+    def remove_owner(self, owner_id: str):
+        """Remove every trigger belonging to an owner"""
+        for kind in list(self.by_owner.get(owner_id, {})):
+            self.remove_trigger(owner_id, kind)
+
+    def crossed(self, symbol: str, price: float) -> List[PriceTrigger]:
+        """Pop and return the triggers crossed by a new price for a symbol"""
+        ladder = self.ladders.get(symbol)
+        if not ladder:
+            return []
+
+        fired = ladder.crossed(price)
+        for trigger in fired:
+            owned = self.by_owner.get(trigger.owner_id)
+            if owned and owned.get(trigger.kind) is trigger:
+                del owned[trigger.kind]
+                if not owned:
+                    del self.by_owner[trigger.owner_id]
+        return fired
+
+    def triggers_for(self, owner_id: str) -> Dict[str, PriceTrigger]:
+        """Current triggers of an owner by kind"""
+        return dict(self.by_owner.get(owner_id, {}))